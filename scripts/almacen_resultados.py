@@ -0,0 +1,247 @@
+"""
+almacen_resultados.py
+=====================
+Almacén columnar de resultados para reportes de convergencia.
+Guarda los registros (n, integral, errores, ...) en un arreglo estructurado de NumPy
+en lugar de listas de Python, con NaN como marcador de valor ausente.
+
+Para barridos muy grandes el almacén se respalda en disco con np.memmap, y expone
+una vista compatible con dict ('n', 'integrales', ...) para el código existente.
+
+Uso:
+    from almacen_resultados import AlmacenResultados, CAMPOS_CONVERGENCIA
+    almacen = AlmacenResultados(CAMPOS_CONVERGENCIA, capacidad=len(valores_n))
+"""
+
+import os
+import tempfile
+import weakref
+from collections.abc import Mapping
+
+import numpy as np
+
+
+# Campos estándar de los analizadores de convergencia de IntegracionNumerica
+CAMPOS_CONVERGENCIA = [
+    ('n', np.int64),
+    ('integrales', np.float64),
+    ('errores_relativo', np.float64),
+    ('errores_absoluto', np.float64),
+]
+
+# Columnas de tiempo (ms por llamada) que añade el arnés de medición
+CAMPOS_TIEMPOS = [
+    ('tiempos', np.float64),        # mediana
+    ('tiempos_min', np.float64),
+    ('tiempos_p95', np.float64),
+]
+
+# Memoria por llamada (bytes) que añade medir_memoria()
+CAMPOS_MEMORIA = [
+    ('memoria_pico', np.float64),
+    ('memoria_neta', np.float64),
+]
+
+# Orden de convergencia observado entre n consecutivos que añaden los barridos con parada
+CAMPOS_ORDEN = [
+    ('ordenes_observados', np.float64),
+]
+
+# A partir de este tamaño (bytes) el almacén se respalda en disco con np.memmap
+UMBRAL_MEMMAP_BYTES = 256 * 1024**2
+
+# Registros copiados por bloque al pasar de memoria a np.memmap
+REGISTROS_POR_BLOQUE = 1 << 16
+
+
+def _eliminar_temporal(ruta):
+    """Borrar el archivo temporal de un almacén (llamado por weakref.finalize)."""
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
+
+
+class AlmacenResultados(Mapping):
+    """
+    Tabla columnar de registros de convergencia respaldada por un arreglo estructurado.
+
+    Se comporta como un dict de solo lectura: almacen['integrales'] devuelve la
+    columna como vista de NumPy (sin copia) limitada a los registros ya escritos.
+    Los valores ausentes (p. ej. el primer error relativo) se guardan como NaN.
+
+    Si el almacén crea su propio archivo temporal, lo borra cerrar() (o el bloque with,
+    o el recolector de basura al liberar el almacén). Un archivo dado en `ruta` se
+    conserva.
+    """
+
+    def __init__(self, campos, capacidad=0, ruta=None, umbral_memmap=UMBRAL_MEMMAP_BYTES):
+        """
+        Reservar el almacén.
+
+        Parámetros:
+        -----------
+        campos : list
+            Lista de tuplas (nombre, dtype) que define las columnas
+        capacidad : int
+            Número de registros a reservar de antemano (crece al duplicar si se supera)
+        ruta : str, opcional
+            Archivo para np.memmap. Si es None y se supera umbral_memmap,
+            se usa un archivo temporal que se borra al cerrar el almacén
+        umbral_memmap : int
+            Tamaño en bytes a partir del cual se usa np.memmap
+        """
+        self.dtype = np.dtype(campos)
+        # Información del barrido que no es por registro (p. ej. motivo de parada)
+        self.metadatos = {}
+        self.ruta = ruta
+        self.umbral_memmap = umbral_memmap
+        self._finalizador = None
+        self._tam = 0
+        self._datos = self._reservar(max(int(capacidad), 1))
+
+    def _usa_memmap(self, capacidad):
+        """Decidir si una capacidad dada debe ir a disco."""
+        return self.ruta is not None or capacidad * self.dtype.itemsize > self.umbral_memmap
+
+    def _reservar(self, capacidad):
+        """Crear el arreglo subyacente (en memoria o np.memmap) con la capacidad dada."""
+        if not self._usa_memmap(capacidad):
+            datos = np.empty(capacidad, dtype=self.dtype)
+        else:
+            if self.ruta is None:
+                fd, self.ruta = tempfile.mkstemp(prefix='almacen_', suffix='.dat')
+                os.close(fd)
+                self._finalizador = weakref.finalize(self, _eliminar_temporal, self.ruta)
+            datos = np.memmap(self.ruta, dtype=self.dtype, mode='w+', shape=(capacidad,))
+
+        self._marcar_ausentes(datos)
+        return datos
+
+    def _marcar_ausentes(self, datos):
+        """Poner en NaN (valor ausente) las columnas flotantes de `datos`."""
+        for nombre in self.dtype.names:
+            if np.issubdtype(self.dtype[nombre], np.floating):
+                datos[nombre] = np.nan
+
+    def _crecer(self, minimo):
+        """Duplicar la capacidad hasta alojar al menos `minimo` registros."""
+        capacidad = len(self._datos)
+        if minimo <= capacidad:
+            return
+        while capacidad < minimo:
+            capacidad *= 2
+
+        if self.en_disco:
+            # Extender el archivo en su lugar y volver a mapearlo: los registros
+            # escritos no pasan por memoria
+            self._datos.flush()
+            del self._datos
+            os.truncate(self.ruta, capacidad * self.dtype.itemsize)
+            self._datos = np.memmap(self.ruta, dtype=self.dtype, mode='r+',
+                                    shape=(capacidad,))
+            self._marcar_ausentes(self._datos[self._tam:])
+        elif self._usa_memmap(capacidad):
+            # De memoria a disco: copiar por bloques al nuevo np.memmap
+            anterior = self._datos
+            self._datos = self._reservar(capacidad)
+            for i in range(0, self._tam, REGISTROS_POR_BLOQUE):
+                fin = min(i + REGISTROS_POR_BLOQUE, self._tam)
+                self._datos[i:fin] = anterior[i:fin]
+        else:
+            nuevos = self._reservar(capacidad)
+            nuevos[:self._tam] = self._datos[:self._tam]
+            self._datos = nuevos
+
+    def agregar(self, **valores):
+        """
+        Añadir un registro. Los campos omitidos quedan en NaN (o 0 si son enteros).
+        """
+        self._crecer(self._tam + 1)
+        registro = self._datos[self._tam]
+        for nombre, valor in valores.items():
+            registro[nombre] = np.nan if valor is None else valor
+        self._tam += 1
+
+    def extender(self, **columnas):
+        """
+        Añadir varios registros a la vez a partir de columnas de igual longitud.
+        """
+        longitudes = {len(np.atleast_1d(v)) for v in columnas.values()}
+        if len(longitudes) != 1:
+            raise ValueError("Todas las columnas deben tener la misma longitud")
+        k = longitudes.pop()
+
+        self._crecer(self._tam + k)
+        bloque = self._datos[self._tam:self._tam + k]
+        for nombre, valores in columnas.items():
+            bloque[nombre] = valores
+        self._tam += k
+
+    @property
+    def registros(self):
+        """Arreglo estructurado con los registros escritos (vista, sin copia)."""
+        return self._datos[:self._tam]
+
+    @property
+    def num_registros(self):
+        """Número de registros escritos."""
+        return self._tam
+
+    @property
+    def en_disco(self):
+        """True si el almacén está respaldado por np.memmap."""
+        return isinstance(self._datos, np.memmap)
+
+    def a_dict(self):
+        """
+        Convertir a dict de listas de Python (formato legado), con None en lugar de NaN.
+        """
+        salida = {}
+        for nombre in self.dtype.names:
+            columna = self[nombre].tolist()
+            if np.issubdtype(self.dtype[nombre], np.floating):
+                columna = [None if v != v else v for v in columna]
+            salida[nombre] = columna
+        return salida
+
+    def flush(self):
+        """Volcar a disco si el almacén usa np.memmap."""
+        if self.en_disco:
+            self._datos.flush()
+
+    def cerrar(self):
+        """
+        Volcar a disco y, si el almacén creó su propio archivo temporal, borrarlo.
+
+        Tras cerrar un almacén temporal queda vacío; las columnas obtenidas antes
+        siguen siendo válidas en sistemas POSIX (el mapa sobrevive al borrado).
+        """
+        self.flush()
+        if self._finalizador is not None and self._finalizador.alive:
+            self._datos = np.empty(1, dtype=self.dtype)
+            self._tam = 0
+            self._finalizador()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    # Interfaz Mapping: vista tipo dict por columnas
+    def __getitem__(self, clave):
+        if clave not in self.dtype.names:
+            raise KeyError(clave)
+        return self._datos[clave][:self._tam]
+
+    def __iter__(self):
+        return iter(self.dtype.names)
+
+    def __len__(self):
+        return len(self.dtype.names)
+
+    def __repr__(self):
+        destino = f"memmap:{self.ruta}" if self.en_disco else "memoria"
+        return (f"AlmacenResultados(campos={list(self.dtype.names)}, "
+                f"registros={self._tam}, {destino})")
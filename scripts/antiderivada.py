@@ -11,6 +11,7 @@ Uso:
 import numpy as np
 import matplotlib.pyplot as plt
 from integrales_numericas import IntegracionNumerica
+from perfilado import etapa, seccion
 
 # Paleta de colores profesional
 COLOR_PRINCIPAL = '#1F4788'    # Azul oscuro profesional
@@ -18,6 +19,7 @@ COLOR_SECUNDARIO = '#8B3A62'   # Púrpura profesional
 COLOR_ACENTO = '#5C946E'       # Verde profesional
 
 
+@seccion('antiderivada.ejecutar_antiderivada')
 def ejecutar_antiderivada():
     """
     Ejecutar integración analítica mediante antiderivada.
@@ -43,9 +45,10 @@ def ejecutar_antiderivada():
     a = integ.a
     b = integ.b
     
-    F_a = integ.antiderivada_energia(a)
-    F_b = integ.antiderivada_energia(b)
-    Z = F_b - F_a
+    with etapa('compute'):
+        F_a = integ.antiderivada_energia(a)
+        F_b = integ.antiderivada_energia(b)
+        Z = F_b - F_a
     
     print("\n" + "-" * 70)
     print("EVALUACIÓN EN LOS LÍMITES")
@@ -70,8 +73,9 @@ def ejecutar_antiderivada():
     
     # Comparar con métodos numéricos
     n_test = 1000
-    trap_1000 = integ.trapecio(n_test)
-    simp_1000 = integ.simpson(n_test)
+    with etapa('compute'):
+        trap_1000 = integ.trapecio(n_test)
+        simp_1000 = integ.simpson(n_test)
     
     error_trap = abs(trap_1000 - Z)
     error_simp = abs(simp_1000 - Z)
@@ -100,13 +104,15 @@ def ejecutar_antiderivada():
     print("\n" + "=" * 70)
 
 
+@etapa('draw')
 def generar_grafico_antiderivada(integ, area_exacta):
     """
     Generar visualización de función, antiderivada y área bajo la curva.
     """
-    N = np.linspace(integ.a, integ.b, 500)
-    E = integ.funcion_energia(N)
-    F = integ.antiderivada_energia(N)
+    with etapa('compute'):
+        N = np.linspace(integ.a, integ.b, 500)
+        E = integ.funcion_energia(N)
+        F = integ.antiderivada_energia(N)
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
     fig.suptitle('Integración Analítica: Antiderivadas', fontsize=14, fontweight='bold')
@@ -142,15 +148,18 @@ def generar_grafico_antiderivada(integ, area_exacta):
     ax2.grid(True, alpha=0.25, linestyle=':')
     ax2.legend(fontsize=10, loc='upper left')
     
-    plt.tight_layout()
+    with etapa('layout'):
+        plt.tight_layout()
     
     # Guardar figuras
     import os
     os.makedirs('../figuras/png', exist_ok=True)
     os.makedirs('../figuras/pdf', exist_ok=True)
     
-    fig.savefig('../figuras/png/antiderivada_area.png', dpi=300, bbox_inches='tight')
-    fig.savefig('../figuras/pdf/antiderivada_area.pdf', bbox_inches='tight')
+    with etapa('savefig-png'):
+        fig.savefig('../figuras/png/antiderivada_area.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig('../figuras/pdf/antiderivada_area.pdf', bbox_inches='tight')
     plt.close()
 
 
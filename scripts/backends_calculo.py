@@ -0,0 +1,323 @@
+"""
+backends_calculo.py
+===================
+Backends intercambiables para evaluar el integrando polinomial y sus sumas sobre mallas.
+
+Cada backend ofrece dos operaciones para un polinomio fijo (coeficientes en orden
+descendente, evaluado por Horner):
+- evaluar(x): p(x) elemento a elemento
+- suma_malla(inicio, paso, num_puntos): sum_{i<num_puntos} p(inicio + i paso), sin
+  materializar la malla completa (núcleo fusionado de los métodos de integración)
+
+Implementaciones:
+- numpy:   siempre disponible; malla por bloques en caché
+- numexpr: multihilo y sin temporales intermedios (opcional)
+- numba:   núcleo compilado JIT con bucle paralelo (opcional)
+
+Si el paquete de un backend no está instalado se usa numpy con un aviso. La selección
+'auto' mide los backends disponibles con un micro-benchmark al primer uso para cada
+orden de magnitud del número de puntos y guarda el más rápido.
+
+Uso:
+    IntegracionNumerica(backend='auto')          # o 'numpy', 'numexpr', 'numba'
+    BACKEND_CALCULO=auto python trapecio.py 100000
+    python backends_calculo.py                   # tabla del micro-benchmark y verificación
+"""
+
+import math
+import sys
+import warnings
+
+import numpy as np
+
+from medicion import medir_tiempo
+
+# Puntos por bloque de la malla en los backends por bloques
+TAM_BLOQUE = 2**16
+
+# Presupuesto del micro-benchmark por backend (segundos)
+TIEMPO_SELECCION_S = 0.05
+
+# Número de puntos máximo del micro-benchmark (los órdenes mayores usan este)
+PUNTOS_MAX_SELECCION = 10**7
+
+# Instancias y selecciones guardadas: (nombre, coeficientes) / (coeficientes, orden)
+_INSTANCIAS = {}
+_SELECCION = {}
+
+
+class BackendNumPy:
+    """
+    Backend de referencia con NumPy.
+    """
+
+    nombre = 'numpy'
+
+    def __init__(self, coeficientes):
+        self.coeficientes = tuple(float(c) for c in coeficientes)
+
+    def evaluar(self, x):
+        resultado = self.coeficientes[0]
+        for coef in self.coeficientes[1:]:
+            resultado = resultado * x + coef
+        return resultado
+
+    def suma_malla(self, inicio, paso, num_puntos):
+        parciales = []
+        for k in range(0, num_puntos, TAM_BLOQUE):
+            x = inicio + np.arange(k, min(k + TAM_BLOQUE, num_puntos), dtype=np.float64) * paso
+            parciales.append(float(np.sum(self.evaluar(x))))
+        return math.fsum(parciales)
+
+
+class BackendNumexpr(BackendNumPy):
+    """
+    Backend numexpr: evaluación multihilo de la expresión de Horner sin temporales.
+    """
+
+    nombre = 'numexpr'
+
+    # Bloques mayores: numexpr reparte cada bloque entre sus hilos
+    TAM_BLOQUE = 2**20
+
+    def __init__(self, coeficientes):
+        import numexpr
+        super().__init__(coeficientes)
+        self._ne = numexpr
+        expresion = repr(self.coeficientes[0])
+        for coef in self.coeficientes[1:]:
+            expresion = f'({expresion}) * x + {coef!r}'
+        self._expresion = expresion
+
+    def evaluar(self, x):
+        return self._ne.evaluate(self._expresion, local_dict={'x': np.asarray(x)})
+
+    def suma_malla(self, inicio, paso, num_puntos):
+        parciales = []
+        for k in range(0, num_puntos, self.TAM_BLOQUE):
+            i = np.arange(k, min(k + self.TAM_BLOQUE, num_puntos), dtype=np.float64)
+            x = self._ne.evaluate('inicio + i * paso',
+                                  local_dict={'inicio': inicio, 'i': i, 'paso': paso})
+            parciales.append(float(self._ne.evaluate(f'sum({self._expresion})',
+                                                     local_dict={'x': x})))
+        return math.fsum(parciales)
+
+
+_NUCLEOS_NUMBA = {}
+
+
+def _nucleos_numba():
+    """Compilar (una vez) los núcleos de numba."""
+    if not _NUCLEOS_NUMBA:
+        import numba
+
+        @numba.njit(parallel=True, cache=True)
+        def evaluar(coeficientes, x):
+            salida = np.empty_like(x)
+            for i in numba.prange(x.size):
+                r = coeficientes[0]
+                for j in range(1, coeficientes.size):
+                    r = r * x[i] + coeficientes[j]
+                salida[i] = r
+            return salida
+
+        @numba.njit(parallel=True, cache=True)
+        def suma_malla(coeficientes, inicio, paso, num_puntos):
+            total = 0.0
+            for i in numba.prange(num_puntos):
+                x = inicio + i * paso
+                r = coeficientes[0]
+                for j in range(1, coeficientes.size):
+                    r = r * x + coeficientes[j]
+                total += r
+            return total
+
+        _NUCLEOS_NUMBA['evaluar'] = evaluar
+        _NUCLEOS_NUMBA['suma_malla'] = suma_malla
+    return _NUCLEOS_NUMBA
+
+
+class BackendNumba(BackendNumPy):
+    """
+    Backend numba: evaluación y suma fusionadas en un bucle paralelo compilado.
+    """
+
+    nombre = 'numba'
+
+    def __init__(self, coeficientes):
+        super().__init__(coeficientes)
+        self._nucleos = _nucleos_numba()
+        self._coef = np.array(self.coeficientes, dtype=np.float64)
+
+    def evaluar(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        return self._nucleos['evaluar'](self._coef, x.ravel()).reshape(x.shape)
+
+    def suma_malla(self, inicio, paso, num_puntos):
+        return float(self._nucleos['suma_malla'](self._coef, float(inicio), float(paso),
+                                                 int(num_puntos)))
+
+
+BACKENDS = {
+    'numpy': BackendNumPy,
+    'numexpr': BackendNumexpr,
+    'numba': BackendNumba,
+}
+
+
+def crear_backend(nombre, coeficientes):
+    """
+    Instancia (guardada) de un backend para unos coeficientes.
+
+    Si el paquete del backend no está instalado, avisa y retorna el backend numpy.
+    """
+    if nombre not in BACKENDS:
+        raise ValueError(f"backend debe ser 'auto' o uno de: {', '.join(BACKENDS)}")
+    coeficientes = tuple(float(c) for c in coeficientes)
+    clave = (nombre, coeficientes)
+    if clave not in _INSTANCIAS:
+        try:
+            _INSTANCIAS[clave] = BACKENDS[nombre](coeficientes)
+        except ImportError as error:
+            warnings.warn(f"Backend '{nombre}' no disponible ({error}); se usa numpy",
+                          RuntimeWarning, stacklevel=2)
+            _INSTANCIAS[clave] = crear_backend('numpy', coeficientes)
+    return _INSTANCIAS[clave]
+
+
+def disponibles():
+    """Nombres de los backends cuyo paquete está instalado."""
+    nombres = []
+    for nombre in BACKENDS:
+        try:
+            BACKENDS[nombre]((1.0, 0.0))
+        except ImportError:
+            continue
+        nombres.append(nombre)
+    return nombres
+
+
+def medir_backends(coeficientes, num_puntos, inicio=1.1, fin=8.0):
+    """
+    Micro-benchmark de suma_malla en los backends disponibles.
+
+    Retorna:
+    --------
+    dict
+        nombre -> mediana en ms (la compilación JIT queda en el calentamiento)
+    """
+    paso = (fin - inicio) / num_puntos
+    tiempos = {}
+    for nombre in disponibles():
+        backend = crear_backend(nombre, coeficientes)
+        _, stats = medir_tiempo(lambda: backend.suma_malla(inicio, paso, num_puntos),
+                                calentamiento=1, tiempo_objetivo=TIEMPO_SELECCION_S,
+                                min_repeticiones=3)
+        tiempos[nombre] = stats['mediana_ms']
+    return tiempos
+
+
+def _orden(num_puntos):
+    return max(int(math.log10(max(num_puntos, 1))), 0)
+
+
+def seleccionar_backend(coeficientes, num_puntos):
+    """
+    Backend más rápido para el orden de magnitud de num_puntos (medido una sola vez).
+    """
+    coeficientes = tuple(float(c) for c in coeficientes)
+    clave = (coeficientes, _orden(num_puntos))
+    if clave not in _SELECCION:
+        tiempos = medir_backends(coeficientes, min(10**clave[1], PUNTOS_MAX_SELECCION))
+        _SELECCION[clave] = crear_backend(min(tiempos, key=tiempos.get), coeficientes)
+    return _SELECCION[clave]
+
+
+def backend_para(nombre, coeficientes, num_puntos):
+    """
+    Backend a usar: el indicado por nombre o, con 'auto', el seleccionado por tamaño.
+    """
+    if nombre == 'auto':
+        return seleccionar_backend(coeficientes, num_puntos)
+    return crear_backend(nombre, coeficientes)
+
+
+def verificar_backends(tolerancia=1e-9):
+    """
+    Comprobar cada backend disponible contra los métodos originales.
+
+    Además de E(N), integra x^2 en [0, 3] (exacta = 9) sustituyendo funcion_energia en
+    la instancia: con backend, los métodos deben usar el integrando sustituido y no
+    la suma fusionada de COEFICIENTES_ENERGIA.
+
+    Retorna:
+    --------
+    list
+        Fallos como tuplas (backend, caso, valor, esperado); vacía si todo coincide
+    """
+    from integrales_numericas import IntegracionNumerica
+
+    casos = [('trapecio', lambda integ: integ.trapecio(100)),
+             ('simpson', lambda integ: integ.simpson(100))]
+    casos += [(f'rectangulos_{mode}', lambda integ, mode=mode: integ.rectangulos(100, mode))
+              for mode in ('left', 'mid', 'right')]
+
+    # Referencias sin backend (ni siquiera el de BACKEND_CALCULO)
+    original = IntegracionNumerica()
+    original.backend = None
+    original_x2 = IntegracionNumerica(0.0, 3.0)
+    original_x2.backend = None
+    original_x2.funcion_energia = lambda x: x**2
+
+    fallos = []
+    for nombre in disponibles():
+        for caso, metodo in casos:
+            esperado = metodo(original)
+            valor = metodo(IntegracionNumerica(backend=nombre))
+            if abs(valor - esperado) > tolerancia * abs(esperado):
+                fallos.append((nombre, f'E(N) {caso}', valor, esperado))
+
+            sustituida = IntegracionNumerica(0.0, 3.0, backend=nombre)
+            sustituida.funcion_energia = lambda x: x**2
+            valor, esperado = metodo(sustituida), metodo(original_x2)
+            if abs(valor - esperado) > tolerancia * abs(esperado):
+                fallos.append((nombre, f'x^2 {caso}', valor, esperado))
+    return fallos
+
+
+def main():
+    """Punto de ejecución principal."""
+    from integrales_numericas import IntegracionNumerica
+
+    coeficientes = IntegracionNumerica.COEFICIENTES_ENERGIA
+    nombres = disponibles()
+    print("=" * 70)
+    print("BACKENDS DE CÁLCULO")
+    print("=" * 70)
+    print(f"\nDisponibles: {', '.join(nombres)}")
+    faltantes = [n for n in BACKENDS if n not in nombres]
+    if faltantes:
+        print(f"No instalados (respaldo numpy): {', '.join(faltantes)}")
+
+    print(f"\n{'Puntos':>10} | " + " | ".join(f"{n + ' (ms)':>14}" for n in nombres)
+          + f" | {'Seleccionado':>12}")
+    print("-" * 70)
+    for exponente in range(3, 8):
+        num_puntos = 10**exponente
+        tiempos = medir_backends(coeficientes, num_puntos)
+        elegido = seleccionar_backend(coeficientes, num_puntos).nombre
+        print(f"{num_puntos:>10} | " + " | ".join(f"{tiempos[n]:>14.3f}" for n in nombres)
+              + f" | {elegido:>12}")
+
+    fallos = verificar_backends()
+    print("\nVerificación contra los métodos originales (E(N) y funcion_energia sustituida): "
+          + ("OK" if not fallos else f"{len(fallos)} fallos"))
+    for nombre, caso, valor, esperado in fallos:
+        print(f"  {nombre:<8} {caso:<22} {valor:.12g} (esperado {esperado:.12g})")
+    print("\n" + "=" * 70)
+    if fallos:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
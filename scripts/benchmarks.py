@@ -0,0 +1,309 @@
+"""
+benchmarks.py
+=============
+Suite de benchmarks de los núcleos de integración y del pipeline de figuras.
+
+Cargas medidas:
+- IntegracionNumerica.trapecio, simpson y rectangulos (left/mid/right) para varios n
+- Barridos analizar_convergencia_* y generar_reporte
+- Render + guardado de una figura por cada familia de gráficos
+- Memoria pico y neta por llamada (tracemalloc) junto a cada tiempo
+
+Los resultados se guardan en JSON; el comando 'comparar' contrasta una corrida con
+la línea base del repositorio (benchmark_baseline.json) y marca regresiones.
+
+Uso:
+    python benchmarks.py ejecutar [--salida archivo.json] [--completo] [--filtro texto]
+    python benchmarks.py comparar actual.json [--base benchmark_baseline.json] [--umbral 0.25]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+
+from integrales_numericas import IntegracionNumerica
+from medicion import medir_memoria, medir_tiempo
+
+DIR_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+RUTA_BASE = os.path.join(DIR_SCRIPTS, 'benchmark_baseline.json')
+
+# n por defecto (rápido) y completo (hasta 10^8; requiere varios GB de RAM)
+VALORES_N = [10, 10**2, 10**3, 10**4, 10**5, 10**6]
+VALORES_N_COMPLETO = VALORES_N + [10**7, 10**8]
+VALORES_N_CONVERGENCIA = [10, 20, 50, 100, 200, 500, 1000]
+
+# Presupuesto de tiempo por benchmark (s) y límites de repeticiones
+TIEMPO_OBJETIVO = 0.5
+MIN_REPETICIONES = 3
+MAX_REPETICIONES = 1000
+
+# Aumento relativo tolerado por 'comparar' y estadística comparada. El mínimo es la
+# estadística más estable entre corridas; los casos de microsegundos varían >20%
+# por ruido del sistema aunque el código no cambie
+UMBRAL_REGRESION = 0.25
+METRICA_DEFECTO = 'min_s'
+
+# El piso de ruido de 'comparar' (p95 de la base + umbral) no supera el mínimo de la
+# base por más de MARGEN_RUIDO_MAX veces el umbral (1.75x con el umbral por defecto)
+MARGEN_RUIDO_MAX = 3
+
+
+def medir(funcion, tiempo_objetivo=TIEMPO_OBJETIVO):
+    """
+    Medir una función con el arnés estadístico de medicion.py.
+
+    La memoria se mide con tracemalloc en una llamada adicional, fuera de las
+    repeticiones cronometradas.
+
+    Retorna:
+    --------
+    dict
+        min_s, mediana_s, p95_s, repeticiones, memoria_pico_bytes, memoria_neta_bytes
+    """
+    _, stats = medir_tiempo(funcion, calentamiento=1, tiempo_objetivo=tiempo_objetivo,
+                            min_repeticiones=MIN_REPETICIONES,
+                            max_repeticiones=MAX_REPETICIONES)
+    _, memoria = medir_memoria(funcion)
+    return {
+        'min_s': stats['min_ms'] / 1e3,
+        'mediana_s': stats['mediana_ms'] / 1e3,
+        'p95_s': stats['p95_ms'] / 1e3,
+        'repeticiones': stats['repeticiones'],
+        'memoria_pico_bytes': memoria['pico_bytes'],
+        'memoria_neta_bytes': memoria['neto_bytes']
+    }
+
+
+def casos_nucleos(valores_n):
+    """Benchmarks de los métodos de IntegracionNumerica."""
+    integ = IntegracionNumerica()
+    casos = {}
+    for n in valores_n:
+        casos[f'trapecio/n={n}'] = lambda n=n: integ.trapecio(n)
+        casos[f'simpson/n={n}'] = lambda n=n: integ.simpson(n)
+        for mode in ['left', 'mid', 'right']:
+            casos[f'rectangulos_{mode}/n={n}'] = lambda n=n, mode=mode: integ.rectangulos(n, mode)
+    return casos
+
+
+def casos_convergencia():
+    """Benchmarks de barridos de convergencia y reportes."""
+    integ = IntegracionNumerica()
+    valores_n = VALORES_N_CONVERGENCIA
+    casos = {
+        'convergencia/trapecio': lambda: integ.analizar_convergencia_trapecio(valores_n),
+        'convergencia/simpson': lambda: integ.analizar_convergencia_simpson(valores_n),
+    }
+    for mode in ['left', 'mid', 'right']:
+        casos[f'convergencia/rectangulos_{mode}'] = (
+            lambda mode=mode: integ.analizar_convergencia_rectangulos(valores_n, mode))
+    for metodo in ['trapecio', 'simpson', 'rectangulos']:
+        casos[f'reporte/{metodo}'] = lambda metodo=metodo: integ.generar_reporte(metodo, valores_n)
+    return casos
+
+
+def casos_figuras():
+    """Benchmarks de render + guardado (PNG y PDF) de una figura por familia."""
+    import antiderivada
+    import comparativa_modelos
+    import rectangulos
+    import rectangulos_visualizacion
+    import simpson
+    import trapecio
+
+    integ = IntegracionNumerica()
+    valores_n = VALORES_N_CONVERGENCIA
+    rep_trap = integ.analizar_convergencia_trapecio(valores_n)
+    rep_simp = integ.analizar_convergencia_simpson(valores_n)
+    rep_rect = rectangulos.analizar_convergencia_rectangulos(integ, valores_n, 'mid')
+
+    return {
+        'figura/rectangulos_convergencia':
+            lambda: rectangulos.generar_grafico_rectangulos(rep_rect, integ, 'mid'),
+        'figura/trapecio_convergencia': lambda: trapecio.generar_grafico_trapecio(rep_trap, integ),
+        'figura/simpson_convergencia': lambda: simpson.generar_grafico_simpson(rep_simp, integ),
+        'figura/antiderivada_area':
+            lambda: antiderivada.generar_grafico_antiderivada(integ, integ.integral_exacta()),
+        'figura/rectangulos_modelos':
+            lambda: rectangulos_visualizacion.graficar_rectangulos_con_modelos([10, 100, 1000], 'mid'),
+        'figura/rectangulos_detalle':
+            lambda: rectangulos_visualizacion.graficar_comparativa_n_individual([100], 'mid'),
+        'figura/comparativa_modelos_n':
+            lambda: comparativa_modelos.comparar_todos_modelos_mismo_n(100, 'mid'),
+        'figura/comparativa_convergencia': lambda: comparativa_modelos.comparar_tres_n_mismo_modo('mid'),
+        'figura/comparativa_modos': lambda: comparativa_modelos.comparar_tres_modos_mismo_n(100),
+    }
+
+
+class _DirectorioAislado:
+    """
+    Ejecutar en un directorio temporal 'scripts/' para que las figuras, que se guardan
+    en '../figuras/', no toquen el repositorio. Silencia stdout de los scripts.
+    """
+
+    def __enter__(self):
+        self._raiz = tempfile.mkdtemp(prefix='benchmarks_')
+        self._cwd = os.getcwd()
+        trabajo = os.path.join(self._raiz, 'scripts')
+        os.makedirs(trabajo)
+        os.chdir(trabajo)
+        self._stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        return self
+
+    def __exit__(self, *exc):
+        sys.stdout.close()
+        sys.stdout = self._stdout
+        os.chdir(self._cwd)
+        shutil.rmtree(self._raiz, ignore_errors=True)
+        return False
+
+
+def ejecutar_benchmarks(completo=False, filtro=None):
+    """
+    Ejecutar la suite completa.
+
+    Parámetros:
+    -----------
+    completo : bool
+        Incluir n = 10^7 y 10^8 en los núcleos
+    filtro : str, opcional
+        Ejecutar solo los benchmarks cuyo nombre contiene este texto
+
+    Retorna:
+    --------
+    dict
+        {'meta': {...}, 'resultados': {nombre: {min_s, mediana_s, p95_s, repeticiones,
+                                                memoria_pico_bytes, memoria_neta_bytes}}}
+    """
+    casos = {}
+    casos.update(casos_nucleos(VALORES_N_COMPLETO if completo else VALORES_N))
+    casos.update(casos_convergencia())
+    casos.update(casos_figuras())
+    if filtro:
+        casos = {k: v for k, v in casos.items() if filtro in k}
+
+    resultados = {}
+    for nombre, funcion in casos.items():
+        with _DirectorioAislado():
+            resultados[nombre] = medir(funcion)
+        r = resultados[nombre]
+        print(f"{nombre:<40} | mediana {r['mediana_s']*1000:>11.3f} ms | "
+              f"min {r['min_s']*1000:>11.3f} ms | p95 {r['p95_s']*1000:>11.3f} ms | "
+              f"reps {r['repeticiones']:>4} | pico {r['memoria_pico_bytes'] / 2**20:>9.2f} MiB")
+
+    return {
+        'meta': {
+            'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'plataforma': platform.platform(),
+            'procesador': platform.processor() or platform.machine(),
+            'completo': completo
+        },
+        'resultados': resultados
+    }
+
+
+def comparar(actual, base, umbral=UMBRAL_REGRESION, metrica=METRICA_DEFECTO):
+    """
+    Comparar dos corridas y listar regresiones.
+
+    Un caso es regresión si la métrica aumenta más que `umbral` y, cuando la base
+    registra p95_s, el mínimo actual supera además un piso de ruido: el p95 de la base
+    más `umbral`, acotado a MARGEN_RUIDO_MAX x umbral sobre el mínimo de la base. Así
+    el ruido entre repeticiones (casos de pocas repeticiones, como las figuras) no se
+    marca y una base con p95 muy disperso no oculta una regresión grande (con el
+    umbral por defecto, toda regresión de 2x o más se marca).
+
+    Parámetros:
+    -----------
+    actual, base : dict
+        Corridas con el formato de ejecutar_benchmarks()
+    umbral : float
+        Aumento relativo tolerado (0.25 = 25%)
+    metrica : str
+        'min_s' o 'mediana_s'
+
+    Retorna:
+    --------
+    list
+        Tuplas (nombre, tiempo_base, tiempo_actual, cambio_relativo, es_regresion)
+    """
+    filas = []
+    for nombre, r in actual['resultados'].items():
+        if nombre not in base['resultados']:
+            continue
+        r_base = base['resultados'][nombre]
+        t_base = r_base[metrica]
+        t_actual = r[metrica]
+        cambio = t_actual / t_base - 1 if t_base > 0 else 0.0
+        if 'p95_s' in r_base:
+            piso = min(r_base['p95_s'] * (1 + umbral),
+                       r_base['min_s'] * (1 + MARGEN_RUIDO_MAX * umbral))
+            estable = r['min_s'] > piso
+        else:
+            estable = True
+        filas.append((nombre, t_base, t_actual, cambio, cambio > umbral and estable))
+    return filas
+
+
+def _cargar(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    """Punto de ejecución principal."""
+    parser = argparse.ArgumentParser(description="Benchmarks de integración numérica y figuras")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_ejec = sub.add_parser('ejecutar', help="Ejecutar la suite y guardar JSON")
+    p_ejec.add_argument('--salida', default='benchmark_actual.json')
+    p_ejec.add_argument('--completo', action='store_true', help="Incluir n = 10^7 y 10^8")
+    p_ejec.add_argument('--filtro', default=None)
+
+    p_comp = sub.add_parser('comparar', help="Comparar una corrida con la línea base")
+    p_comp.add_argument('actual')
+    p_comp.add_argument('--base', default=RUTA_BASE)
+    p_comp.add_argument('--umbral', type=float, default=UMBRAL_REGRESION)
+    p_comp.add_argument('--metrica', choices=['min_s', 'mediana_s'], default=METRICA_DEFECTO)
+
+    args = parser.parse_args()
+
+    if args.comando == 'ejecutar':
+        print("=" * 90)
+        print("BENCHMARKS - INTEGRACIÓN NUMÉRICA Y FIGURAS")
+        print("=" * 90)
+        corrida = ejecutar_benchmarks(args.completo, args.filtro)
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(corrida, f, indent=2, sort_keys=True)
+        print(f"\nArchivo guardado: {args.salida}")
+        return
+
+    filas = comparar(_cargar(args.actual), _cargar(args.base), args.umbral, args.metrica)
+    print(f"\n{'Benchmark':<40} | {'Base (ms)':>11} | {'Actual (ms)':>11} | {'Cambio':>8}")
+    print("-" * 82)
+    regresiones = 0
+    for nombre, t_base, t_actual, cambio, es_regresion in filas:
+        marca = '  REGRESIÓN' if es_regresion else ''
+        regresiones += es_regresion
+        print(f"{nombre:<40} | {t_base*1000:>11.3f} | {t_actual*1000:>11.3f} | {cambio:>+7.1%}{marca}")
+
+    print(f"\nRegresiones (> {args.umbral:.0%}): {regresiones} de {len(filas)}")
+    sys.exit(1 if regresiones else 0)
+
+
+if __name__ == '__main__':
+    main()
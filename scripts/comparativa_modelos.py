@@ -12,6 +12,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
 from integrales_numericas import IntegracionNumerica
+from perfilado import etapa, seccion
 import os
 
 # Paleta de colores estandarizada - CONSISTENCIA VISUAL
@@ -52,6 +53,7 @@ def rectangles_method(f, a, b, n, mode='mid'):
     return aprox_area, x_rects, heights, h
 
 
+@etapa('draw')
 def comparar_todos_modelos_mismo_n(n=100, mode='mid'):
     """
     Generar gráfica comparativa con todos los modelos en un mismo valor de n.
@@ -65,9 +67,10 @@ def comparar_todos_modelos_mismo_n(n=100, mode='mid'):
     E_curva = integ.funcion_energia(N_curva)
     
     # Calcular rectángulos
-    aprox_area, x_rects, heights, width = rectangles_method(
-        integ.funcion_energia, integ.a, integ.b, n, mode
-    )
+    with etapa('compute'):
+        aprox_area, x_rects, heights, width = rectangles_method(
+            integ.funcion_energia, integ.a, integ.b, n, mode
+        )
     
     # Dibujar rectángulos (muy transparentes)
     ax.bar(x_rects, heights, width=width, align='edge',
@@ -108,20 +111,24 @@ def comparar_todos_modelos_mismo_n(n=100, mode='mid'):
     ax.set_ylim(0, max(E_curva) * 1.15)
     ax.legend(fontsize=10, loc='upper left', framealpha=0.95, ncol=2)
     
-    plt.tight_layout()
+    with etapa('layout'):
+        plt.tight_layout()
     
     # Guardar
     os.makedirs('../figuras/png', exist_ok=True)
     os.makedirs('../figuras/pdf', exist_ok=True)
     
     filename = f'comparativa_modelos_n{n}_{mode}'
-    fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
-    fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
+    with etapa('savefig-png'):
+        fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
     plt.close()
     
     print(f"Comparativa guardada: {filename}.png / {filename}.pdf")
 
 
+@etapa('draw')
 def comparar_tres_n_mismo_modo(mode='mid'):
     """
     Generar gráfica con 3 subplots mostrando n=10, 100, 1000 para mismo modo.
@@ -141,9 +148,10 @@ def comparar_tres_n_mismo_modo(mode='mid'):
         ax = axes[idx]
         
         # Calcular rectángulos
-        aprox_area, x_rects, heights, width = rectangles_method(
-            integ.funcion_energia, integ.a, integ.b, n, mode
-        )
+        with etapa('compute'):
+            aprox_area, x_rects, heights, width = rectangles_method(
+                integ.funcion_energia, integ.a, integ.b, n, mode
+            )
         error_abs = abs(aprox_area - exact)
         error_rel = (error_abs / exact) * 100
         
@@ -176,20 +184,24 @@ def comparar_tres_n_mismo_modo(mode='mid'):
         ax.set_xlim(integ.a - 0.2, integ.b + 0.2)
         ax.set_ylim(10, max(E_curva) * 1.12)
     
-    plt.tight_layout()
+    with etapa('layout'):
+        plt.tight_layout()
     
     # Guardar
     os.makedirs('../figuras/png', exist_ok=True)
     os.makedirs('../figuras/pdf', exist_ok=True)
     
     filename = f'comparativa_convergencia_{mode}'
-    fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
-    fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
+    with etapa('savefig-png'):
+        fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
     plt.close()
     
     print(f"Convergencia guardada: {filename}.png / {filename}.pdf")
 
 
+@etapa('draw')
 def comparar_tres_modos_mismo_n(n=100):
     """
     Generar gráfica con 3 subplots mostrando left, mid, right para mismo n.
@@ -209,9 +221,10 @@ def comparar_tres_modos_mismo_n(n=100):
         ax = axes[idx]
         
         # Calcular rectángulos
-        aprox_area, x_rects, heights, width = rectangles_method(
-            integ.funcion_energia, integ.a, integ.b, n, mode
-        )
+        with etapa('compute'):
+            aprox_area, x_rects, heights, width = rectangles_method(
+                integ.funcion_energia, integ.a, integ.b, n, mode
+            )
         error_abs = abs(aprox_area - exact)
         error_rel = (error_abs / exact) * 100
         
@@ -244,15 +257,18 @@ def comparar_tres_modos_mismo_n(n=100):
         ax.set_xlim(integ.a - 0.2, integ.b + 0.2)
         ax.set_ylim(10, max(E_curva) * 1.12)
     
-    plt.tight_layout()
+    with etapa('layout'):
+        plt.tight_layout()
     
     # Guardar
     os.makedirs('../figuras/png', exist_ok=True)
     os.makedirs('../figuras/pdf', exist_ok=True)
     
     filename = f'comparativa_modos_n{n}'
-    fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
-    fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
+    with etapa('savefig-png'):
+        fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
     plt.close()
     
     print(f"Comparación de modos guardada: {filename}.png / {filename}.pdf")
@@ -312,6 +328,7 @@ def generar_tabla_resultados():
     print("=" * 100)
 
 
+@seccion('comparativa_modelos.main')
 def main():
     """Ejecutar todas las comparativas."""
     print("=" * 80)
@@ -0,0 +1,395 @@
+"""
+construccion.py
+===============
+Orquestador de la construcción del informe: scripts -> datos -> figuras -> PDF.
+
+Cada tarea declara su comando, sus entradas (archivos o patrones glob, relativos a la
+raíz del proyecto), sus salidas y las tareas de las que depende; juntas forman un grafo
+acíclico. Las tareas listas se ejecutan en paralelo hasta el límite de trabajos (-j)
+y solo se rehacen las desactualizadas. Una tarea está desactualizada si:
+- falta alguna salida (un patrón sin coincidencias)
+- no tiene sello (build/.sellos/<tarea>.sello, escrito al terminar con éxito)
+- alguna entrada es más reciente que su sello
+
+Las entradas de los scripts incluyen los módulos locales que importan (análisis
+estático de import/from). Como tablas_latex.py reescribe un .tex solo si cambia, el
+PDF no se recompila cuando los resultados no cambiaron.
+
+Al terminar se imprime el tiempo de cada tarea y la ruta crítica (cadena de
+dependencias más larga): el tiempo mínimo de la construcción con trabajos ilimitados.
+
+Uso:
+    python construccion.py                     # todo, -j = número de CPUs
+    python construccion.py -j 2 figuras_comparativa pdf
+    python construccion.py --listar            # estado de cada tarea, sin ejecutar
+    python construccion.py --forzar            # rehacer aunque estén al día
+"""
+
+import argparse
+import glob
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DIR_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(DIR_SCRIPTS)
+DIR_SELLOS = os.path.join(RAIZ, 'build', '.sellos')
+
+# Líneas de registro mostradas cuando una tarea falla
+LINEAS_ERROR = 20
+
+
+class Tarea:
+    """
+    Nodo del grafo de construcción.
+    """
+
+    def __init__(self, nombre, comando, salidas, entradas=(), dependencias=(), cwd=DIR_SCRIPTS):
+        """
+        Parámetros:
+        -----------
+        nombre : str
+            Identificador de la tarea
+        comando : list
+            Argumentos del proceso; si el primero termina en .py se ejecuta con el
+            intérprete actual y sus imports locales se añaden a las entradas
+        salidas : list
+            Archivos o patrones glob producidos (relativos a la raíz)
+        entradas : list
+            Archivos o patrones glob leídos, además del script (relativos a la raíz)
+        dependencias : list
+            Nombres de las tareas que deben terminar antes
+        cwd : str
+            Directorio de ejecución
+        """
+        self.nombre = nombre
+        self.salidas = list(salidas)
+        self.dependencias = list(dependencias)
+        self.cwd = cwd
+        self.entradas = list(entradas)
+        if comando[0].endswith('.py'):
+            self.entradas += [os.path.relpath(ruta, RAIZ) for ruta in modulos_locales(comando[0])]
+            comando = [sys.executable] + list(comando)
+        self.comando = list(comando)
+
+    @property
+    def sello(self):
+        return os.path.join(DIR_SELLOS, self.nombre + '.sello')
+
+    @property
+    def registro(self):
+        return os.path.join(DIR_SELLOS, self.nombre + '.log')
+
+    def motivo_desactualizada(self):
+        """
+        Motivo por el que la tarea debe rehacerse, o None si está al día.
+        """
+        for patron in self.salidas:
+            if not _expandir(patron):
+                return f"falta {patron}"
+        if not os.path.exists(self.sello):
+            return "sin sello"
+        sello = os.path.getmtime(self.sello)
+        for patron in self.entradas:
+            for ruta in _expandir(patron):
+                if os.path.getmtime(ruta) > sello:
+                    return f"cambió {os.path.relpath(ruta, RAIZ)}"
+        return None
+
+
+def _expandir(patron):
+    """Rutas existentes que coinciden con un patrón relativo a la raíz."""
+    return glob.glob(os.path.join(RAIZ, patron))
+
+
+def modulos_locales(script, directorio=DIR_SCRIPTS):
+    """
+    Script y módulos de `directorio` que importa, directa o indirectamente.
+
+    Retorna:
+    --------
+    list
+        Rutas absolutas, empezando por el script
+    """
+    patron = re.compile(r'^\s*(?:from\s+(\w+)|import\s+(\w+))', re.MULTILINE)
+    pendientes = [os.path.join(directorio, script)]
+    vistos = []
+    while pendientes:
+        ruta = pendientes.pop()
+        if ruta in vistos or not os.path.exists(ruta):
+            continue
+        vistos.append(ruta)
+        with open(ruta, encoding='utf-8') as f:
+            for desde, modulo in patron.findall(f.read()):
+                pendientes.append(os.path.join(directorio, (desde or modulo) + '.py'))
+    return vistos
+
+
+# n de trapecio.py y simpson.py (sin argumento piden n por teclado)
+N_FIGURAS = 100
+
+FUENTES_LATEX = ['main.tex', 'preambulo.tex', 'portada.tex', 'bibliografia.bib',
+                 'secciones/*.tex', 'secciones/generadas/*.tex', 'figuras/png/*.png']
+
+TAREAS = [
+    Tarea('datos', ['exportacion_columnar.py'],
+          salidas=['figuras/resultados/reporte_*.npz', 'figuras/resultados/modelos_ai.npz']),
+    Tarea('tablas', ['tablas_latex.py'],
+          salidas=['secciones/generadas/*.tex'],
+          entradas=['figuras/resultados/reporte_*.npz', 'figuras/resultados/modelos_ai.npz'],
+          dependencias=['datos']),
+    Tarea('figuras_rectangulos', ['rectangulos_visualizacion.py'],
+          salidas=['figuras/png/rectangulos_*.png']),
+    Tarea('figuras_comparativa', ['comparativa_modelos.py'],
+          salidas=['figuras/png/comparativa_*.png']),
+    Tarea('figuras_trapecio', ['trapecio.py', str(N_FIGURAS)],
+          salidas=['figuras/png/trapecio_*.png']),
+    Tarea('figuras_simpson', ['simpson.py', str(N_FIGURAS)],
+          salidas=['figuras/png/simpson_*.png']),
+    Tarea('figuras_antiderivada', ['antiderivada.py'],
+          salidas=['figuras/png/antiderivada_*.png']),
+    Tarea('pdf', ['latexmk', '-pdf', '-interaction=nonstopmode', '-output-directory=build',
+                  'main.tex'],
+          salidas=['build/main.pdf'], entradas=FUENTES_LATEX,
+          dependencias=['tablas', 'figuras_rectangulos', 'figuras_comparativa',
+                        'figuras_trapecio', 'figuras_simpson', 'figuras_antiderivada'],
+          cwd=RAIZ),
+]
+
+
+def grafo(tareas=TAREAS):
+    """
+    Diccionario nombre -> Tarea, validado (dependencias existentes y sin ciclos).
+    """
+    por_nombre = {t.nombre: t for t in tareas}
+    if len(por_nombre) != len(tareas):
+        raise ValueError("Nombres de tarea duplicados")
+    for tarea in tareas:
+        for dep in tarea.dependencias:
+            if dep not in por_nombre:
+                raise ValueError(f"{tarea.nombre}: dependencia desconocida '{dep}'")
+    orden_topologico(por_nombre)
+    return por_nombre
+
+
+def orden_topologico(por_nombre, objetivos=None):
+    """
+    Tareas necesarias para `objetivos` (default: todas) en orden topológico.
+    """
+    orden, estado = [], {}
+
+    def visitar(nombre):
+        if estado.get(nombre) == 'hecho':
+            return
+        if estado.get(nombre) == 'visitando':
+            raise ValueError(f"Ciclo de dependencias en '{nombre}'")
+        estado[nombre] = 'visitando'
+        for dep in por_nombre[nombre].dependencias:
+            visitar(dep)
+        estado[nombre] = 'hecho'
+        orden.append(nombre)
+
+    for nombre in (objetivos or por_nombre):
+        if nombre not in por_nombre:
+            raise ValueError(f"Tarea desconocida '{nombre}'; disponibles: {', '.join(por_nombre)}")
+        visitar(nombre)
+    return orden
+
+
+def _ejecutar(tarea):
+    """Ejecutar el comando de una tarea con la salida en su registro. Retorna (ok, segundos)."""
+    os.makedirs(DIR_SELLOS, exist_ok=True)
+    entorno = dict(os.environ, MPLBACKEND='Agg')
+    t0 = time.perf_counter()
+    with open(tarea.registro, 'w', encoding='utf-8') as registro:
+        try:
+            proceso = subprocess.run(tarea.comando, cwd=tarea.cwd, env=entorno,
+                                     stdin=subprocess.DEVNULL, stdout=registro,
+                                     stderr=subprocess.STDOUT)
+            ok = proceso.returncode == 0
+        except FileNotFoundError as error:
+            registro.write(f"No se encontró el comando: {error}\n")
+            ok = False
+    duracion = time.perf_counter() - t0
+    if ok:
+        with open(tarea.sello, 'w', encoding='utf-8') as f:
+            f.write(f"{duracion:.3f}\n")
+    return ok, duracion
+
+
+def construir(objetivos=None, trabajos=None, forzar=False, por_nombre=None):
+    """
+    Construir los objetivos y sus dependencias.
+
+    Parámetros:
+    -----------
+    objetivos : list, opcional
+        Nombres de tarea (default: todas)
+    trabajos : int, opcional
+        Tareas simultáneas (default: número de CPUs)
+    forzar : bool
+        Rehacer todas las tareas aunque estén al día
+
+    Retorna:
+    --------
+    dict
+        nombre -> {'estado': 'ejecutada'|'al día'|'fallida'|'omitida', 'motivo',
+        'inicio', 'fin', 'duracion'} (segundos desde el inicio de la construcción)
+    """
+    if por_nombre is None:
+        por_nombre = grafo()
+    if trabajos is None:
+        trabajos = os.cpu_count() or 1
+    if trabajos < 1:
+        raise ValueError("trabajos debe ser al menos 1")
+
+    pendientes = orden_topologico(por_nombre, objetivos)
+    resultados = {}
+    en_curso = {}
+    t0 = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=trabajos) as ejecutor:
+        while pendientes or en_curso:
+            for nombre in list(pendientes):
+                if len(en_curso) >= trabajos:
+                    break
+                tarea = por_nombre[nombre]
+                estados = [resultados.get(dep, {}).get('estado') for dep in tarea.dependencias]
+                if any(e in ('fallida', 'omitida') for e in estados):
+                    pendientes.remove(nombre)
+                    ahora = time.perf_counter() - t0
+                    resultados[nombre] = {'estado': 'omitida', 'motivo': 'dependencia fallida',
+                                          'inicio': ahora, 'fin': ahora, 'duracion': 0.0}
+                    continue
+                if None in estados:
+                    continue
+                pendientes.remove(nombre)
+                # La vigencia se evalúa al quedar lista: las dependencias ya escribieron
+                motivo = 'forzada' if forzar else tarea.motivo_desactualizada()
+                ahora = time.perf_counter() - t0
+                if motivo is None:
+                    resultados[nombre] = {'estado': 'al día', 'motivo': None,
+                                          'inicio': ahora, 'fin': ahora, 'duracion': 0.0}
+                    continue
+                print(f"[{ahora:7.1f} s] inicia  {nombre} ({motivo})", flush=True)
+                en_curso[ejecutor.submit(_ejecutar, tarea)] = (nombre, motivo, ahora)
+
+            if not en_curso:
+                continue
+            hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                nombre, motivo, inicio = en_curso.pop(futuro)
+                ok, duracion = futuro.result()
+                fin = time.perf_counter() - t0
+                resultados[nombre] = {'estado': 'ejecutada' if ok else 'fallida',
+                                      'motivo': motivo, 'inicio': inicio, 'fin': fin,
+                                      'duracion': duracion}
+                print(f"[{fin:7.1f} s] {'termina' if ok else 'FALLA  '} {nombre} "
+                      f"({duracion:.1f} s)", flush=True)
+                if not ok:
+                    _mostrar_registro(por_nombre[nombre])
+    return resultados
+
+
+def _mostrar_registro(tarea):
+    """Últimas líneas del registro de una tarea fallida."""
+    with open(tarea.registro, encoding='utf-8', errors='replace') as f:
+        lineas = f.readlines()[-LINEAS_ERROR:]
+    print(f"  --- {os.path.relpath(tarea.registro, RAIZ)} (últimas líneas) ---")
+    for linea in lineas:
+        print("  " + linea.rstrip())
+
+
+def ruta_critica(resultados, por_nombre=None):
+    """
+    Cadena de dependencias de mayor duración acumulada.
+
+    Retorna:
+    --------
+    tuple
+        (lista de nombres desde el origen, duración total en segundos)
+    """
+    if por_nombre is None:
+        por_nombre = grafo()
+    acumulado, previo = {}, {}
+    for nombre in orden_topologico(por_nombre, list(resultados)):
+        deps = [d for d in por_nombre[nombre].dependencias if d in acumulado]
+        mejor = max(deps, key=acumulado.get, default=None)
+        previo[nombre] = mejor
+        acumulado[nombre] = resultados[nombre]['duracion'] + (acumulado[mejor] if mejor else 0.0)
+    if not acumulado:
+        return [], 0.0
+    nombre = max(acumulado, key=acumulado.get)
+    total = acumulado[nombre]
+    cadena = []
+    while nombre is not None:
+        cadena.append(nombre)
+        nombre = previo[nombre]
+    return cadena[::-1], total
+
+
+def imprimir_resumen(resultados, tiempo_total, por_nombre=None):
+    """Tabla de tareas y ruta crítica."""
+    cadena, critico = ruta_critica(resultados, por_nombre)
+    suma = sum(r['duracion'] for r in resultados.values())
+
+    print("\n" + "=" * 70)
+    print("RESUMEN DE CONSTRUCCIÓN")
+    print("=" * 70)
+    print(f"\n{'Tarea':<22} | {'Estado':<10} | {'Inicio (s)':>10} | {'Duración (s)':>12} | Crítica")
+    print("-" * 70)
+    for nombre, r in sorted(resultados.items(), key=lambda item: item[1]['inicio']):
+        marca = '*' if nombre in cadena and r['duracion'] > 0 else ''
+        print(f"{nombre:<22} | {r['estado']:<10} | {r['inicio']:>10.1f} | "
+              f"{r['duracion']:>12.1f} | {marca}")
+
+    print(f"\nTiempo total:             {tiempo_total:.1f} s")
+    print(f"Suma de tareas (serie):   {suma:.1f} s")
+    if suma > 0:
+        print(f"Paralelismo efectivo:     {suma / tiempo_total:.2f}x")
+    print(f"Ruta crítica:             {critico:.1f} s  "
+          f"({' -> '.join(n for n in cadena if resultados[n]['duracion'] > 0) or '-'})")
+    print("=" * 70)
+
+
+def listar(por_nombre=None):
+    """Estado de cada tarea sin ejecutar nada."""
+    if por_nombre is None:
+        por_nombre = grafo()
+    print(f"\n{'Tarea':<22} | {'Depende de':<28} | Estado")
+    print("-" * 78)
+    for nombre in orden_topologico(por_nombre):
+        tarea = por_nombre[nombre]
+        motivo = tarea.motivo_desactualizada()
+        print(f"{nombre:<22} | {', '.join(tarea.dependencias) or '-':<28} | "
+              f"{'al día' if motivo is None else 'desactualizada: ' + motivo}")
+
+
+def main():
+    """Punto de ejecución principal."""
+    parser = argparse.ArgumentParser(description='Construcción del informe (grafo de tareas)')
+    parser.add_argument('objetivos', nargs='*',
+                        help=f"Tareas: {', '.join(t.nombre for t in TAREAS)}")
+    parser.add_argument('-j', '--trabajos', type=int, default=os.cpu_count() or 1,
+                        help='Tareas simultáneas (default: número de CPUs)')
+    parser.add_argument('--forzar', action='store_true', help='Rehacer aunque estén al día')
+    parser.add_argument('--listar', action='store_true', help='Mostrar el estado y salir')
+    args = parser.parse_args()
+
+    por_nombre = grafo()
+    if args.listar:
+        listar(por_nombre)
+        return
+
+    t0 = time.perf_counter()
+    resultados = construir(args.objetivos or None, args.trabajos, args.forzar, por_nombre)
+    imprimir_resumen(resultados, time.perf_counter() - t0, por_nombre)
+    if any(r['estado'] in ('fallida', 'omitida') for r in resultados.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""
+costo_precision.py
+==================
+Frontera costo-precisión de los métodos de IntegracionNumerica.
+
+Comparar métodos por n es engañoso: Simpson con n subintervalos evalúa n+1 puntos,
+el punto medio evalúa n. Este módulo cuenta las evaluaciones reales del integrando
+con un envoltorio instrumentado y reporta el error frente a:
+- número de evaluaciones de f (costo para integrandos caros)
+- tiempo de pared (mediana, arnés de medicion.py)
+
+La frontera (puntos no dominados en costo y error) se obtiene con pareto.py.
+
+Uso:
+    python costo_precision.py [exponente_max_n]
+"""
+
+import contextlib
+import os
+import sys
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from exportacion_columnar import exportar_columnar
+from integrales_numericas import CriterioParada, IntegracionNumerica, TIEMPO_MEDICION_S
+from medicion import medir_tiempo
+from pareto import frontera_pareto
+from perfilado import etapa, seccion
+
+# Paleta de colores estandarizada - CONSISTENCIA VISUAL
+COLORES_METODOS = {
+    'trapecio': '#1F4788',
+    'simpson': '#8B3A62',
+    'rectangulos (left)': '#1976D2',
+    'rectangulos (mid)': '#388E3C',
+    'rectangulos (right)': '#F57C00',
+}
+COLOR_FRONTERA = '#6A1B9A'     # Púrpura para la frontera
+
+# (método, modo) evaluados en el reporte
+METODOS = [
+    ('trapecio', None),
+    ('simpson', None),
+    ('rectangulos', 'left'),
+    ('rectangulos', 'mid'),
+    ('rectangulos', 'right'),
+]
+
+# Error mínimo representable en escala log (Simpson llega al redondeo de float64)
+ERROR_MINIMO = 1e-15
+
+
+class IntegrandoContado:
+    """
+    Envoltorio de un integrando que cuenta llamadas y puntos evaluados.
+
+    Acepta escalares o arreglos: una llamada vectorizada con m puntos suma 1 a
+    `llamadas` y m a `puntos`.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.llamadas = 0
+        self.puntos = 0
+
+    def __call__(self, x):
+        self.llamadas += 1
+        self.puntos += np.size(x)
+        return self.f(x)
+
+    def reiniciar(self):
+        """Poner los contadores a cero."""
+        self.llamadas = 0
+        self.puntos = 0
+
+
+@contextlib.contextmanager
+def contar_evaluaciones(integ):
+    """
+    Sustituir temporalmente integ.funcion_energia por un IntegrandoContado.
+
+    Los métodos evalúan f a través de self.funcion_energia, de modo que el atributo
+    de instancia intercepta todas las evaluaciones.
+
+    Uso:
+        with contar_evaluaciones(integ) as contador:
+            integ.simpson(100)
+        contador.puntos  # 101
+    """
+    previo = vars(integ).get('funcion_energia')
+    contador = IntegrandoContado(integ.funcion_energia)
+    integ.funcion_energia = contador
+    try:
+        yield contador
+    finally:
+        if previo is None:
+            del integ.funcion_energia
+        else:
+            integ.funcion_energia = previo
+
+
+def _etiqueta(metodo, mode):
+    return metodo + (f' ({mode})' if mode else '')
+
+
+def _calculo(integ, metodo, mode):
+    if metodo == 'rectangulos':
+        return lambda n: integ.rectangulos(n, mode)
+    return getattr(integ, metodo)
+
+
+def medir_costo_precision(valores_n, integ=None, metodos=METODOS, detener=False):
+    """
+    Medir evaluaciones, tiempo y error de cada método para cada n.
+
+    Con detener=True el barrido de cada método termina cuando el error llega al piso
+    de redondeo o a una meseta (CriterioParada sin confirmación de orden): los n
+    mayores solo añaden costo sin mejorar el error y quedarían dominados.
+
+    Parámetros:
+    -----------
+    valores_n : list
+        Valores de n
+    integ : IntegracionNumerica, opcional
+        Objeto de integración
+    metodos : list
+        Tuplas (metodo, mode)
+    detener : bool
+        Si es True, detiene cada barrido en el piso de precisión
+
+    Retorna:
+    --------
+    dict
+        Columnas metodo, n, evaluaciones, llamadas, tiempos (mediana, ms), errores_absoluto;
+        con detener=True también 'paradas': etiqueta -> CriterioParada.resumen()
+    """
+    if integ is None:
+        integ = IntegracionNumerica()
+    exact = integ.integral_exacta()
+
+    filas = []
+    paradas = {}
+    for metodo, mode in metodos:
+        calculo = _calculo(integ, metodo, mode)
+        criterio = CriterioParada(exact, confirmar_orden=False) if detener else None
+        for n in valores_n:
+            n = int(n)
+            with contar_evaluaciones(integ) as contador:
+                aprox = calculo(n)
+            _, stats = medir_tiempo(lambda: calculo(n), tiempo_objetivo=TIEMPO_MEDICION_S)
+            filas.append((_etiqueta(metodo, mode), n, contador.puntos, contador.llamadas,
+                          stats['mediana_ms'], abs(aprox - exact)))
+            if criterio is not None and criterio.registrar(n, abs(aprox - exact)):
+                break
+        if criterio is not None:
+            paradas[_etiqueta(metodo, mode)] = criterio.resumen(len(valores_n))
+
+    columnas = list(zip(*filas))
+    resultados = {
+        'metodo': np.array(columnas[0]),
+        'n': np.array(columnas[1], dtype=np.int64),
+        'evaluaciones': np.array(columnas[2], dtype=np.int64),
+        'llamadas': np.array(columnas[3], dtype=np.int64),
+        'tiempos': np.array(columnas[4], dtype=np.float64),
+        'errores_absoluto': np.array(columnas[5], dtype=np.float64),
+    }
+    if detener:
+        resultados['paradas'] = paradas
+    return resultados
+
+
+def frontera_costo(resultados, costo='evaluaciones'):
+    """
+    Índices no dominados en (costo, error), ordenados por costo ascendente.
+
+    Parámetros:
+    -----------
+    resultados : dict
+        Salida de medir_costo_precision()
+    costo : str
+        'evaluaciones' o 'tiempos'
+    """
+    if costo not in ('evaluaciones', 'tiempos'):
+        raise ValueError("costo debe ser 'evaluaciones' o 'tiempos'")
+    error = np.maximum(resultados['errores_absoluto'], ERROR_MINIMO)
+    objetivos = np.column_stack([resultados[costo], error])
+    indices = frontera_pareto(objetivos)
+    return indices[np.argsort(resultados[costo][indices], kind='stable')]
+
+
+def exportar_costo_precision(resultados, ruta='../figuras/resultados/costo_precision.csv'):
+    """
+    Exportar la tabla a CSV (metodo, n, evaluaciones, llamadas, tiempo_ms, error_absoluto).
+    """
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write('metodo,n,evaluaciones,llamadas,tiempo_ms,error_absoluto\n')
+        for i in range(len(resultados['n'])):
+            f.write(f"{resultados['metodo'][i]},{resultados['n'][i]},"
+                    f"{resultados['evaluaciones'][i]},{resultados['llamadas'][i]},"
+                    f"{resultados['tiempos'][i]:.6g},{resultados['errores_absoluto'][i]:.6e}\n")
+    return ruta
+
+
+@etapa('draw')
+def graficar_costo_precision(resultados):
+    """
+    Generar gráfica error vs evaluaciones y error vs tiempo, con la frontera.
+    """
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    fig.suptitle('Frontera Costo-Precisión - Métodos de Integración Numérica',
+                 fontsize=14, fontweight='bold')
+
+    error = np.maximum(resultados['errores_absoluto'], ERROR_MINIMO)
+    for ax, costo, xlabel in [(ax1, 'evaluaciones', 'Evaluaciones de E(N)'),
+                              (ax2, 'tiempos', 'Tiempo por llamada (ms, mediana)')]:
+        for etiqueta, color in COLORES_METODOS.items():
+            sel = resultados['metodo'] == etiqueta
+            if not np.any(sel):
+                continue
+            ax.loglog(resultados[costo][sel], error[sel], 'o-', linewidth=2, markersize=6,
+                      color=color, label=etiqueta)
+
+        indices = frontera_costo(resultados, costo)
+        ax.step(resultados[costo][indices], error[indices], where='post',
+                color=COLOR_FRONTERA, linewidth=2.5, linestyle='--', alpha=0.8,
+                label='Frontera (no dominados)')
+
+        ax.set_xlabel(xlabel, fontsize=11, fontweight='bold')
+        ax.set_ylabel('Error absoluto (Wh·B)', fontsize=11, fontweight='bold')
+        ax.grid(True, alpha=0.3, linestyle=':', which='both')
+        ax.legend(fontsize=9)
+
+    ax1.set_title('Error vs Evaluaciones', fontsize=12, fontweight='bold')
+    ax2.set_title('Error vs Tiempo de Pared', fontsize=12, fontweight='bold')
+
+    with etapa('layout'):
+        plt.tight_layout()
+
+    os.makedirs('../figuras/png', exist_ok=True)
+    os.makedirs('../figuras/pdf', exist_ok=True)
+
+    with etapa('savefig-png'):
+        fig.savefig('../figuras/png/costo_precision.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig('../figuras/pdf/costo_precision.pdf', bbox_inches='tight')
+    plt.close()
+
+
+@seccion('costo_precision.ejecutar_costo_precision')
+def ejecutar_costo_precision(exponente_max=6):
+    """
+    Tabla y gráfica de error vs evaluaciones y vs tiempo para todos los métodos.
+    """
+    valores_n = np.unique(np.round(np.logspace(1, exponente_max, 2 * (exponente_max - 1) + 1))
+                          .astype(np.int64))
+
+    print("=" * 70)
+    print("FRONTERA COSTO-PRECISIÓN")
+    print("=" * 70)
+
+    with etapa('compute'):
+        resultados = medir_costo_precision(valores_n, detener=True)
+
+    print(f"\n{'Método':<20} | {'n':>9} | {'Evaluaciones':>12} | {'Llamadas':>8} | "
+          f"{'Tiempo (ms)':>11} | {'Error Abs.':>11}")
+    print("-" * 87)
+    for i in range(len(resultados['n'])):
+        print(f"{resultados['metodo'][i]:<20} | {resultados['n'][i]:>9} | "
+              f"{resultados['evaluaciones'][i]:>12} | {resultados['llamadas'][i]:>8} | "
+              f"{resultados['tiempos'][i]:>11.4f} | {resultados['errores_absoluto'][i]:>11.2e}")
+
+    print("\n" + "-" * 70)
+    print("PARADA ANTICIPADA (piso de precisión)")
+    print("-" * 70)
+    for etiqueta, parada in resultados['paradas'].items():
+        motivo = parada['motivo'] or 'sin parada'
+        meseta = f"{parada['meseta']:.2e}" if parada['meseta'] is not None else '---'
+        print(f"  {etiqueta:<20} orden observado = {parada['orden_observado']:5.2f} | "
+              f"{motivo:<10} en n = {parada['n_final']:>9} | meseta = {meseta} | "
+              f"n omitidos = {parada['omitidos']}")
+
+    for costo, titulo in [('evaluaciones', 'EVALUACIONES'), ('tiempos', 'TIEMPO')]:
+        print("\n" + "-" * 70)
+        print(f"FRONTERA: ERROR vs {titulo}")
+        print("-" * 70)
+        for i in frontera_costo(resultados, costo):
+            print(f"  {resultados['metodo'][i]:<20} n = {resultados['n'][i]:>9} | "
+                  f"{costo} = {resultados[costo][i]:.4g} | error = "
+                  f"{resultados['errores_absoluto'][i]:.2e}")
+
+    ruta = exportar_costo_precision(resultados)
+    rutas_columnares = exportar_columnar(resultados, os.path.splitext(ruta)[0])
+    graficar_costo_precision(resultados)
+
+    print(f"\nArchivo guardado: {ruta}")
+    for ruta_columnar in rutas_columnares.values():
+        print(f"Archivo guardado: {ruta_columnar}")
+    print("Archivo guardado: ../figuras/png/costo_precision.png")
+    print("Archivo guardado: ../figuras/pdf/costo_precision.pdf")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Punto de ejecución principal."""
+    exponente_max = 6
+
+    if len(sys.argv) > 1:
+        try:
+            exponente_max = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    ejecutar_costo_precision(exponente_max)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""
+escalamiento.py
+===============
+Benchmark de escalamiento del throughput (puntos evaluados por segundo).
+
+Barre n (10^2 a 10^9), tamaño de bloque y número de hilos para los núcleos de
+rectángulos (mid), trapecio y Simpson, y compara con los métodos directos de
+IntegracionNumerica. Permite ver dónde domina cada límite:
+- n pequeño: costo fijo de Python por llamada
+- n medio: los arreglos caben en caché
+- n grande: ancho de banda de memoria (y asignación de arreglos O(n) en los directos)
+
+El modo por bloques de IntegracionNumerica (hilos=..., tam_bloque=...) genera la malla
+de cada bloque al vuelo (memoria O(tamaño de bloque), lo que permite n = 10^9), reparte
+los bloques en un grupo de hilos (NumPy libera el GIL en la evaluación y en np.sum) y
+combina las sumas parciales por pares en orden fijo.
+
+Uso:
+    python escalamiento.py [--exp-min 2] [--exp-max 9] [--bloques 4096 65536 1048576]
+                           [--hilos 1 2 4] [--salida archivo.csv]
+"""
+
+import argparse
+import os
+
+import matplotlib.pyplot as plt
+
+from integrales_numericas import IntegracionNumerica
+from medicion import medir_tiempo
+from perfilado import etapa, seccion
+
+# Paleta de colores profesional
+COLOR_PRINCIPAL = '#1F4788'    # Azul oscuro profesional
+COLOR_SECUNDARIO = '#8B3A62'   # Púrpura profesional
+COLOR_ACENTO = '#5C946E'       # Verde profesional
+COLORES_HILOS = ['#1976D2', '#388E3C', '#F57C00', '#6A1B9A', '#C62828', '#00838F']
+
+METODOS = ['rectangulos', 'trapecio', 'simpson']
+
+# Tamaños de bloque por defecto (puntos por bloque)
+TAMANOS_BLOQUE = [2**12, 2**16, 2**20]
+
+# Bloque destacado en la fila superior de la figura
+BLOQUE_REFERENCIA = 2**16
+
+# Los métodos directos reservan arreglos O(n) (y rectangulos usa una lista de Python):
+# por encima de este n solo se mide el núcleo por bloques
+N_MAX_DIRECTO = 10**7
+
+# Presupuesto de medición por configuración (segundos)
+TIEMPO_OBJETIVO = 0.2
+
+
+def hilos_por_defecto():
+    """Potencias de 2 hasta el número de CPUs (incluido)."""
+    cpus = os.cpu_count() or 1
+    hilos = [1]
+    while hilos[-1] * 2 <= cpus:
+        hilos.append(hilos[-1] * 2)
+    if hilos[-1] != cpus:
+        hilos.append(cpus)
+    return hilos
+
+
+def puntos_metodo(metodo, n):
+    """Puntos evaluados por cada método con n subintervalos."""
+    if metodo == 'rectangulos':
+        return n
+    if metodo == 'simpson':
+        return n + n % 2 + 1
+    return n + 1
+
+
+def integrar_por_bloques(integ, metodo, n, tam_bloque, hilos=1):
+    """
+    Integrar con el modo por bloques de IntegracionNumerica (rectangulos usa 'mid').
+
+    El resultado es el mismo para cualquier número de hilos (reducción determinista).
+    """
+    if metodo not in METODOS:
+        raise ValueError("Metodo debe ser 'rectangulos', 'trapecio' o 'simpson'")
+    if metodo == 'rectangulos':
+        return integ.rectangulos(n, 'mid', hilos=hilos, tam_bloque=tam_bloque)
+    return getattr(integ, metodo)(n, hilos=hilos, tam_bloque=tam_bloque)
+
+
+def _bloques_utiles(tamanos_bloque, puntos):
+    """
+    Bloques menores que el número de puntos más el menor que los cubre en un solo
+    bloque; los mayores darían la misma ejecución.
+    """
+    tamanos_bloque = sorted(tamanos_bloque)
+    utiles = [b for b in tamanos_bloque if b < puntos]
+    cubren = [b for b in tamanos_bloque if b >= puntos]
+    return utiles + cubren[:1]
+
+
+def _medir(funcion, n):
+    """Mediana en segundos; para n grandes basta una repetición."""
+    _, stats = medir_tiempo(funcion, calentamiento=1, tiempo_objetivo=TIEMPO_OBJETIVO,
+                            min_repeticiones=3 if n < 10**7 else 1)
+    return stats['mediana_ms'] / 1e3
+
+
+def ejecutar_barrido(valores_n, tamanos_bloque=TAMANOS_BLOQUE, hilos=None, integ=None):
+    """
+    Medir throughput de la matriz método x n x bloque x hilos.
+
+    Retorna:
+    --------
+    list
+        Diccionarios con metodo, n, tam_bloque (0 = método directo), hilos,
+        puntos, tiempo_s, puntos_s
+    """
+    if integ is None:
+        integ = IntegracionNumerica()
+    if hilos is None:
+        hilos = hilos_por_defecto()
+
+    filas = []
+
+    def registrar(metodo, n, tam_bloque, num_hilos, tiempo):
+        puntos = puntos_metodo(metodo, n)
+        filas.append({'metodo': metodo, 'n': n, 'tam_bloque': tam_bloque, 'hilos': num_hilos,
+                      'puntos': puntos, 'tiempo_s': tiempo, 'puntos_s': puntos / tiempo})
+        print(f"{metodo:<12} | {n:>11} | {tam_bloque or 'directo':>9} | {num_hilos:>5} | "
+              f"{tiempo * 1000:>11.3f} | {puntos / tiempo:>12.3e}")
+
+    print(f"{'Método':<12} | {'n':>11} | {'Bloque':>9} | {'Hilos':>5} | "
+          f"{'Tiempo (ms)':>11} | {'Puntos/s':>12}")
+    print("-" * 75)
+    for metodo in METODOS:
+        directo = (lambda n: integ.rectangulos(n, 'mid')) if metodo == 'rectangulos' \
+            else getattr(integ, metodo)
+        for n in valores_n:
+            if n <= N_MAX_DIRECTO:
+                registrar(metodo, n, 0, 1, _medir(lambda: directo(n), n))
+            for num_hilos in hilos:
+                for tam_bloque in _bloques_utiles(tamanos_bloque, puntos_metodo(metodo, n)):
+                    tiempo = _medir(lambda: integrar_por_bloques(
+                        integ, metodo, n, tam_bloque, num_hilos), n)
+                    registrar(metodo, n, tam_bloque, num_hilos, tiempo)
+    return filas
+
+
+def exportar_csv(filas, ruta):
+    """
+    Exportar el barrido a CSV.
+    """
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    campos = ['metodo', 'n', 'tam_bloque', 'hilos', 'puntos', 'tiempo_s', 'puntos_s']
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(','.join(campos) + '\n')
+        for fila in filas:
+            f.write(','.join(f"{fila[c]:.6g}" if isinstance(fila[c], float) else str(fila[c])
+                             for c in campos) + '\n')
+    return ruta
+
+
+@etapa('draw')
+def graficar_escalamiento(filas, bloque_referencia=BLOQUE_REFERENCIA):
+    """
+    Fila superior: puntos/s vs n (directo y por bloques <= bloque_referencia, una curva
+    por número de hilos).
+    Fila inferior: puntos/s vs tamaño de bloque en el mayor n, una curva por hilos.
+    """
+    fig, axes = plt.subplots(2, len(METODOS), figsize=(20, 11))
+    fig.suptitle('Escalamiento del Throughput - Núcleos de Integración',
+                 fontsize=14, fontweight='bold')
+
+    hilos = sorted({f['hilos'] for f in filas if f['tam_bloque']})
+    bloques = sorted({f['tam_bloque'] for f in filas if f['tam_bloque']})
+    if bloque_referencia not in bloques and bloques:
+        bloque_referencia = bloques[len(bloques) // 2]
+
+    for j, metodo in enumerate(METODOS):
+        ax1, ax2 = axes[0, j], axes[1, j]
+        del_metodo = [f for f in filas if f['metodo'] == metodo]
+
+        directo = sorted((f['n'], f['puntos_s']) for f in del_metodo if f['tam_bloque'] == 0)
+        if directo:
+            n_d, t_d = zip(*directo)
+            ax1.loglog(n_d, t_d, 's-', linewidth=2, markersize=7, color=COLOR_SECUNDARIO,
+                       label='IntegracionNumerica (directo)')
+
+        for k, num_hilos in enumerate(hilos):
+            color = COLORES_HILOS[k % len(COLORES_HILOS)]
+            # Para cada n, el mayor bloque medido <= referencia (con n pequeño, un solo bloque)
+            mejores = {}
+            for f in del_metodo:
+                if f['hilos'] == num_hilos and 0 < f['tam_bloque'] <= bloque_referencia:
+                    if f['tam_bloque'] >= mejores.get(f['n'], (0, 0))[0]:
+                        mejores[f['n']] = (f['tam_bloque'], f['puntos_s'])
+            serie = sorted((n, t) for n, (_, t) in mejores.items())
+            if serie:
+                n_s, t_s = zip(*serie)
+                ax1.loglog(n_s, t_s, 'o-', linewidth=2, markersize=7, color=color,
+                           label=f'Bloques <= {bloque_referencia} - {num_hilos} hilo(s)')
+
+            n_max = max(f['n'] for f in del_metodo)
+            serie = sorted((f['tam_bloque'], f['puntos_s']) for f in del_metodo
+                           if f['n'] == n_max and f['tam_bloque'] and f['hilos'] == num_hilos)
+            if serie:
+                b_s, t_s = zip(*serie)
+                ax2.loglog(b_s, t_s, 'o-', linewidth=2, markersize=7, color=color,
+                           label=f'{num_hilos} hilo(s)')
+
+        titulo = 'Rectángulos (mid)' if metodo == 'rectangulos' else metodo.capitalize()
+        ax1.set_title(f'{titulo} - Throughput vs n', fontsize=12, fontweight='bold')
+        ax1.set_xlabel('Número de intervalos (n)', fontsize=11, fontweight='bold')
+        ax2.set_title(f'{titulo} - Throughput vs bloque (n = {n_max:.0e})',
+                      fontsize=12, fontweight='bold')
+        ax2.set_xlabel('Tamaño de bloque (puntos)', fontsize=11, fontweight='bold')
+        for ax in (ax1, ax2):
+            ax.set_ylabel('Puntos evaluados por segundo', fontsize=11, fontweight='bold')
+            ax.grid(True, alpha=0.3, linestyle=':', which='both')
+            ax.legend(fontsize=9)
+
+    with etapa('layout'):
+        plt.tight_layout()
+
+    os.makedirs('../figuras/png', exist_ok=True)
+    os.makedirs('../figuras/pdf', exist_ok=True)
+
+    with etapa('savefig-png'):
+        fig.savefig('../figuras/png/escalamiento_throughput.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig('../figuras/pdf/escalamiento_throughput.pdf', bbox_inches='tight')
+    plt.close()
+
+
+@seccion('escalamiento.ejecutar_escalamiento')
+def ejecutar_escalamiento(exp_min=2, exp_max=9, tamanos_bloque=TAMANOS_BLOQUE, hilos=None,
+                          salida='../figuras/resultados/escalamiento_throughput.csv'):
+    """
+    Ejecutar el barrido, exportar CSV y generar la figura log-log.
+    """
+    if exp_min > exp_max:
+        raise ValueError("exp_min no puede ser mayor que exp_max")
+    valores_n = [10**k for k in range(exp_min, exp_max + 1)]
+
+    print("=" * 75)
+    print("ESCALAMIENTO DEL THROUGHPUT - PUNTOS EVALUADOS POR SEGUNDO")
+    print("=" * 75)
+    print(f"\nn: 10^{exp_min} .. 10^{exp_max} | bloques: {list(tamanos_bloque)} | "
+          f"hilos: {hilos or hilos_por_defecto()} | CPUs: {os.cpu_count()}\n")
+
+    with etapa('compute'):
+        filas = ejecutar_barrido(valores_n, tamanos_bloque, hilos)
+
+    ruta = exportar_csv(filas, salida)
+    graficar_escalamiento(filas)
+
+    print(f"\nArchivo guardado: {ruta}")
+    print("Archivo guardado: ../figuras/png/escalamiento_throughput.png")
+    print("Archivo guardado: ../figuras/pdf/escalamiento_throughput.pdf")
+    print("\n" + "=" * 75)
+    return filas
+
+
+def main():
+    """Punto de ejecución principal."""
+    parser = argparse.ArgumentParser(description="Benchmark de escalamiento del throughput")
+    parser.add_argument('--exp-min', type=int, default=2, help="n mínimo = 10^exp_min")
+    parser.add_argument('--exp-max', type=int, default=9, help="n máximo = 10^exp_max")
+    parser.add_argument('--bloques', type=int, nargs='+', default=TAMANOS_BLOQUE)
+    parser.add_argument('--hilos', type=int, nargs='+', default=None)
+    parser.add_argument('--salida', default='../figuras/resultados/escalamiento_throughput.csv')
+    args = parser.parse_args()
+
+    ejecutar_escalamiento(args.exp_min, args.exp_max, args.bloques, args.hilos, args.salida)
+
+
+if __name__ == '__main__':
+    main()
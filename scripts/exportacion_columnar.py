@@ -0,0 +1,307 @@
+"""
+exportacion_columnar.py
+=======================
+Exportación de reportes, barridos de convergencia y tablas a formatos columnares.
+
+Formatos:
+- npz:     siempre disponible (np.savez, sin compresión ni pickle)
+- parquet: si pyarrow está instalado
+- arrow:   archivo IPC de Arrow (Feather v2), si pyarrow está instalado
+
+Cada columna se escribe desde el arreglo de NumPy existente: np.savez recorre la vista
+sin copiarla y pyarrow envuelve los búferes contiguos sin copia (las columnas de un
+AlmacenResultados, vistas con paso del arreglo estructurado, se compactan una vez).
+Los valores no columnares (método, orden, intervalo, resumen de parada, ...) se guardan
+como JSON: clave '__metadatos__' en npz y metadatos del esquema en Parquet/Arrow.
+
+cargar_columnar() lee cualquiera de los tres formatos y retorna (columnas, metadatos);
+el archivo Arrow se abre con memory map y sus columnas numéricas no se copian.
+
+Uso:
+    from exportacion_columnar import exportar_columnar, cargar_columnar
+    exportar_columnar(integ.generar_reporte('simpson', valores_n),
+                      '../figuras/resultados/reporte_simpson')
+    columnas, metadatos = cargar_columnar('../figuras/resultados/reporte_simpson.npz')
+
+    python exportacion_columnar.py [exponente_max_n]
+"""
+
+import json
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from almacen_resultados import AlmacenResultados
+from integrales_numericas import IntegracionNumerica
+from rectangulos import MODELOS_AI
+
+FORMATOS = ('npz', 'parquet', 'arrow')
+
+EXTENSIONES = {'npz': '.npz', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+DIRECTORIO_RESULTADOS = '../figuras/resultados'
+
+# Clave del npz (y del esquema Arrow) con los metadatos en JSON
+CLAVE_METADATOS = '__metadatos__'
+
+# (método, modo) de los reportes exportados; el archivo es reporte_<metodo>[_<modo>]
+REPORTES = [('trapecio', 'mid'), ('simpson', 'mid'),
+            ('rectangulos', 'left'), ('rectangulos', 'mid'), ('rectangulos', 'right')]
+
+
+def _pyarrow():
+    """Módulos pyarrow (pyarrow, parquet, ipc) o None si no está instalado."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def disponibles():
+    """Formatos que se pueden escribir con los paquetes instalados."""
+    return list(FORMATOS) if _pyarrow() is not None else ['npz']
+
+
+def _json_numpy(valor):
+    """Convertir escalares y arreglos de NumPy para json.dumps."""
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    raise TypeError(f"{type(valor).__name__} no es serializable a JSON")
+
+
+def separar_columnas(datos):
+    """
+    Separar un resultado en columnas (arreglos 1D de igual longitud) y metadatos.
+
+    Parámetros:
+    -----------
+    datos : AlmacenResultados o dict
+        Almacén de un barrido, reporte de generar_reporte() (columnas en 'datos') o
+        dict de columnas como el de costo_precision.medir_costo_precision()
+
+    Retorna:
+    --------
+    tuple
+        (columnas, metadatos): dict nombre -> np.ndarray y dict serializable a JSON
+    """
+    if isinstance(datos, AlmacenResultados):
+        return {nombre: datos[nombre] for nombre in datos}, dict(datos.metadatos)
+    if not isinstance(datos, dict):
+        raise ValueError("datos debe ser un AlmacenResultados o un dict")
+
+    if isinstance(datos.get('datos'), (AlmacenResultados, dict)):
+        columnas, metadatos = separar_columnas(datos['datos'])
+        metadatos.update((k, v) for k, v in datos.items() if k != 'datos')
+        return columnas, metadatos
+
+    columnas, metadatos = {}, {}
+    for nombre, valor in datos.items():
+        arreglo = np.asarray(valor) if isinstance(valor, (list, np.ndarray)) else None
+        if arreglo is not None and arreglo.ndim == 1 and arreglo.dtype != object:
+            columnas[nombre] = arreglo
+        else:
+            metadatos[nombre] = valor
+    if len({len(c) for c in columnas.values()}) > 1:
+        raise ValueError("Todas las columnas deben tener la misma longitud")
+    return columnas, metadatos
+
+
+def _tabla_arrow(pa, columnas, metadatos):
+    """Tabla de pyarrow sobre los búferes de las columnas (copia solo si no son contiguas)."""
+    arreglos = [pa.array(np.ascontiguousarray(c)) for c in columnas.values()]
+    esquema_meta = {CLAVE_METADATOS: json.dumps(metadatos, default=_json_numpy)}
+    return pa.Table.from_arrays(arreglos, names=list(columnas), metadata=esquema_meta)
+
+
+def exportar_columnar(datos, ruta_base, formatos=None, metadatos=None):
+    """
+    Exportar un resultado a uno o varios formatos columnares.
+
+    Parámetros:
+    -----------
+    datos : AlmacenResultados o dict
+        Ver separar_columnas()
+    ruta_base : str
+        Ruta sin extensión; cada formato añade la suya
+    formatos : list, opcional
+        Subconjunto de FORMATOS (default: todos los disponibles). Si se pide parquet o
+        arrow sin pyarrow instalado, se avisa y solo se escribe npz
+    metadatos : dict, opcional
+        Metadatos adicionales (se combinan con los del resultado)
+
+    Retorna:
+    --------
+    dict
+        formato -> ruta escrita
+    """
+    if formatos is None:
+        formatos = disponibles()
+    desconocidos = set(formatos) - set(FORMATOS)
+    if desconocidos:
+        raise ValueError(f"formatos debe contener solo: {', '.join(FORMATOS)}")
+
+    columnas, meta = separar_columnas(datos)
+    if metadatos:
+        meta.update(metadatos)
+    os.makedirs(os.path.dirname(ruta_base) or '.', exist_ok=True)
+
+    pa = _pyarrow()
+    if pa is None and set(formatos) - {'npz'}:
+        warnings.warn("pyarrow no está instalado; se exporta solo a npz",
+                      RuntimeWarning, stacklevel=2)
+        formatos = ['npz']
+
+    rutas = {}
+    for formato in formatos:
+        ruta = ruta_base + EXTENSIONES[formato]
+        if formato == 'npz':
+            np.savez(ruta, **columnas,
+                     **{CLAVE_METADATOS: np.array(json.dumps(meta, default=_json_numpy))})
+        elif formato == 'parquet':
+            pa.parquet.write_table(_tabla_arrow(pa, columnas, meta), ruta)
+        else:
+            tabla = _tabla_arrow(pa, columnas, meta)
+            with pa.OSFile(ruta, 'wb') as destino:
+                with pa.ipc.new_file(destino, tabla.schema) as escritor:
+                    escritor.write_table(tabla)
+        rutas[formato] = ruta
+    return rutas
+
+
+def cargar_columnar(ruta):
+    """
+    Cargar un archivo escrito por exportar_columnar().
+
+    El formato se deduce de la extensión. Arrow se abre con memory map y las columnas
+    numéricas sin nulos se retornan como vistas de NumPy sobre el mapa (sin copia).
+
+    Retorna:
+    --------
+    tuple
+        (columnas, metadatos): dict nombre -> np.ndarray y dict
+    """
+    extension = os.path.splitext(ruta)[1]
+    if extension == EXTENSIONES['npz']:
+        with np.load(ruta, allow_pickle=False) as archivo:
+            columnas = {k: archivo[k] for k in archivo.files if k != CLAVE_METADATOS}
+            meta = (json.loads(archivo[CLAVE_METADATOS].item())
+                    if CLAVE_METADATOS in archivo.files else {})
+        return columnas, meta
+
+    if extension not in (EXTENSIONES['parquet'], EXTENSIONES['arrow']):
+        raise ValueError(f"Extensión no reconocida: {extension!r}")
+    pa = _pyarrow()
+    if pa is None:
+        raise ValueError(f"Leer {extension} requiere pyarrow")
+    if extension == EXTENSIONES['parquet']:
+        tabla = pa.parquet.read_table(ruta)
+    else:
+        tabla = pa.ipc.open_file(pa.memory_map(ruta, 'r')).read_all()
+    columnas = {nombre: tabla.column(nombre).to_numpy() for nombre in tabla.column_names}
+    meta_esquema = tabla.schema.metadata or {}
+    clave = CLAVE_METADATOS.encode()
+    meta = json.loads(meta_esquema[clave]) if clave in meta_esquema else {}
+    return columnas, meta
+
+
+def tabla_modelos(integ=None):
+    """
+    Tabla de MODELOS_AI: parámetros, energía medida, E(N) del polinomio y error relativo.
+    """
+    if integ is None:
+        integ = IntegracionNumerica()
+    parametros = np.array([m['parametros'] for m in MODELOS_AI], dtype=np.float64)
+    energia_exp = np.array([m['energia_exp'] for m in MODELOS_AI], dtype=np.float64)
+    energia_modelo = integ.funcion_energia(parametros)
+    return {
+        'nombre': np.array([m['nombre'] for m in MODELOS_AI]),
+        'parametros': parametros,
+        'energia_exp': energia_exp,
+        'energia_modelo': energia_modelo,
+        'error_relativo': np.abs(energia_modelo - energia_exp) / energia_exp * 100,
+    }
+
+
+def nombre_reporte(metodo, mode='mid'):
+    """Nombre base (sin extensión) del archivo de un reporte exportado."""
+    return f"reporte_{metodo}" + (f"_{mode}" if metodo == 'rectangulos' else '')
+
+
+def exportar_reportes(exponente_max=5, directorio=DIRECTORIO_RESULTADOS, formatos=None):
+    """
+    Calcular y exportar los reportes de REPORTES (n de 10 a 10^exponente_max, media
+    década entre valores) y la tabla de modelos.
+
+    Retorna:
+    --------
+    list
+        Un dict formato -> ruta por archivo exportado
+    """
+    integ = IntegracionNumerica()
+    valores_n = np.unique(np.round(np.logspace(1, exponente_max, 2 * (exponente_max - 1) + 1))
+                          .astype(np.int64))
+    escritos = []
+    for metodo, mode in REPORTES:
+        reporte = integ.generar_reporte(metodo, valores_n, mode=mode)
+        escritos.append(exportar_columnar(reporte, os.path.join(directorio,
+                                                                nombre_reporte(metodo, mode)),
+                                          formatos))
+    escritos.append(exportar_columnar(tabla_modelos(integ),
+                                      os.path.join(directorio, 'modelos_ai'), formatos))
+    return escritos
+
+
+def ejecutar_exportacion(exponente_max=5, directorio=DIRECTORIO_RESULTADOS):
+    """
+    Exportar los reportes de convergencia de todos los métodos y la tabla de modelos,
+    y comparar el tiempo de recalcular frente a cargar los resultados guardados.
+    """
+    print("=" * 70)
+    print("EXPORTACIÓN COLUMNAR DE RESULTADOS")
+    print("=" * 70)
+    print(f"\nFormatos disponibles: {', '.join(disponibles())}")
+
+    t0 = time.perf_counter()
+    escritos = exportar_reportes(exponente_max, directorio)
+    t_calculo = time.perf_counter() - t0
+
+    print(f"\n{'Archivo':<52} | {'KiB':>8} | {'Carga (ms)':>10}")
+    print("-" * 78)
+    t_carga = 0.0
+    for rutas in escritos:
+        for ruta in rutas.values():
+            t0 = time.perf_counter()
+            cargar_columnar(ruta)
+            t = time.perf_counter() - t0
+            t_carga += t
+            print(f"{ruta:<52} | {os.path.getsize(ruta) / 1024:>8.1f} | {t * 1000:>10.3f}")
+
+    print(f"\nCalcular y exportar:       {t_calculo * 1000:.1f} ms")
+    print(f"Cargar todos los archivos: {t_carga * 1000:.1f} ms")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Punto de ejecución principal."""
+    exponente_max = 5
+
+    if len(sys.argv) > 1:
+        try:
+            exponente_max = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    ejecutar_exportacion(exponente_max)
+
+
+if __name__ == '__main__':
+    main()
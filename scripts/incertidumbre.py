@@ -0,0 +1,215 @@
+"""
+incertidumbre.py
+================
+Propagación de incertidumbre Monte Carlo sobre los coeficientes de E(N).
+
+Los coeficientes de E(N) provienen de un ajuste y tienen incertidumbre. Como la integral
+es lineal en los coeficientes,
+
+    Z(c) = ∫[a,b] sum_k c_k N^k dN = c · w,   w_k = (b^(k+1) - a^(k+1)) / (k+1)
+
+el valor de Z para M vectores de coeficientes muestreados es un único producto
+matriz-vector C @ w, sin evaluar la función en ninguna malla.
+
+Uso:
+    python incertidumbre.py [número_de_muestras]
+"""
+
+import sys
+import time
+
+import numpy as np
+from scipy import stats
+from scipy.stats import qmc
+
+from integrales_numericas import IntegracionNumerica
+
+
+def vector_integracion(a, b, grado):
+    """
+    Pesos w tales que ∫[a,b] p(N) dN = c · w para un polinomio de coeficientes c.
+
+    Parámetros:
+    -----------
+    a : float
+        Límite inferior
+    b : float
+        Límite superior
+    grado : int
+        Grado del polinomio
+
+    Retorna:
+    --------
+    array
+        Vector w de longitud grado+1, en orden descendente de grado (como np.polyval)
+    """
+    potencias = np.arange(grado + 1, 0, -1, dtype=np.float64)
+    return (b**potencias - a**potencias) / potencias
+
+
+def covarianza_relativa(coeficientes, desviacion_relativa=0.01):
+    """
+    Covarianza diagonal con desviación estándar proporcional a cada coeficiente.
+
+    Se usa cuando no se dispone de la matriz de covarianza del ajuste.
+
+    Parámetros:
+    -----------
+    coeficientes : array
+        Coeficientes nominales
+    desviacion_relativa : float
+        Desviación estándar relativa de cada coeficiente (default: 1%)
+
+    Retorna:
+    --------
+    array
+        Matriz de covarianza (k x k)
+    """
+    sigma = np.abs(np.asarray(coeficientes, dtype=np.float64)) * desviacion_relativa
+    return np.diag(sigma**2)
+
+
+def muestrear_coeficientes(media, covarianza, num_muestras, metodo='gauss', semilla=None):
+    """
+    Muestrear vectores de coeficientes ~ Normal(media, covarianza).
+
+    Parámetros:
+    -----------
+    media : array
+        Coeficientes nominales (k,)
+    covarianza : array
+        Matriz de covarianza (k x k), simétrica semidefinida positiva
+    num_muestras : int
+        Número de vectores a generar
+    metodo : str
+        'gauss' (pseudoaleatorio) o 'sobol' (cuasi-aleatorio, transformado con la
+        inversa de la normal; rinde mejor con potencias de 2)
+    semilla : int, opcional
+        Semilla para reproducibilidad
+
+    Retorna:
+    --------
+    array
+        Matriz de coeficientes (num_muestras x k)
+    """
+    media = np.asarray(media, dtype=np.float64)
+    k = media.size
+
+    # Cholesky con jitter por si la covarianza es singular (p. ej. coeficientes fijos)
+    jitter = 1e-15 * max(np.trace(covarianza), 1.0)
+    L = np.linalg.cholesky(np.asarray(covarianza, dtype=np.float64) + jitter * np.eye(k))
+
+    if metodo == 'gauss':
+        rng = np.random.default_rng(semilla)
+        Z = rng.standard_normal((num_muestras, k))
+    elif metodo == 'sobol':
+        sobol = qmc.Sobol(d=k, scramble=True, seed=semilla)
+        m = int(np.ceil(np.log2(max(num_muestras, 2))))
+        U = sobol.random_base2(m)[:num_muestras]
+        Z = stats.norm.ppf(U)
+    else:
+        raise ValueError("metodo debe ser 'gauss' o 'sobol'")
+
+    # C = media + Z @ L^T, escrito in-place para no duplicar la matriz (M x k)
+    C = Z @ L.T
+    C += media
+    return C
+
+
+def propagar_incertidumbre(a=1.1, b=8.0, coeficientes=None, covarianza=None,
+                           num_muestras=1_000_000, nivel=0.95, metodo='gauss', semilla=None):
+    """
+    Propagar la incertidumbre de los coeficientes a la integral Z = ∫[a,b] E(N) dN.
+
+    Parámetros:
+    -----------
+    a, b : float
+        Límites de integración
+    coeficientes : array, opcional
+        Coeficientes nominales (default: IntegracionNumerica.COEFICIENTES_ENERGIA)
+    covarianza : array, opcional
+        Covarianza de los coeficientes (default: diagonal con 1% relativo)
+    num_muestras : int
+        Número de muestras Monte Carlo
+    nivel : float
+        Nivel de confianza del intervalo (default: 0.95)
+    metodo : str
+        'gauss' o 'sobol'
+    semilla : int, opcional
+        Semilla para reproducibilidad
+
+    Retorna:
+    --------
+    dict
+        integral_nominal, media, desviacion, desviacion_analitica,
+        intervalo (inferior, superior), nivel, num_muestras, metodo, tiempo_s
+    """
+    if coeficientes is None:
+        coeficientes = IntegracionNumerica.COEFICIENTES_ENERGIA
+    coeficientes = np.asarray(coeficientes, dtype=np.float64)
+    if covarianza is None:
+        covarianza = covarianza_relativa(coeficientes)
+    covarianza = np.asarray(covarianza, dtype=np.float64)
+
+    w = vector_integracion(a, b, coeficientes.size - 1)
+
+    inicio = time.perf_counter()
+    C = muestrear_coeficientes(coeficientes, covarianza, num_muestras, metodo, semilla)
+    Z = C @ w
+    alfa = (1 - nivel) / 2
+    inferior, superior = np.quantile(Z, [alfa, 1 - alfa])
+    tiempo = time.perf_counter() - inicio
+
+    return {
+        'integral_nominal': float(coeficientes @ w),
+        'media': float(Z.mean()),
+        'desviacion': float(Z.std(ddof=1)),
+        # Por linealidad, Var[Z] = w^T Σ w exactamente
+        'desviacion_analitica': float(np.sqrt(w @ covarianza @ w)),
+        'intervalo': (float(inferior), float(superior)),
+        'nivel': nivel,
+        'num_muestras': num_muestras,
+        'metodo': metodo,
+        'tiempo_s': tiempo
+    }
+
+
+def ejecutar_incertidumbre(num_muestras=1_000_000):
+    """
+    Mostrar la integral con barras de error para ambos métodos de muestreo.
+    """
+    print("=" * 70)
+    print("PROPAGACIÓN DE INCERTIDUMBRE - MONTE CARLO")
+    print("=" * 70)
+    print("\nSupuesto: desviación estándar del 1% en cada coeficiente de E(N)")
+    print(f"Muestras: {num_muestras:,}")
+
+    print(f"\n{'Método':>8} | {'Z nominal':>12} | {'Media':>12} | {'Desv.':>10} | "
+          f"{'IC 95%':>25} | {'Tiempo (ms)':>11}")
+    print("-" * 95)
+    for metodo in ['gauss', 'sobol']:
+        r = propagar_incertidumbre(num_muestras=num_muestras, metodo=metodo, semilla=0)
+        ic = f"[{r['intervalo'][0]:.4f}, {r['intervalo'][1]:.4f}]"
+        print(f"{metodo:>8} | {r['integral_nominal']:>12.6f} | {r['media']:>12.6f} | "
+              f"{r['desviacion']:>10.6f} | {ic:>25} | {r['tiempo_s']*1000:>11.1f}")
+
+    print(f"\nDesviación analítica (w^T Σ w): {r['desviacion_analitica']:.6f} Wh·B")
+    print("=" * 70)
+
+
+def main():
+    """Punto de ejecución principal."""
+    num_muestras = 1_000_000
+
+    if len(sys.argv) > 1:
+        try:
+            num_muestras = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    ejecutar_incertidumbre(num_muestras)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+indice_integral.py
+==================
+Índice de integrales acumuladas para consultas de energía en subrangos arbitrarios.
+
+Una consulta ∫[a_i, b_i] E(N) dN se responde como P(b_i) - P(a_i), donde P es una
+integral acumulada precalculada:
+- Polinomios: P es la antiderivada exacta (np.polyint)
+- Funciones no polinomiales: tabla de prefijos en malla fina (Simpson por celda)
+  con interpolación de Hermite cúbica usando P' = f
+- Datos muestreados: tabla de prefijos del interpolante lineal (trapecio exacto)
+
+Cada consulta cuesta O(1) en mallas uniformes (índice aritmético) y O(log m) en
+mallas no uniformes (np.searchsorted); los lotes se resuelven sin bucles de Python.
+
+Uso:
+    python indice_integral.py
+"""
+
+import time
+
+import numpy as np
+
+from integrales_numericas import IntegracionNumerica
+from rectangulos import MODELOS_AI
+
+
+class IndiceIntegral:
+    """
+    Integral acumulada precalculada P(x) = ∫[x0, x] f para consultas por lotes.
+
+    Usar los constructores desde_polinomio(), desde_funcion() o desde_muestras().
+    """
+
+    def __init__(self, tipo, coeficientes=None, nodos=None, prefijos=None, valores=None):
+        """
+        Inicializar el índice (uso interno: preferir los constructores de clase).
+
+        Parámetros:
+        -----------
+        tipo : str
+            'polinomio', 'hermite' o 'lineal'
+        coeficientes : array, opcional
+            Coeficientes de la antiderivada (tipo 'polinomio')
+        nodos : array, opcional
+            Malla de la tabla (tipos 'hermite' y 'lineal')
+        prefijos : array, opcional
+            P(nodos)
+        valores : array, opcional
+            f(nodos)
+        """
+        self.tipo = tipo
+        self.coeficientes = coeficientes
+        self.nodos = nodos
+        self.prefijos = prefijos
+        self.valores = valores
+        self._uniforme = False
+
+        if nodos is not None:
+            if len(nodos) < 2 or np.any(np.diff(nodos) <= 0):
+                raise ValueError("nodos debe ser estrictamente creciente con al menos 2 puntos")
+            pasos = np.diff(nodos)
+            self._h = pasos.mean()
+            self._uniforme = np.allclose(pasos, self._h, rtol=1e-9, atol=0.0)
+
+    @classmethod
+    def desde_polinomio(cls, coeficientes=None):
+        """
+        Índice exacto para un polinomio (default: E(N) del proyecto).
+        """
+        if coeficientes is None:
+            coeficientes = IntegracionNumerica.COEFICIENTES_ENERGIA
+        return cls('polinomio', coeficientes=np.polyint(np.asarray(coeficientes, dtype=np.float64)))
+
+    @classmethod
+    def desde_funcion(cls, f, a, b, num_celdas=65536):
+        """
+        Tabla de prefijos para una función vectorizada arbitraria en [a, b].
+
+        Cada celda se integra con Simpson (nodos + puntos medios, error O(h^4)) y las
+        consultas se interpolan con Hermite cúbica usando P y P' = f en los nodos.
+
+        Parámetros:
+        -----------
+        f : callable
+            Integrando vectorizado
+        a, b : float
+            Dominio del índice
+        num_celdas : int
+            Número de celdas de la malla uniforme
+        """
+        x = np.linspace(a, b, 2 * num_celdas + 1)
+        y = f(x)
+        nodos, medios = x[::2], y[1::2]
+        valores = y[::2]
+
+        h = (b - a) / num_celdas
+        celdas = (h / 6) * (valores[:-1] + 4 * medios + valores[1:])
+        prefijos = np.concatenate([[0.0], np.cumsum(celdas)])
+        return cls('hermite', nodos=nodos, prefijos=prefijos, valores=valores)
+
+    @classmethod
+    def desde_muestras(cls, x, y):
+        """
+        Tabla de prefijos para datos muestreados (x creciente, y = f(x)).
+
+        El integrando se trata como lineal a trozos, por lo que la tabla es la regla
+        del trapecio acumulada y las consultas intermedias son exactas para ese modelo.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if x.shape != y.shape:
+            raise ValueError("x e y deben tener la misma longitud")
+        celdas = 0.5 * np.diff(x) * (y[:-1] + y[1:])
+        prefijos = np.concatenate([[0.0], np.cumsum(celdas)])
+        return cls('lineal', nodos=x, prefijos=prefijos, valores=y)
+
+    @property
+    def dominio(self):
+        """Intervalo donde el índice es válido ((-inf, inf) para polinomios)."""
+        if self.tipo == 'polinomio':
+            return (-np.inf, np.inf)
+        return (self.nodos[0], self.nodos[-1])
+
+    def _celda(self, x):
+        """Índice de celda de cada x: aritmético en mallas uniformes, binario si no."""
+        if self._uniforme:
+            i = np.floor((x - self.nodos[0]) / self._h).astype(np.intp)
+        else:
+            i = np.searchsorted(self.nodos, x, side='right') - 1
+        return np.clip(i, 0, len(self.nodos) - 2)
+
+    def acumulada(self, x):
+        """
+        P(x) = ∫[x0, x] f, vectorizada.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if self.tipo == 'polinomio':
+            return np.polyval(self.coeficientes, x)
+
+        inf, sup = self.dominio
+        if np.any((x < inf) | (x > sup)):
+            raise ValueError(f"Consultas fuera del dominio del índice [{inf}, {sup}]")
+
+        i = self._celda(x)
+        x0 = self.nodos[i]
+        h = self.nodos[i + 1] - x0
+        t = (x - x0) / h
+        P0, P1 = self.prefijos[i], self.prefijos[i + 1]
+        f0, f1 = self.valores[i], self.valores[i + 1]
+
+        if self.tipo == 'lineal':
+            # Integral exacta del interpolante lineal desde x0 hasta x
+            return P0 + h * t * (f0 + 0.5 * t * (f1 - f0))
+
+        # Hermite cúbica de P con derivadas P' = f
+        t2 = t * t
+        t3 = t2 * t
+        return ((2 * t3 - 3 * t2 + 1) * P0 + (t3 - 2 * t2 + t) * h * f0 +
+                (-2 * t3 + 3 * t2) * P1 + (t3 - t2) * h * f1)
+
+    def integrar(self, a, b):
+        """
+        ∫[a_i, b_i] f para lotes de consultas (escalares o arrays con broadcasting).
+        """
+        return self.acumulada(b) - self.acumulada(a)
+
+
+def ejecutar_indice(num_consultas=1_000_000):
+    """
+    Mostrar energía entre modelos consecutivos y medir el rendimiento en lote.
+    """
+    integ = IntegracionNumerica()
+    exacto = IndiceIntegral.desde_polinomio()
+    tabla = IndiceIntegral.desde_funcion(integ.funcion_energia, integ.a, integ.b)
+
+    print("=" * 70)
+    print("ÍNDICE DE INTEGRALES ACUMULADAS - CONSULTAS POR SUBRANGO")
+    print("=" * 70)
+
+    N = np.array([m['parametros'] for m in MODELOS_AI])
+    nombres = [m['nombre'] for m in MODELOS_AI]
+    Z_exacto = exacto.integrar(N[:-1], N[1:])
+    Z_tabla = tabla.integrar(N[:-1], N[1:])
+
+    print(f"\n{'Desde':>15} → {'Hasta':<15} | {'Exacta (Wh·B)':>14} | {'Tabla (Wh·B)':>14} | {'Dif.':>9}")
+    print("-" * 80)
+    for i in range(len(N) - 1):
+        print(f"{nombres[i]:>15} → {nombres[i+1]:<15} | {Z_exacto[i]:>14.8f} | "
+              f"{Z_tabla[i]:>14.8f} | {abs(Z_exacto[i] - Z_tabla[i]):>9.1e}")
+
+    rng = np.random.default_rng(0)
+    lim = np.sort(rng.uniform(integ.a, integ.b, (2, num_consultas)), axis=0)
+
+    print(f"\nConsultas en lote: {num_consultas:,}")
+    for nombre, indice in [('exacto', exacto), ('tabla', tabla)]:
+        inicio = time.perf_counter()
+        indice.integrar(lim[0], lim[1])
+        tiempo = time.perf_counter() - inicio
+        print(f"  Índice {nombre:<7}: {tiempo*1000:8.1f} ms ({tiempo/num_consultas*1e9:.1f} ns/consulta)")
+
+    print("\n" + "=" * 70)
+
+
+if __name__ == '__main__':
+    ejecutar_indice()
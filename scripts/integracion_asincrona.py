@@ -0,0 +1,243 @@
+"""
+integracion_asincrona.py
+========================
+Fachada asyncio de IntegracionNumerica para servicios.
+
+Los métodos de IntegracionNumerica son síncronos y, con n grande, bloquean el bucle de
+eventos. IntegradorAsincrono:
+- ejecuta cada cálculo en un ejecutor (hilos por defecto; NumPy libera el GIL)
+- limita los cálculos simultáneos con un semáforo (contrapresión: los llamadores
+  esperan en lugar de acumular trabajo en el ejecutor)
+- agrupa solicitudes idénticas en vuelo: mismos coeficientes, intervalo, método, modo
+  y n comparten un único cálculo y un único resultado
+
+Con métricas activas (metricas.py), el cálculo emite su registro desde el método
+instrumentado y cada solicitud agrupada emite uno con cache_hit=True y 0 evaluaciones.
+
+Uso:
+    integrador = IntegradorAsincrono(max_simultaneos=4)
+    valor = await integrador.calcular('simpson', 1000)
+    tabla = await integrador.tabla('rectangulos', [10, 100, 1000], mode='mid')
+
+    python integracion_asincrona.py [num_clientes]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+import metricas
+from integrales_numericas import IntegracionNumerica
+
+METODOS = ('exacta', 'trapecio', 'simpson', 'rectangulos')
+MODOS = ('left', 'mid', 'right')
+
+
+def integrador_para(coeficientes=None, a=1.1, b=8.0):
+    """
+    IntegracionNumerica en [a, b] para un polinomio de coeficientes dados.
+
+    Parámetros:
+    -----------
+    coeficientes : array, opcional
+        Orden descendente de grado, como np.polyval (default: los de E(N))
+    a, b : float
+        Intervalo de integración
+
+    Retorna:
+    --------
+    IntegracionNumerica
+        Con funcion_energia y antiderivada_energia sustituidas si los coeficientes
+        difieren de COEFICIENTES_ENERGIA
+    """
+    integ = IntegracionNumerica(a, b)
+    if coeficientes is None:
+        return integ
+    c = np.asarray(coeficientes, dtype=np.float64)
+    if not np.array_equal(c, IntegracionNumerica.COEFICIENTES_ENERGIA):
+        integ.funcion_energia = lambda N: np.polyval(c, N)
+        integ.antiderivada_energia = np.poly1d(np.polyint(c))
+    return integ
+
+
+def clave_solicitud(metodo, n=None, mode=None, a=1.1, b=8.0, coeficientes=None):
+    """
+    Clave canónica de una solicitud: dos solicitudes con la misma clave dan el mismo
+    resultado.
+
+    Valida los argumentos; 'exacta' ignora n y mode, y mode solo aplica a rectangulos.
+    """
+    if metodo not in METODOS:
+        raise ValueError("Metodo debe ser 'exacta', 'trapecio', 'simpson' o 'rectangulos'")
+    if metodo == 'exacta':
+        n = mode = None
+    else:
+        if n is None or int(n) < 1:
+            raise ValueError("n debe ser un entero positivo")
+        n = int(n)
+        if metodo == 'rectangulos':
+            mode = mode or 'mid'
+            if mode not in MODOS:
+                raise ValueError("mode debe ser 'left', 'right' o 'mid'")
+        else:
+            mode = None
+    if coeficientes is None:
+        coeficientes = IntegracionNumerica.COEFICIENTES_ENERGIA
+    return (metodo, n, mode, float(a), float(b), tuple(float(c) for c in coeficientes))
+
+
+def calcular_clave(clave):
+    """
+    Calcular síncronamente una solicitud a partir de su clave.
+
+    Función de módulo (serializable), apta también para ProcessPoolExecutor.
+    """
+    metodo, n, mode, a, b, coeficientes = clave
+    integ = integrador_para(coeficientes, a, b)
+    if metodo == 'exacta':
+        return float(integ.integral_exacta())
+    if metodo == 'rectangulos':
+        return float(integ.rectangulos(n, mode))
+    return float(getattr(integ, metodo)(n))
+
+
+class IntegradorAsincrono:
+    """
+    Fachada asíncrona con contrapresión y agrupación de solicitudes en vuelo.
+    """
+
+    def __init__(self, max_simultaneos=None, ejecutor=None):
+        """
+        Parámetros:
+        -----------
+        max_simultaneos : int, opcional
+            Cálculos simultáneos en el ejecutor (default: número de CPUs)
+        ejecutor : concurrent.futures.Executor, opcional
+            Ejecutor de los cálculos (default: el del bucle de eventos)
+        """
+        if max_simultaneos is None:
+            max_simultaneos = os.cpu_count() or 1
+        if max_simultaneos < 1:
+            raise ValueError("max_simultaneos debe ser al menos 1")
+        self.max_simultaneos = max_simultaneos
+        self.ejecutor = ejecutor
+        self._semaforo = None
+        self._en_vuelo = {}
+        self.estadisticas = {'solicitudes': 0, 'calculos': 0, 'agrupadas': 0}
+
+    def _semaforo_activo(self):
+        # Se crea en el bucle que lo usa (asyncio.Semaphore queda ligado a un bucle)
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.max_simultaneos)
+        return self._semaforo
+
+    async def _ejecutar(self, clave):
+        try:
+            async with self._semaforo_activo():
+                self.estadisticas['calculos'] += 1
+                bucle = asyncio.get_running_loop()
+                return await bucle.run_in_executor(self.ejecutor, calcular_clave, clave)
+        finally:
+            del self._en_vuelo[clave]
+
+    async def calcular(self, metodo, n=None, mode=None, a=1.1, b=8.0, coeficientes=None):
+        """
+        Calcular una integral sin bloquear el bucle de eventos.
+
+        Si ya hay una solicitud idéntica en vuelo, espera su resultado en lugar de
+        calcularlo de nuevo. Cancelar a un llamador no cancela el cálculo compartido.
+
+        Parámetros:
+        -----------
+        metodo : str
+            'exacta', 'trapecio', 'simpson' o 'rectangulos'
+        n : int
+            Número de subintervalos (no aplica a 'exacta')
+        mode : str, opcional
+            'left', 'right' o 'mid' (solo rectangulos; default: 'mid')
+        a, b : float
+            Intervalo de integración
+        coeficientes : array, opcional
+            Coeficientes del polinomio (default: los de E(N))
+
+        Retorna:
+        --------
+        float
+            Valor de la integral
+        """
+        clave = clave_solicitud(metodo, n, mode, a, b, coeficientes)
+        self.estadisticas['solicitudes'] += 1
+        tarea = self._en_vuelo.get(clave)
+        agrupada = tarea is not None
+        if agrupada:
+            self.estadisticas['agrupadas'] += 1
+        else:
+            tarea = asyncio.ensure_future(self._ejecutar(clave))
+            self._en_vuelo[clave] = tarea
+        t0 = time.perf_counter()
+        valor = await asyncio.shield(tarea)
+
+        recolector = metricas.recolector_activo()
+        if agrupada and recolector is not None:
+            recolector.registrar(clave[0], clave[1] or 0, 0, time.perf_counter() - t0,
+                                 mode=clave[2], cache_hit=True, valor=valor)
+        return valor
+
+    async def tabla(self, metodo, valores_n, mode=None, a=1.1, b=8.0, coeficientes=None):
+        """
+        Calcular un método para varios n de forma concurrente.
+
+        Retorna:
+        --------
+        dict
+            n -> valor de la integral
+        """
+        valores = await asyncio.gather(*(self.calcular(metodo, n, mode, a, b, coeficientes)
+                                         for n in valores_n))
+        return dict(zip(valores_n, valores))
+
+    def en_vuelo(self):
+        """Número de cálculos distintos en curso."""
+        return len(self._en_vuelo)
+
+
+async def _rafaga(num_clientes):
+    """Simular una ráfaga de clientes pidiendo las tablas estándar."""
+    integrador = IntegradorAsincrono()
+    consultas = [('rectangulos', n, mode) for n in (10, 100, 1000) for mode in MODOS]
+    consultas += [('trapecio', 10**6, None), ('simpson', 10**6, None)]
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(integrador.calcular(metodo, n, mode)
+                           for _ in range(num_clientes) for metodo, n, mode in consultas))
+    return integrador.estadisticas, time.perf_counter() - t0
+
+
+def main():
+    """Punto de ejecución principal."""
+    num_clientes = 50
+
+    if len(sys.argv) > 1:
+        try:
+            num_clientes = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    print("=" * 70)
+    print("INTEGRACIÓN ASÍNCRONA - RÁFAGA DE SOLICITUDES")
+    print("=" * 70)
+    estadisticas, tiempo = asyncio.run(_rafaga(num_clientes))
+    print(f"\nClientes:             {num_clientes}")
+    print(f"Solicitudes:          {estadisticas['solicitudes']}")
+    print(f"Cálculos realizados:  {estadisticas['calculos']}")
+    print(f"Agrupadas (en vuelo): {estadisticas['agrupadas']}")
+    print(f"Tiempo total:         {tiempo * 1000:.1f} ms")
+    print("\n" + "=" * 70)
+
+
+if __name__ == '__main__':
+    main()
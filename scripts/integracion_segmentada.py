@@ -0,0 +1,219 @@
+"""
+integracion_segmentada.py
+=========================
+Integración numérica por segmentos en una sola pasada.
+
+Para S segmentos [a_s, b_s], cada uno con su propio n y método (trapecio, simpson o
+rectangulos con su modo), se construye una malla concatenada con sus pesos de
+cuadratura, se evalúa el integrando una vez y se reduce por segmento con
+np.add.reduceat:
+
+    I_s = sum_{j en segmento s} w_j f(x_j)
+
+La construcción de la malla es vectorizada (np.repeat sobre los tamaños de segmento),
+sin bucles de Python por segmento, de modo que 10^5 segmentos cuestan lo mismo que
+una llamada con el mismo número total de puntos.
+
+Uso:
+    python integracion_segmentada.py [número_de_segmentos]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from integrales_numericas import IntegracionNumerica
+from rectangulos import MODELOS_AI
+
+METODOS = ('rectangulos', 'trapecio', 'simpson')
+
+# Desplazamiento del punto de evaluación dentro de cada subintervalo (rectángulos)
+DESPLAZAMIENTOS = {'left': 0.0, 'mid': 0.5, 'right': 1.0}
+
+
+def _por_segmento(valor, num_segmentos, nombre):
+    """Difundir un escalar (o validar una secuencia) a un arreglo por segmento."""
+    arreglo = np.asarray(valor)
+    if arreglo.ndim == 0:
+        return np.full(num_segmentos, arreglo.item(), dtype=arreglo.dtype)
+    if arreglo.shape != (num_segmentos,):
+        raise ValueError(f"{nombre} debe ser escalar o tener un valor por segmento")
+    return arreglo
+
+
+def malla_segmentos(a, b, n, metodo='simpson', mode='mid'):
+    """
+    Malla concatenada y pesos de cuadratura de todos los segmentos.
+
+    Parámetros:
+    -----------
+    a, b : array
+        Límites de cada segmento
+    n : int o array
+        Subintervalos por segmento (Simpson redondea a par, como IntegracionNumerica)
+    metodo : str o array
+        'rectangulos', 'trapecio' o 'simpson', común o por segmento
+    mode : str o array
+        'left', 'right' o 'mid' (solo rectangulos), común o por segmento
+
+    Retorna:
+    --------
+    tuple
+        (x, pesos, inicios): puntos, pesos y primer índice de cada segmento en x
+    """
+    a = np.atleast_1d(np.asarray(a, dtype=np.float64))
+    b = np.atleast_1d(np.asarray(b, dtype=np.float64))
+    if a.shape != b.shape or a.ndim != 1:
+        raise ValueError("a y b deben ser arreglos 1D de la misma longitud")
+    num_segmentos = a.size
+    n = _por_segmento(n, num_segmentos, 'n').astype(np.int64)
+    metodo = _por_segmento(metodo, num_segmentos, 'metodo')
+    mode = _por_segmento(mode, num_segmentos, 'mode')
+    if np.any(n < 1):
+        raise ValueError("n debe ser al menos 1 en todos los segmentos")
+    if not np.all(np.isin(metodo, METODOS)):
+        raise ValueError("Metodo debe ser 'rectangulos', 'trapecio' o 'simpson'")
+
+    rect = metodo == 'rectangulos'
+    simp = metodo == 'simpson'
+    if np.any(rect) and not np.all(np.isin(mode[rect], list(DESPLAZAMIENTOS))):
+        raise ValueError("mode debe ser 'left', 'right' o 'mid'")
+
+    n = np.where(simp, n + n % 2, n)
+    h = (b - a) / n
+    desplazamiento = np.zeros(num_segmentos)
+    for modo, d in DESPLAZAMIENTOS.items():
+        desplazamiento[rect & (mode == modo)] = d
+
+    # Rectángulos: n puntos; trapecio y Simpson: n + 1 nodos
+    puntos = n + ~rect
+    inicios = np.concatenate([[0], np.cumsum(puntos)[:-1]])
+    segmento = np.repeat(np.arange(num_segmentos), puntos)
+    j = np.arange(puntos.sum()) - inicios[segmento]
+
+    x = a[segmento] + (j + desplazamiento[segmento]) * h[segmento]
+    finales = inicios + puntos - 1
+    nodos = ~rect
+    x[finales[nodos]] = b[nodos]  # último nodo exacto, como np.linspace
+
+    # Pesos: h (rectángulos y trapecio), h/3 * (2 | 4) (Simpson); extremos aparte
+    pesos = np.where(simp[segmento], np.where(j % 2 == 1, 4.0, 2.0) / 3, 1.0) * h[segmento]
+    extremo = np.where(simp, h / 3, h / 2)
+    pesos[inicios[nodos]] = extremo[nodos]
+    pesos[finales[nodos]] = extremo[nodos]
+    return x, pesos, inicios
+
+
+def integrar_segmentos(a, b, n, metodo='simpson', mode='mid', f=None):
+    """
+    Integrar f en cada segmento [a_s, b_s] con una sola evaluación del integrando.
+
+    Parámetros:
+    -----------
+    a, b : array
+        Límites de cada segmento
+    n : int o array
+        Subintervalos por segmento
+    metodo : str o array
+        'rectangulos', 'trapecio' o 'simpson', común o por segmento
+    mode : str o array
+        'left', 'right' o 'mid' (solo rectangulos)
+    f : callable, opcional
+        Integrando vectorizado (default: IntegracionNumerica.funcion_energia)
+
+    Retorna:
+    --------
+    array
+        Integral aproximada de cada segmento
+    """
+    if f is None:
+        f = IntegracionNumerica.funcion_energia
+    x, pesos, inicios = malla_segmentos(a, b, n, metodo, mode)
+    return np.add.reduceat(f(x) * pesos, inicios)
+
+
+def integrar_tramos(cortes, n, metodo='simpson', mode='mid', f=None):
+    """
+    Integrar entre cortes consecutivos: [c_0, c_1], [c_1, c_2], ...
+
+    Retorna:
+    --------
+    array
+        Integral de cada tramo (len(cortes) - 1 valores)
+    """
+    cortes = np.asarray(cortes, dtype=np.float64)
+    if cortes.ndim != 1 or cortes.size < 2:
+        raise ValueError("cortes debe tener al menos 2 valores")
+    return integrar_segmentos(cortes[:-1], cortes[1:], n, metodo, mode, f)
+
+
+def ejecutar_segmentada(num_segmentos=100_000):
+    """
+    Energía por tramo entre modelos consecutivos y prueba de rendimiento con muchos
+    segmentos frente a una llamada de IntegracionNumerica por segmento.
+    """
+    integ = IntegracionNumerica()
+    cortes = [m['parametros'] for m in MODELOS_AI]
+    nombres = [m['nombre'] for m in MODELOS_AI]
+
+    print("=" * 70)
+    print("INTEGRACIÓN SEGMENTADA")
+    print("=" * 70)
+    print(f"\n{'Tramo':<30} | {'Simpson n=100':>14} | {'Exacta':>14} | {'Error Abs.':>11}")
+    print("-" * 78)
+    valores = integrar_tramos(cortes, 100)
+    for i, valor in enumerate(valores):
+        exacta = integ.antiderivada_energia(cortes[i + 1]) - integ.antiderivada_energia(cortes[i])
+        print(f"{nombres[i] + ' -> ' + nombres[i + 1]:<30} | {valor:>14.8f} | "
+              f"{exacta:>14.8f} | {abs(valor - exacta):>11.2e}")
+
+    # Segmentos aleatorios con n y método propios
+    rng = np.random.default_rng(0)
+    a = rng.uniform(integ.a, integ.b, num_segmentos)
+    b = a + rng.uniform(0.01, 1.0, num_segmentos)
+    n = rng.integers(10, 100, num_segmentos)
+    metodo = rng.choice(METODOS, num_segmentos)
+    mode = rng.choice(list(DESPLAZAMIENTOS), num_segmentos)
+
+    t0 = time.perf_counter()
+    resultado = integrar_segmentos(a, b, n, metodo, mode)
+    t_segmentada = time.perf_counter() - t0
+
+    muestra = min(num_segmentos, 2000)
+    t0 = time.perf_counter()
+    directos = []
+    for i in range(muestra):
+        integ.a, integ.b = a[i], b[i]
+        if metodo[i] == 'rectangulos':
+            directos.append(integ.rectangulos(int(n[i]), mode[i]))
+        else:
+            directos.append(getattr(integ, metodo[i])(int(n[i])))
+    t_bucle = (time.perf_counter() - t0) * num_segmentos / muestra
+    diferencia = np.max(np.abs(resultado[:muestra] - directos) / np.abs(directos))
+
+    print(f"\nSegmentos:                  {num_segmentos}")
+    print(f"Puntos evaluados:           {malla_segmentos(a, b, n, metodo, mode)[0].size}")
+    print(f"Tiempo segmentado:          {t_segmentada * 1000:.1f} ms")
+    print(f"Tiempo bucle (estimado):    {t_bucle * 1000:.1f} ms")
+    print(f"Aceleración:                {t_bucle / t_segmentada:.1f}x")
+    print(f"Diferencia relativa máxima: {diferencia:.2e}")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Punto de ejecución principal."""
+    num_segmentos = 100_000
+
+    if len(sys.argv) > 1:
+        try:
+            num_segmentos = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    ejecutar_segmentada(num_segmentos)
+
+
+if __name__ == '__main__':
+    main()
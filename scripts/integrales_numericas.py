@@ -5,9 +5,345 @@ Módulo para métodos de integración numérica: Regla del Trapecio y Regla de S
 Implementa cálculo de integrales definidas con análisis de errores y métricas de convergencia.
 """
 
+import functools
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from scipy import integrate
 
+import backends_calculo
+import metricas
+from almacen_resultados import (AlmacenResultados, CAMPOS_CONVERGENCIA, CAMPOS_MEMORIA,
+                                CAMPOS_ORDEN, CAMPOS_TIEMPOS)
+from medicion import medir_memoria, medir_tiempo
+
+# Descripción de E(N) en los reportes (ver IntegracionNumerica.funcion_energia)
+DESCRIPCION_ENERGIA = 'E(N) = 0.0842*N^4 - 1.2156*N^3 + 6.8934*N^2 - 12.456*N + 11.234'
+
+# Backend por defecto de IntegracionNumerica(backend=None) sin modelo; se lee una vez
+BACKEND_ENTORNO = os.environ.get('BACKEND_CALCULO') or None
+
+# Presupuesto de medición por cada n en los barridos con medir=True (segundos)
+TIEMPO_MEDICION_S = 0.05
+
+# Puntos por bloque del modo paralelo (ver escalamiento.py: cabe en caché L2)
+TAM_BLOQUE = 2**16
+
+# Sumas del modo por bloques: 'pares' acumula cada bloque en float64; 'kahan' y
+# 'neumaier' compensan dentro del bloque, en el tipo de evaluación, y entre bloques
+SUMAS = ('pares', 'kahan', 'neumaier')
+
+# Carriles de la suma compensada vectorizada (suma_compensada_carriles)
+CARRILES_COMPENSACION = 8192
+
+# Tipos de evaluación admitidos (float32: la mitad de ancho de banda de memoria)
+TIPOS = (np.float64, np.float32)
+
+# Parada anticipada de barridos de convergencia (CriterioParada)
+PISO_REDONDEO = 64 * np.finfo(np.float64).eps   # error relativo tratado como redondeo
+TOLERANCIA_ORDEN = 0.1       # diferencia máxima entre órdenes observados consecutivos
+CONFIRMACIONES_ORDEN = 3     # órdenes consecutivos que deben coincidir
+ORDEN_MINIMO_MESETA = 0.5    # por debajo, el error ya no decrece con n: meseta
+
+# Grupos de hilos reutilizados entre llamadas, por número de hilos
+_EJECUTORES = {}
+
+
+def _ejecutor(hilos):
+    """ThreadPoolExecutor compartido para un número de hilos dado."""
+    if hilos not in _EJECUTORES:
+        _EJECUTORES[hilos] = ThreadPoolExecutor(max_workers=hilos,
+                                                thread_name_prefix='integracion')
+    return _EJECUTORES[hilos]
+
+
+def suma_por_pares(valores):
+    """
+    Reducción por pares en orden fijo: ((v0+v1)+(v2+v3))+...
+    
+    El árbol depende solo del número de valores, no de quién los calculó, por lo que
+    el resultado es idéntico bit a bit para cualquier número de hilos. El error de
+    redondeo crece como O(log m) en lugar de O(m).
+    
+    Parámetros:
+    -----------
+    valores : array
+        Sumas parciales en orden de bloque
+        
+    Retorna:
+    --------
+    float
+        Suma total
+    """
+    v = np.asarray(valores, dtype=np.float64)
+    if v.size == 0:
+        return 0.0
+    while v.size > 1:
+        pares = v.size - v.size % 2
+        v = np.concatenate([v[0:pares:2] + v[1:pares:2], v[pares:]])
+    return float(v[0])
+
+
+def suma_compensada(valores, metodo='neumaier'):
+    """
+    Suma compensada de Kahan o Neumaier, en orden.
+    
+    Arrastra el error de redondeo de cada suma en un término de compensación: el error
+    total es O(eps) independientemente del número de valores. Neumaier también cubre
+    el caso en que el sumando es mayor que el acumulado.
+    
+    Parámetros:
+    -----------
+    valores : array
+        Sumandos (p. ej. sumas parciales por bloque)
+    metodo : str
+        'kahan' o 'neumaier'
+        
+    Retorna:
+    --------
+    float
+        Suma total
+    """
+    if metodo not in ('kahan', 'neumaier'):
+        raise ValueError("metodo debe ser 'kahan' o 'neumaier'")
+    total = 0.0
+    compensacion = 0.0
+    for v in map(float, valores):
+        if metodo == 'kahan':
+            y = v - compensacion
+            t = total + y
+            compensacion = (t - total) - y
+            total = t
+        else:
+            t = total + v
+            if abs(total) >= abs(v):
+                compensacion += (total - t) + v
+            else:
+                compensacion += (v - t) + total
+            total = t
+    return total if metodo == 'kahan' else total + compensacion
+
+
+def suma_compensada_carriles(valores, metodo='neumaier', carriles=CARRILES_COMPENSACION):
+    """
+    Suma compensada de Kahan o Neumaier en el tipo de `valores`, vectorizada por carriles.
+    
+    Los valores se recorren en filas de `carriles` elementos: cada carril acumula su
+    columna en orden, con su propio término de compensación, y las operaciones de NumPy
+    avanzan fila a fila. Así un bloque float32 se suma con error O(eps) de float32 sin
+    convertirlo a float64; solo los totales de los carriles se combinan en float64.
+    
+    Parámetros:
+    -----------
+    valores : array
+        Sumandos (float32 o float64)
+    metodo : str
+        'kahan' o 'neumaier'
+    carriles : int
+        Acumuladores independientes (ancho de fila)
+        
+    Retorna:
+    --------
+    float
+        Suma total
+    """
+    if metodo not in ('kahan', 'neumaier'):
+        raise ValueError("metodo debe ser 'kahan' o 'neumaier'")
+    v = np.asarray(valores)
+    if v.size == 0:
+        return 0.0
+    ancho = min(carriles, v.size)
+    total = v[:ancho].copy()
+    compensacion = np.zeros_like(total)
+    for inicio in range(ancho, v.size, ancho):
+        fila = v[inicio:inicio + ancho]
+        s = total[:fila.size]
+        c = compensacion[:fila.size]
+        if metodo == 'kahan':
+            y = fila - c
+            t = s + y
+            c[:] = (t - s) - y
+        else:
+            t = s + fila
+            c += np.where(np.abs(s) >= np.abs(fila), (s - t) + fila, (fila - t) + s)
+        s[:] = t
+    total = np.sum(total, dtype=np.float64)
+    compensacion = np.sum(compensacion, dtype=np.float64)
+    return float(total - compensacion if metodo == 'kahan' else total + compensacion)
+
+
+class CriterioParada:
+    """
+    Parada anticipada de un barrido de convergencia con n creciente.
+    
+    Con cada nuevo (n, error) estima el orden observado
+    
+        p_i = log(e_{i-1} / e_i) / log(n_i / n_{i-1})
+    
+    y detiene el barrido cuando:
+    - 'tolerancia': el error alcanza la tolerancia pedida
+    - 'redondeo': el error relativo cae al piso de redondeo de float64
+    - 'meseta': el error deja de decrecer (p_i < ORDEN_MINIMO_MESETA)
+    - 'orden': CONFIRMACIONES_ORDEN órdenes consecutivos coinciden (orden asintótico);
+      solo sin tolerancia (por defecto) o con confirmar_orden=True. Con una tolerancia
+      el barrido sigue hasta alcanzarla, o hasta el piso de redondeo o una meseta;
+      confirmar_orden=False barre hasta el piso de precisión
+    
+    Uso:
+        criterio = CriterioParada(exacta)
+        for n in valores_n:
+            if criterio.registrar(n, abs(metodo(n) - exacta)):
+                break
+        criterio.resumen()
+    """
+    
+    def __init__(self, exacta, tolerancia=None, piso_relativo=PISO_REDONDEO,
+                 confirmar_orden=None):
+        """
+        Parámetros:
+        -----------
+        exacta : float
+            Valor exacto de la integral (escala del piso de redondeo)
+        tolerancia : float, opcional
+            Error absoluto con el que se considera convergido
+        piso_relativo : float
+            Error relativo tratado como redondeo
+        confirmar_orden : bool, opcional
+            Si el orden confirmado detiene el barrido (default: solo sin tolerancia)
+        """
+        if confirmar_orden is None:
+            confirmar_orden = tolerancia is None
+        self.tolerancia = tolerancia
+        self.confirmar_orden = confirmar_orden
+        self.piso = piso_relativo * max(abs(exacta), np.finfo(np.float64).tiny)
+        self.valores_n = []
+        self.errores = []
+        self.ordenes = []
+        self.motivo = None
+    
+    def registrar(self, n, error):
+        """
+        Añadir el error de un nuevo n.
+        
+        Retorna:
+        --------
+        bool
+            True si el barrido debe detenerse
+        """
+        orden = np.nan
+        if self.errores and self.errores[-1] > 0 and error > 0 and n != self.valores_n[-1]:
+            orden = np.log(self.errores[-1] / error) / np.log(n / self.valores_n[-1])
+        self.valores_n.append(n)
+        self.errores.append(error)
+        self.ordenes.append(orden)
+        
+        if self.tolerancia is not None and error <= self.tolerancia:
+            self.motivo = 'tolerancia'
+        elif error <= self.piso:
+            self.motivo = 'redondeo'
+        elif orden < ORDEN_MINIMO_MESETA:
+            self.motivo = 'meseta'
+        elif self.confirmar_orden and self._orden_confirmado():
+            self.motivo = 'orden'
+        return self.motivo is not None
+    
+    def _orden_confirmado(self):
+        ultimos = self.ordenes[-CONFIRMACIONES_ORDEN:]
+        if len(ultimos) < CONFIRMACIONES_ORDEN or np.any(np.isnan(ultimos)):
+            return False
+        return np.ptp(ultimos) <= TOLERANCIA_ORDEN
+    
+    def orden_estimado(self):
+        """Media de los últimos órdenes observados válidos (NaN si no hay)."""
+        validos = [p for p in self.ordenes[-CONFIRMACIONES_ORDEN:] if not np.isnan(p)]
+        if self.motivo in ('redondeo', 'meseta'):
+            # El último orden refleja el redondeo, no el método
+            validos = [p for p in self.ordenes[:-1] if not np.isnan(p)][-CONFIRMACIONES_ORDEN:]
+        return float(np.mean(validos)) if validos else float('nan')
+    
+    def resumen(self, total_n=None):
+        """
+        Resumen del barrido.
+        
+        Retorna:
+        --------
+        dict
+            detenido, motivo, n_final, orden_observado, meseta (error de la meseta o
+            None), evaluados, omitidos
+        """
+        evaluados = len(self.valores_n)
+        return {
+            'detenido': self.motivo is not None,
+            'motivo': self.motivo,
+            'n_final': self.valores_n[-1] if self.valores_n else None,
+            'orden_observado': self.orden_estimado(),
+            'meseta': self.errores[-1] if self.motivo in ('redondeo', 'meseta') else None,
+            'evaluados': evaluados,
+            'omitidos': (total_n - evaluados) if total_n is not None else 0,
+        }
+
+
+def _emitir_metricas(metodo, evaluaciones):
+    """
+    Decorador: emite un registro de metricas.py por llamada.
+
+    Sin recolector activo la llamada pasa directa (una comprobación por llamada).
+    Dentro de un barrido las llamadas internas (trapecio, integral_exacta, ...) no
+    emiten: el registro del barrido ya suma sus evaluaciones.
+    
+    Parámetros:
+    -----------
+    metodo : str
+        Nombre del método en el registro
+    evaluaciones : callable
+        (n, mode) -> evaluaciones de f de una llamada
+    """
+    def decorador(func):
+        firma = inspect.signature(func)
+        barrido = 'valores_n' in firma.parameters
+        
+        @functools.wraps(func)
+        def envoltura(self, *args, **kwargs):
+            recolector = metricas.recolector_activo()
+            if recolector is None:
+                return func(self, *args, **kwargs)
+            
+            t0 = time.perf_counter_ns()
+            if barrido:
+                with metricas.suprimido():
+                    resultado = func(self, *args, **kwargs)
+            else:
+                resultado = func(self, *args, **kwargs)
+            tiempo_s = (time.perf_counter_ns() - t0) / 1e9
+            
+            argumentos = firma.bind(self, *args, **kwargs)
+            argumentos.apply_defaults()
+            mode = argumentos.arguments.get('mode')
+            if barrido:
+                # Un registro por barrido: n máximo, evaluaciones totales, error del último n
+                # (solo los n evaluados si el barrido se detuvo antes)
+                valores_n = np.asarray(resultado['n'], dtype=np.int64)
+                n = int(valores_n.max()) if valores_n.size else 0
+                total = sum(evaluaciones(int(k), mode) for k in valores_n)
+                valor = resultado['integrales'][-1] if valores_n.size else None
+            else:
+                n = argumentos.arguments.get('n', 0)
+                total = evaluaciones(n, mode)
+                valor = resultado
+            
+            # Integral exacta sin pasar por el método instrumentado
+            exacta = self.antiderivada_energia(self.b) - self.antiderivada_energia(self.a)
+            error_abs = None if valor is None else abs(valor - exacta)
+            error_rel = None if error_abs is None or exacta == 0 else error_abs / abs(exacta) * 100
+            recolector.registrar(metodo, n, total, tiempo_s, error_abs, error_rel,
+                                 mode=mode, valor=valor)
+            return resultado
+        return envoltura
+    return decorador
+
 
 class IntegracionNumerica:
     """
@@ -19,7 +355,10 @@ class IntegracionNumerica:
     - Análisis de errores y validación de convergencia
     """
     
-    def __init__(self, a=1.1, b=8.0):
+    # Coeficientes de E(N) en orden descendente de grado (convención de np.polyval)
+    COEFICIENTES_ENERGIA = np.array([0.0842, -1.2156, 6.8934, -12.456, 11.234])
+    
+    def __init__(self, a=1.1, b=8.0, modelo=None, backend=None):
         """
         Inicializar límites de integración.
         
@@ -29,10 +368,43 @@ class IntegracionNumerica:
             Límite inferior (default: 1.1 mil millones parámetros - TinyLLaMA)
         b : float
             Límite superior (default: 8.0 mil millones parámetros - LLaMA-3 8B)
+        modelo : ModeloPorTramos, opcional
+            Modelo de energía alternativo (invocable con método antiderivada()); sustituye
+            a funcion_energia y antiderivada_energia en todos los métodos
+        backend : str, opcional
+            'auto', 'numpy', 'numexpr' o 'numba' (ver backends_calculo.py): trapecio,
+            simpson y rectangulos usan su suma fusionada sobre la malla. Default: variable
+            de entorno BACKEND_CALCULO (leída al importar, solo sin modelo), o sin backend
+            (métodos originales). La suma fusionada evalúa COEFICIENTES_ENERGIA: si se
+            sustituye funcion_energia en la instancia, se usan los métodos originales
         """
         self.a = a
         self.b = b
         self.resultados = []
+        self.modelo = modelo
+        if modelo is not None:
+            self.funcion_energia = modelo
+            self.antiderivada_energia = modelo.antiderivada
+        if backend is None and modelo is None:
+            backend = BACKEND_ENTORNO
+        if backend is not None:
+            if backend != 'auto' and backend not in backends_calculo.BACKENDS:
+                raise ValueError("backend debe ser 'auto', 'numpy', 'numexpr' o 'numba'")
+            if modelo is not None:
+                raise ValueError("backend solo aplica al polinomio E(N), no a un modelo")
+        self.backend = backend
+    
+    def descripcion_funcion(self):
+        """
+        Texto del integrando para reportes: E(N), el repr del modelo o la función
+        que sustituye a funcion_energia en la instancia.
+        """
+        if self.modelo is not None:
+            return repr(self.modelo)
+        if 'funcion_energia' in vars(self):
+            f = self.funcion_energia
+            return f"funcion_energia sustituida: {getattr(f, '__qualname__', type(f).__name__)}"
+        return DESCRIPCION_ENERGIA
     
     @staticmethod
     def funcion_energia(N):
@@ -49,7 +421,7 @@ class IntegracionNumerica:
         Retorna:
         --------
         float o array
-            Consumo energético en Wh
+            Consumo energético en Wh (mismo tipo que N: float32 entra, float32 sale)
         """
         return 0.0842 * N**4 - 1.2156 * N**3 + 6.8934 * N**2 - 12.456 * N + 11.234
     
@@ -72,6 +444,7 @@ class IntegracionNumerica:
         """
         return (0.0842/5)*N**5 - (1.2156/4)*N**4 + (6.8934/3)*N**3 - (12.456/2)*N**2 + 11.234*N
     
+    @_emitir_metricas('integral_exacta', lambda n, mode: 0)
     def integral_exacta(self):
         """
         Calcular integral exacta usando antiderivada (Teorema Fundamental del Cálculo).
@@ -83,7 +456,117 @@ class IntegracionNumerica:
         """
         return self.antiderivada_energia(self.b) - self.antiderivada_energia(self.a)
     
-    def trapecio(self, n):
+    @staticmethod
+    def _usar_bloques(hilos, suma, dtype):
+        """True si alguna opción requiere el modo por bloques."""
+        return hilos is not None or suma is not None or np.dtype(dtype) != np.float64
+    
+    def _usar_backend(self):
+        """True si hay backend y el integrando es E(N) (funcion_energia no sustituida)."""
+        return self.backend is not None and 'funcion_energia' not in vars(self)
+    
+    def _suma_backend(self, inicio, paso, num_puntos):
+        """sum f(inicio + i paso), i < num_puntos, con el backend configurado."""
+        backend = backends_calculo.backend_para(self.backend, self.COEFICIENTES_ENERGIA,
+                                                num_puntos)
+        return backend.suma_malla(inicio, paso, num_puntos)
+    
+    def _extremos(self, dtype=np.float64):
+        """f(a), f(b) evaluados en el mismo tipo que la malla."""
+        y_a, y_b = self.funcion_energia(np.array([self.a, self.b], dtype=dtype))
+        return float(y_a), float(y_b)
+    
+    def _suma_bloques(self, num_puntos, h, desplazamiento=0.0, nodos=False, simpson=False,
+                      hilos=None, tam_bloque=TAM_BLOQUE, suma=None, dtype=np.float64):
+        """
+        Suma de f en la malla x_i = a + (i + desplazamiento) h, i = 0..num_puntos-1,
+        evaluada por bloques en un grupo de hilos.
+        
+        Los límites de los bloques dependen solo de num_puntos y tam_bloque, y las sumas
+        parciales se combinan en orden de bloque: el resultado no depende del número de
+        hilos. NumPy libera el GIL al evaluar y sumar cada bloque.
+        
+        Con dtype=float32 la malla se construye en float32 (origen de cada bloque en
+        float64 más desplazamientos locales, exactos en float32) y f se evalúa en
+        float32. suma='pares' acumula cada bloque en float64; 'kahan' y 'neumaier' lo
+        acumulan compensado en float32 (suma_compensada_carriles) sin convertirlo. En
+        ambos casos la suma no añade error visible: queda el redondeo de f en float32
+        (~1e-7 relativo para E(N) en [1.1, 8]).
+        
+        Parámetros:
+        -----------
+        num_puntos : int
+            Puntos de la malla
+        h : float
+            Tamaño de paso
+        desplazamiento : float
+            0 (left / nodos), 0.5 (mid) o 1 (right)
+        nodos : bool
+            Malla de nodos a..b: el último punto se fija a b, como np.linspace
+        simpson : bool
+            Pesos 2 (índice par) y 4 (impar); si es False, peso 1
+        hilos : int, opcional
+            Hilos del grupo (None o 1 = secuencial)
+        tam_bloque : int
+            Puntos por bloque
+        suma : str, opcional
+            'pares' (default): cada bloque en float64 y reducción por pares; 'kahan' o
+            'neumaier': compensada dentro de cada bloque y entre bloques
+        dtype : tipo
+            np.float64 (default) o np.float32
+            
+        Retorna:
+        --------
+        float
+            Suma ponderada (sin el factor h ni correcciones de extremos)
+        """
+        hilos = 1 if hilos is None else hilos
+        suma = 'pares' if suma is None else suma
+        if hilos < 1:
+            raise ValueError("hilos debe ser al menos 1")
+        if tam_bloque < 1:
+            raise ValueError("tam_bloque debe ser al menos 1")
+        if suma not in SUMAS:
+            raise ValueError("suma debe ser 'pares', 'kahan' o 'neumaier'")
+        tipo = np.dtype(dtype)
+        if tipo not in TIPOS:
+            raise ValueError("dtype debe ser np.float64 o np.float32")
+        
+        if suma == 'pares':
+            def acumular(y):
+                return np.sum(y, dtype=np.float64)
+        else:
+            def acumular(y):
+                return suma_compensada_carriles(y, suma)
+        if tipo != np.float64:
+            locales = np.arange(tam_bloque, dtype=tipo) * tipo.type(h)
+        
+        def bloque(inicio):
+            fin = min(inicio + tam_bloque, num_puntos)
+            if tipo == np.float64:
+                x = self.a + (np.arange(inicio, fin, dtype=np.float64) + desplazamiento) * h
+            else:
+                x = tipo.type(self.a + (inicio + desplazamiento) * h) + locales[:fin - inicio]
+            if nodos and fin == num_puntos:
+                x[-1] = self.b
+            y = self.funcion_energia(x)
+            if simpson:
+                par = inicio % 2
+                return 2.0 * acumular(y[par::2]) + 4.0 * acumular(y[1 - par::2])
+            return acumular(y)
+        
+        inicios = range(0, num_puntos, tam_bloque)
+        if hilos == 1:
+            parciales = [bloque(k) for k in inicios]
+        else:
+            parciales = list(_ejecutor(hilos).map(bloque, inicios))
+        if suma == 'pares':
+            return suma_por_pares(parciales)
+        return suma_compensada(parciales, suma)
+    
+    @_emitir_metricas('trapecio', lambda n, mode: n + 1)
+    def trapecio(self, n, hilos=None, tam_bloque=TAM_BLOQUE, suma=None,
+                 dtype=np.float64):
         """
         Aproximación por Regla del Trapecio.
         
@@ -96,6 +579,15 @@ class IntegracionNumerica:
         -----------
         n : int
             Número de subintervalos
+        hilos : int, opcional
+            Si se indica, modo por bloques en paralelo con reducción determinista
+            (memoria O(tam_bloque), mismo resultado para cualquier número de hilos)
+        tam_bloque : int
+            Puntos por bloque en el modo por bloques
+        suma : str, opcional
+            'pares', 'kahan' o 'neumaier' (modo por bloques): ver _suma_bloques
+        dtype : tipo
+            np.float32 construye y evalúa la malla en float32 (modo por bloques)
             
         Retorna:
         --------
@@ -103,13 +595,25 @@ class IntegracionNumerica:
             Valor aproximado de la integral
         """
         h = (self.b - self.a) / n
+        if self._usar_bloques(hilos, suma, dtype):
+            total = self._suma_bloques(n + 1, h, nodos=True, hilos=hilos, tam_bloque=tam_bloque,
+                                       suma=suma, dtype=dtype)
+            y_a, y_b = self._extremos(dtype)
+            return h * (total - 0.5 * (y_a + y_b))
+        
+        if self._usar_backend():
+            y_a, y_b = self._extremos()
+            return h * (self._suma_backend(self.a, h, n + 1) - 0.5 * (y_a + y_b))
+        
         x = np.linspace(self.a, self.b, n + 1)
         y = self.funcion_energia(x)
         
         integral = (h / 2) * (y[0] + 2 * np.sum(y[1:-1]) + y[-1])
         return integral
     
-    def simpson(self, n):
+    @_emitir_metricas('simpson', lambda n, mode: n + n % 2 + 1)
+    def simpson(self, n, hilos=None, tam_bloque=TAM_BLOQUE, suma=None,
+                dtype=np.float64):
         """
         Aproximación por Regla de Simpson 1/3.
         
@@ -123,6 +627,14 @@ class IntegracionNumerica:
         -----------
         n : int
             Número de subintervalos (debe ser par)
+        hilos : int, opcional
+            Si se indica, modo por bloques en paralelo con reducción determinista
+        tam_bloque : int
+            Puntos por bloque en el modo por bloques
+        suma : str, opcional
+            'pares', 'kahan' o 'neumaier' (modo por bloques): ver _suma_bloques
+        dtype : tipo
+            np.float32 construye y evalúa la malla en float32 (modo por bloques)
             
         Retorna:
         --------
@@ -133,13 +645,29 @@ class IntegracionNumerica:
             n += 1
         
         h = (self.b - self.a) / n
+        if self._usar_bloques(hilos, suma, dtype):
+            total = self._suma_bloques(n + 1, h, nodos=True, simpson=True,
+                                      hilos=hilos, tam_bloque=tam_bloque, suma=suma, dtype=dtype)
+            y_a, y_b = self._extremos(dtype)
+            # Los extremos (índices pares) llevan peso 1, no 2
+            return (h / 3) * (total - y_a - y_b)
+        
+        if self._usar_backend():
+            # Pesos 1, 4, 2, ..., 4, 1 = 2 (todos) + 2 (impares) - 1 (extremos)
+            y_a, y_b = self._extremos()
+            total = 2 * (self._suma_backend(self.a, h, n + 1)
+                         + self._suma_backend(self.a + h, 2 * h, n // 2))
+            return (h / 3) * (total - y_a - y_b)
+        
         x = np.linspace(self.a, self.b, n + 1)
         y = self.funcion_energia(x)
         
         integral = (h / 3) * (y[0] + 4*np.sum(y[1:-1:2]) + 2*np.sum(y[2:-1:2]) + y[-1])
         return integral
     
-    def rectangulos(self, n, mode='mid'):
+    @_emitir_metricas('rectangulos', lambda n, mode: n)
+    def rectangulos(self, n, mode='mid', hilos=None, tam_bloque=TAM_BLOQUE, suma=None,
+                    dtype=np.float64):
         """
         Aproximación por Método de Rectángulos (Sumas de Riemann).
         
@@ -159,6 +687,14 @@ class IntegracionNumerica:
             Número de rectángulos/subintervalos
         mode : str
             Modo de evaluación: 'left', 'right', 'mid' (default: 'mid')
+        hilos : int, opcional
+            Si se indica, modo por bloques en paralelo con reducción determinista
+        tam_bloque : int
+            Puntos por bloque en el modo por bloques
+        suma : str, opcional
+            'pares', 'kahan' o 'neumaier' (modo por bloques): ver _suma_bloques
+        dtype : tipo
+            np.float32 construye y evalúa la malla en float32 (modo por bloques)
             
         Retorna:
         --------
@@ -167,6 +703,19 @@ class IntegracionNumerica:
         """
         h = (self.b - self.a) / n
         
+        desplazamientos = {'left': 0.0, 'mid': 0.5, 'right': 1.0}
+        if self._usar_bloques(hilos, suma, dtype):
+            if mode not in desplazamientos:
+                raise ValueError("mode debe ser 'left', 'right' o 'mid'")
+            total = self._suma_bloques(n, h, desplazamientos[mode], hilos=hilos,
+                                       tam_bloque=tam_bloque, suma=suma, dtype=dtype)
+            return h * total
+        
+        if self._usar_backend():
+            if mode not in desplazamientos:
+                raise ValueError("mode debe ser 'left', 'right' o 'mid'")
+            return h * self._suma_backend(self.a + desplazamientos[mode] * h, h, n)
+        
         if mode == 'left':
             x = np.array([self.a + i * h for i in range(n)])
         elif mode == 'right':
@@ -202,91 +751,164 @@ class IntegracionNumerica:
             return float('inf')
         return abs(i1 - i2) / abs(i2) * 100
     
-    def analizar_convergencia_trapecio(self, valores_n):
+    def _analizar_convergencia(self, metodo, valores_n, ruta=None, medir=False, memoria=False,
+                               detener=False, tolerancia=None):
         """
-        Analizar convergencia de la Regla del Trapecio para múltiples valores de n.
+        Núcleo común de los analizadores de convergencia.
+        
+        Evalúa `metodo(n)` para cada n y guarda los registros en un almacén columnar.
+        Los errores se calculan vectorizados al final; el primer error relativo,
+        sin aproximación previa, queda en NaN.
+        
+        Con detener=True los n se evalúan en orden con un CriterioParada: el barrido
+        termina en cuanto el error llega a la tolerancia (si se indica; si no, al
+        confirmarse el orden asintótico), al piso de redondeo o a una meseta. Se añade la columna
+        ordenes_observados y el resumen queda en resultados.metadatos['convergencia'].
         
         Parámetros:
         -----------
+        metodo : callable
+            Función n -> aproximación de la integral
         valores_n : list
             Lista de valores de n a probar
+        ruta : str, opcional
+            Archivo np.memmap para barridos muy grandes
+        medir : bool
+            Si es True, mide cada n con el arnés de medicion.py y añade las
+            columnas tiempos (mediana), tiempos_min y tiempos_p95 en ms
+        memoria : bool
+            Si es True, mide con tracemalloc una llamada adicional por n y añade
+            las columnas memoria_pico y memoria_neta en bytes
+        detener : bool
+            Si es True, detiene el barrido con CriterioParada (valores_n en orden creciente)
+        tolerancia : float, opcional
+            Error absoluto con el que se detiene el barrido (solo con detener=True)
             
         Retorna:
         --------
-        dict
-            Resultados con claves: n, integrales, errores_relativo, errores_absoluto
+        AlmacenResultados
+            Vista tipo dict con claves: n, integrales, errores_relativo, errores_absoluto
+            (y tiempos, tiempos_min, tiempos_p95 si medir=True;
+            memoria_pico, memoria_neta si memoria=True;
+            ordenes_observados si detener=True)
         """
-        resultados = {
-            'n': [],
-            'integrales': [],
-            'errores_relativo': [],
-            'errores_absoluto': []
-        }
-        
+        valores_n = np.asarray(valores_n, dtype=np.int64)
+        total_n = len(valores_n)
         exact = self.integral_exacta()
-        prev_integral = None
+        campos = (CAMPOS_CONVERGENCIA + (CAMPOS_TIEMPOS if medir else []) +
+                  (CAMPOS_MEMORIA if memoria else []) + (CAMPOS_ORDEN if detener else []))
+        resultados = AlmacenResultados(campos, capacidad=total_n, ruta=ruta)
+        columnas = {}
+        criterio = CriterioParada(exact, tolerancia) if detener else None
         
-        for n in valores_n:
-            integral = self.trapecio(n)
-            error_abs = abs(integral - exact)
-            
-            resultados['n'].append(n)
-            resultados['integrales'].append(integral)
-            resultados['errores_absoluto'].append(error_abs)
-            
-            if prev_integral is not None:
-                error_rel = self.calcular_error_relativo(prev_integral, integral)
-                resultados['errores_relativo'].append(error_rel)
-            else:
-                resultados['errores_relativo'].append(None)
-            
-            prev_integral = integral
+        if medir or detener:
+            integrales = np.empty(total_n)
+            tiempos = np.empty((3, total_n))
+            evaluados = total_n
+            for i, n in enumerate(valores_n):
+                if medir:
+                    integrales[i], stats = medir_tiempo(lambda: metodo(int(n)),
+                                                        tiempo_objetivo=TIEMPO_MEDICION_S)
+                    tiempos[:, i] = stats['mediana_ms'], stats['min_ms'], stats['p95_ms']
+                else:
+                    integrales[i] = metodo(int(n))
+                if criterio is not None and criterio.registrar(int(n), abs(integrales[i] - exact)):
+                    evaluados = i + 1
+                    break
+            valores_n, integrales = valores_n[:evaluados], integrales[:evaluados]
+            if medir:
+                tiempos = tiempos[:, :evaluados]
+                columnas.update(tiempos=tiempos[0], tiempos_min=tiempos[1],
+                                tiempos_p95=tiempos[2])
+            if criterio is not None:
+                columnas['ordenes_observados'] = np.array(criterio.ordenes)
+                resultados.metadatos['convergencia'] = criterio.resumen(total_n)
+        else:
+            integrales = np.fromiter((metodo(int(n)) for n in valores_n),
+                                     dtype=np.float64, count=len(valores_n))
+        
+        if memoria:
+            bytes_memoria = np.empty((2, len(valores_n)))
+            for i, n in enumerate(valores_n):
+                _, uso = medir_memoria(lambda: metodo(int(n)))
+                bytes_memoria[:, i] = uso['pico_bytes'], uso['neto_bytes']
+            columnas.update(memoria_pico=bytes_memoria[0], memoria_neta=bytes_memoria[1])
+        
+        errores_rel = np.full(len(valores_n), np.nan)
+        if len(valores_n) > 1:
+            previas, actuales = integrales[:-1], integrales[1:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                errores_rel[1:] = np.where(actuales == 0, np.inf,
+                                           np.abs(previas - actuales) / np.abs(actuales) * 100)
         
+        resultados.extender(
+            n=valores_n,
+            integrales=integrales,
+            errores_relativo=errores_rel,
+            errores_absoluto=np.abs(integrales - exact),
+            **columnas
+        )
         return resultados
     
-    def analizar_convergencia_simpson(self, valores_n):
+    @_emitir_metricas('convergencia_trapecio', lambda n, mode: n + 1)
+    def analizar_convergencia_trapecio(self, valores_n, medir=False, memoria=False,
+                                        detener=False, tolerancia=None):
         """
-        Analizar convergencia de la Regla de Simpson 1/3 para múltiples valores de n.
+        Analizar convergencia de la Regla del Trapecio para múltiples valores de n.
         
         Parámetros:
         -----------
         valores_n : list
             Lista de valores de n a probar
+        medir : bool
+            Si es True, añade tiempos (mediana), tiempos_min y tiempos_p95 en ms
+        memoria : bool
+            Si es True, añade memoria_pico y memoria_neta en bytes (tracemalloc)
+        detener : bool
+            Si es True, detiene el barrido al converger (ver CriterioParada)
+        tolerancia : float, opcional
+            Error absoluto con el que se detiene el barrido (con detener=True)
             
         Retorna:
         --------
-        dict
-            Resultados con claves: n, integrales, errores_relativo, errores_absoluto
+        AlmacenResultados
+            Vista tipo dict con claves: n, integrales, errores_relativo, errores_absoluto
         """
-        resultados = {
-            'n': [],
-            'integrales': [],
-            'errores_relativo': [],
-            'errores_absoluto': []
-        }
-        
-        exact = self.integral_exacta()
-        prev_integral = None
+        return self._analizar_convergencia(lambda n: self.trapecio(n), valores_n,
+                                          medir=medir, memoria=memoria,
+                                          detener=detener, tolerancia=tolerancia)
+    
+    @_emitir_metricas('convergencia_simpson', lambda n, mode: n + n % 2 + 1)
+    def analizar_convergencia_simpson(self, valores_n, medir=False, memoria=False,
+                                       detener=False, tolerancia=None):
+        """
+        Analizar convergencia de la Regla de Simpson 1/3 para múltiples valores de n.
         
-        for n in valores_n:
-            integral = self.simpson(n)
-            error_abs = abs(integral - exact)
-            
-            resultados['n'].append(n)
-            resultados['integrales'].append(integral)
-            resultados['errores_absoluto'].append(error_abs)
-            
-            if prev_integral is not None:
-                error_rel = self.calcular_error_relativo(prev_integral, integral)
-                resultados['errores_relativo'].append(error_rel)
-            else:
-                resultados['errores_relativo'].append(None)
+        Parámetros:
+        -----------
+        valores_n : list
+            Lista de valores de n a probar
+        medir : bool
+            Si es True, añade tiempos (mediana), tiempos_min y tiempos_p95 en ms
+        memoria : bool
+            Si es True, añade memoria_pico y memoria_neta en bytes (tracemalloc)
+        detener : bool
+            Si es True, detiene el barrido al converger (ver CriterioParada)
+        tolerancia : float, opcional
+            Error absoluto con el que se detiene el barrido (con detener=True)
             
-            prev_integral = integral
-        
-        return resultados
+        Retorna:
+        --------
+        AlmacenResultados
+            Vista tipo dict con claves: n, integrales, errores_relativo, errores_absoluto
+        """
+        return self._analizar_convergencia(lambda n: self.simpson(n), valores_n,
+                                          medir=medir, memoria=memoria,
+                                          detener=detener, tolerancia=tolerancia)
     
-    def analizar_convergencia_rectangulos(self, valores_n, mode='mid'):
+    @_emitir_metricas('convergencia_rectangulos', lambda n, mode: n)
+    def analizar_convergencia_rectangulos(self, valores_n, mode='mid', medir=False,
+                                          memoria=False, detener=False, tolerancia=None):
         """
         Analizar convergencia del Método de Rectángulos para múltiples valores de n.
         
@@ -296,41 +918,26 @@ class IntegracionNumerica:
             Lista de valores de n a probar
         mode : str
             Modo de evaluación: 'left', 'right', 'mid'
+        medir : bool
+            Si es True, añade tiempos (mediana), tiempos_min y tiempos_p95 en ms
+        memoria : bool
+            Si es True, añade memoria_pico y memoria_neta en bytes (tracemalloc)
+        detener : bool
+            Si es True, detiene el barrido al converger (ver CriterioParada)
+        tolerancia : float, opcional
+            Error absoluto con el que se detiene el barrido (con detener=True)
             
         Retorna:
         --------
-        dict
-            Resultados con claves: n, integrales, errores_relativo, errores_absoluto
+        AlmacenResultados
+            Vista tipo dict con claves: n, integrales, errores_relativo, errores_absoluto
         """
-        resultados = {
-            'n': [],
-            'integrales': [],
-            'errores_relativo': [],
-            'errores_absoluto': []
-        }
-        
-        exact = self.integral_exacta()
-        prev_integral = None
-        
-        for n in valores_n:
-            integral = self.rectangulos(n, mode)
-            error_abs = abs(integral - exact)
-            
-            resultados['n'].append(n)
-            resultados['integrales'].append(integral)
-            resultados['errores_absoluto'].append(error_abs)
-            
-            if prev_integral is not None:
-                error_rel = self.calcular_error_relativo(prev_integral, integral)
-                resultados['errores_relativo'].append(error_rel)
-            else:
-                resultados['errores_relativo'].append(None)
-            
-            prev_integral = integral
-        
-        return resultados
+        return self._analizar_convergencia(lambda n: self.rectangulos(n, mode), valores_n,
+                                          medir=medir, memoria=memoria,
+                                          detener=detener, tolerancia=tolerancia)
     
-    def generar_reporte(self, metodo, valores_n, mode='mid'):
+    def generar_reporte(self, metodo, valores_n, mode='mid', medir=False, memoria=False,
+                        detener=False, tolerancia=None):
         """
         Generar reporte exhaustivo de convergencia.
         
@@ -342,20 +949,31 @@ class IntegracionNumerica:
             Lista de valores de n
         mode : str
             Para 'rectangulos': 'left', 'right' o 'mid'
+        medir : bool
+            Si es True, añade tiempos (mediana), tiempos_min y tiempos_p95 en ms
+        memoria : bool
+            Si es True, añade memoria_pico y memoria_neta en bytes (tracemalloc)
+        detener : bool
+            Si es True, detiene el barrido al converger (ver CriterioParada)
+            y añade 'convergencia_observada' al reporte
+        tolerancia : float, opcional
+            Error absoluto con el que se detiene el barrido (con detener=True)
             
         Retorna:
         --------
         dict
             Resultados completos del análisis con metadatos
         """
+        parada = {'detener': detener, 'tolerancia': tolerancia}
         if metodo.lower() == 'trapecio':
-            datos = self.analizar_convergencia_trapecio(valores_n)
+            datos = self.analizar_convergencia_trapecio(valores_n, medir, memoria, **parada)
             orden = 2
         elif metodo.lower() == 'simpson':
-            datos = self.analizar_convergencia_simpson(valores_n)
+            datos = self.analizar_convergencia_simpson(valores_n, medir, memoria, **parada)
             orden = 4
         elif metodo.lower() == 'rectangulos':
-            datos = self.analizar_convergencia_rectangulos(valores_n, mode)
+            datos = self.analizar_convergencia_rectangulos(valores_n, mode, medir, memoria,
+                                                           **parada)
             orden = 2 if mode == 'mid' else 1
         else:
             raise ValueError("Metodo debe ser 'trapecio', 'simpson' o 'rectangulos'")
@@ -368,15 +986,43 @@ class IntegracionNumerica:
             'integral_exacta': exact,
             'datos': datos,
             'intervalo': (self.a, self.b),
-            'funcion': 'E(N) = 0.0842*N^4 - 1.2156*N^3 + 6.8934*N^2 - 12.456*N + 11.234'
+            'funcion': self.descripcion_funcion()
         }
         
         if metodo.lower() == 'rectangulos':
             reporte['mode'] = mode
+        if detener:
+            reporte['convergencia_observada'] = datos.metadatos['convergencia']
         
         return reporte
 
 
+def verificar_parada(tolerancias=(1e-3, 1e-6, 1e-9)):
+    """
+    Comprobar que la parada con tolerancia se detiene donde el error ya la cumple.
+    
+    Barre n = 2, 4, ..., 2**19 con cada método y tolerancia: el motivo debe ser
+    'tolerancia' y el último error absoluto no debe superarla.
+    
+    Retorna:
+    --------
+    list
+        Fallos como tuplas (metodo, tolerancia, motivo, error); vacía si todo cumple
+    """
+    integ = IntegracionNumerica()
+    valores_n = [2**k for k in range(1, 20)]
+    fallos = []
+    for metodo in ('trapecio', 'simpson', 'rectangulos'):
+        for tolerancia in tolerancias:
+            reporte = integ.generar_reporte(metodo, valores_n, detener=True,
+                                            tolerancia=tolerancia)
+            motivo = reporte['convergencia_observada']['motivo']
+            error = float(reporte['datos']['errores_absoluto'][-1])
+            if motivo != 'tolerancia' or error > tolerancia:
+                fallos.append((metodo, tolerancia, motivo, error))
+    return fallos
+
+
 if __name__ == '__main__':
     # Ejemplo de uso
     integ = IntegracionNumerica()
@@ -387,3 +1033,8 @@ if __name__ == '__main__':
     print("Rectángulos Mid (n=100):", integ.rectangulos(100, 'mid'))
     print("Rectángulos Left (n=100):", integ.rectangulos(100, 'left'))
     print("Rectángulos Right (n=100):", integ.rectangulos(100, 'right'))
+    
+    fallos = verificar_parada()
+    print("\nParada con tolerancia:", "OK" if not fallos else f"{len(fallos)} fallos")
+    for metodo, tolerancia, motivo, error in fallos:
+        print(f"  {metodo:<12} tolerancia={tolerancia:.0e} motivo={motivo} error={error:.3e}")
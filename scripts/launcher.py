@@ -5,12 +5,18 @@ Lanzador interactivo para métodos de integración numérica.
 Proporciona interfaz unificada para ejecutar Regla del Trapecio, Regla de Simpson o Integración Analítica.
 
 Uso:
-    python launcher.py
+    python launcher.py [--perfilar] [--cprofile]
+
+    --perfilar   Perfilado por etapas (compute, draw, layout, savefig-png, savefig-pdf)
+    --cprofile   Además, cProfile con pilas colapsadas para flamegraph (ver perfilado.py)
 """
 
 import sys
 import os
 
+import perfilado
+from perfilado import etapa, seccion
+
 # Paleta de colores profesional
 COLOR_PRINCIPAL = '#1F4788'    # Azul oscuro profesional
 COLOR_SECUNDARIO = '#8B3A62'   # Púrpura profesional
@@ -71,10 +77,11 @@ def ejecutar_comparativa_modelos():
     comp_main()
 
 
+@seccion('launcher.ejecutar_comparacion')
 def ejecutar_comparacion():
     """Ejecutar comparación de todos los métodos."""
     from integrales_numericas import IntegracionNumerica
-    import numpy as np
+    from newton_cotes import ETIQUETAS, MotorNewtonCotes
     
     print("=" * 70)
     print("COMPARACIÓN EXHAUSTIVA DE MÉTODOS")
@@ -97,55 +104,44 @@ def ejecutar_comparacion():
         except ValueError:
             print("Error: Entrada no válida")
     
-    # Computar aproximaciones
-    rect_left = integ.rectangulos(n, 'left')
-    rect_mid = integ.rectangulos(n, 'mid')
-    rect_right = integ.rectangulos(n, 'right')
-    trap = integ.trapecio(n)
-    simp = integ.simpson(n)
+    # Computar aproximaciones: una sola evaluación de E(N) en la semi-malla de 2n+1 puntos
+    with etapa('compute'):
+        motor = MotorNewtonCotes(n, integ.a, integ.b)
+        reglas = motor.integrar(integ.funcion_energia)
     
     # Computar errores
-    error_rect_left_abs = abs(rect_left - integral_exacta)
-    error_rect_mid_abs = abs(rect_mid - integral_exacta)
-    error_rect_right_abs = abs(rect_right - integral_exacta)
-    error_trap_abs = abs(trap - integral_exacta)
-    error_simp_abs = abs(simp - integral_exacta)
-    
-    error_rect_left_rel = (error_rect_left_abs / integral_exacta) * 100
-    error_rect_mid_rel = (error_rect_mid_abs / integral_exacta) * 100
-    error_rect_right_rel = (error_rect_right_abs / integral_exacta) * 100
-    error_trap_rel = (error_trap_abs / integral_exacta) * 100
-    error_simp_rel = (error_simp_abs / integral_exacta) * 100
+    errores_abs = {regla: abs(valor - integral_exacta) for regla, valor in reglas.items()}
+    errores_rel = {regla: (error / integral_exacta) * 100 for regla, error in errores_abs.items()}
     
     # Tabla de resultados
     print("\n" + "=" * 80)
-    print("RESULTADOS PARA n = {}".format(n))
+    print("RESULTADOS PARA n = {} ({} evaluaciones de E(N))".format(n, motor.evaluaciones))
     print("=" * 80)
-    print("\n{:<25} | {:<15} | {:<15} | {:<15}".format(
-        "Método", "Aproximación", "Error Abs.", "Error Rel. %"))
+    print("\n{:<22} | {:>7} | {:<15} | {:<12} | {:<12}".format(
+        "Método", "Subint.", "Aproximación", "Error Abs.", "Error Rel. %"))
     print("-" * 80)
-    print("{:<25} | {:<15.8f} | {:<15.2e} | {:<15.6f}".format(
-        "Exacta (Antiderivada)", integral_exacta, 0, 0))
-    print("{:<25} | {:<15.8f} | {:<15.2e} | {:<15.6f}".format(
-        "Rectángulos (left)", rect_left, error_rect_left_abs, error_rect_left_rel))
-    print("{:<25} | {:<15.8f} | {:<15.2e} | {:<15.6f}".format(
-        "Rectángulos (mid)", rect_mid, error_rect_mid_abs, error_rect_mid_rel))
-    print("{:<25} | {:<15.8f} | {:<15.2e} | {:<15.6f}".format(
-        "Rectángulos (right)", rect_right, error_rect_right_abs, error_rect_right_rel))
-    print("{:<25} | {:<15.8f} | {:<15.2e} | {:<15.6f}".format(
-        "Trapecio O(h^2)", trap, error_trap_abs, error_trap_rel))
-    print("{:<25} | {:<15.8f} | {:<15.2e} | {:<15.6f}".format(
-        "Simpson O(h^4)", simp, error_simp_abs, error_simp_rel))
+    print("{:<22} | {:>7} | {:<15.8f} | {:<12.2e} | {:<12.6f}".format(
+        "Exacta (Antiderivada)", "-", integral_exacta, 0, 0))
+    for regla in motor.reglas:
+        print("{:<22} | {:>7} | {:<15.8f} | {:<12.2e} | {:<12.6f}".format(
+            ETIQUETAS[regla], motor.subintervalos[regla], reglas[regla],
+            errores_abs[regla], errores_rel[regla]))
+    semi_malla = [ETIQUETAS[r] for r in motor.reglas if motor.subintervalos[r] != n]
+    if semi_malla:
+        verbo = 'se aplica' if len(semi_malla) == 1 else 'se aplican'
+        print(f"\n{', '.join(semi_malla)}: n={n} no es múltiplo de los paneles; "
+              f"{verbo} sobre la semi-malla ({2 * n} subintervalos, paso h/2)")
     
     # Análisis
     print("\n" + "-" * 80)
     print("ANÁLISIS")
     print("-" * 80)
     
-    print(f"\nMejor método de rectángulos: mid (error: {error_rect_mid_rel:.4f}%)")
-    print(f"Simpson es el más preciso (error: {error_simp_rel:.6f}%)")
+    mas_preciso = min(errores_rel, key=errores_rel.get)
+    print(f"\nMejor método de rectángulos: mid (error: {errores_rel['rectangulos_mid']:.4f}%)")
+    print(f"{ETIQUETAS[mas_preciso]} es el más preciso (error: {errores_rel[mas_preciso]:.6f}%)")
     
-    if error_rect_mid_rel < 1:
+    if errores_rel['rectangulos_mid'] < 1:
         print(f"\nRectángulos (mid) alcanza alta precisión con n={n}")
     
     print("\n" + "=" * 80)
@@ -153,6 +149,9 @@ def ejecutar_comparacion():
 
 def main():
     """Bucle de ejecución principal."""
+    if '--perfilar' in sys.argv or '--cprofile' in sys.argv:
+        perfilado.activar(cprofile='--cprofile' in sys.argv)
+    
     while True:
         mostrar_menu()
         
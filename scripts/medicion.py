@@ -0,0 +1,169 @@
+"""
+medicion.py
+===========
+Arnés de medición de tiempos con estadísticas (reemplaza mediciones únicas con time.time()).
+
+- Reloj perf_counter_ns (resolución de nanosegundos)
+- Llamadas de calentamiento antes de medir
+- Lotes adaptativos: funciones de menos de ~10 µs se agrupan en lotes para que cada
+  muestra quede muy por encima de la resolución y del costo del propio reloj
+- Número de repeticiones adaptativo según un presupuesto de tiempo
+- Estadísticas min / mediana / p95 / media por llamada
+- Memoria pico y neta por llamada con tracemalloc (NumPy registra sus buffers en él)
+
+Uso:
+    from medicion import medir_tiempo, medir_memoria
+    resultado, stats = medir_tiempo(lambda: integ.simpson(1000))
+    print(stats['mediana_ms'])
+    resultado, memoria = medir_memoria(lambda: integ.simpson(10**6))
+    print(memoria['pico_bytes'])
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+
+# Duración mínima de una muestra: por debajo se agrupan llamadas en lotes
+MUESTRA_MINIMA_NS = 10_000
+
+# Presupuesto por defecto para cada medición y límites de repeticiones
+TIEMPO_OBJETIVO_S = 0.2
+MIN_REPETICIONES = 5
+MAX_REPETICIONES = 10_000
+
+
+def estadisticas_tiempo(muestras_ns):
+    """
+    Resumir muestras de tiempo (ns por llamada) en milisegundos.
+
+    Parámetros:
+    -----------
+    muestras_ns : array
+        Tiempos por llamada en nanosegundos
+
+    Retorna:
+    --------
+    dict
+        min_ms, mediana_ms, p95_ms, media_ms, desviacion_ms, repeticiones
+    """
+    ms = np.asarray(muestras_ns, dtype=np.float64) / 1e6
+    return {
+        'min_ms': float(ms.min()),
+        'mediana_ms': float(np.median(ms)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'media_ms': float(ms.mean()),
+        'desviacion_ms': float(ms.std(ddof=1)) if ms.size > 1 else 0.0,
+        'repeticiones': int(ms.size)
+    }
+
+
+def medir_tiempo(funcion, calentamiento=2, tiempo_objetivo=TIEMPO_OBJETIVO_S,
+                 min_repeticiones=MIN_REPETICIONES, max_repeticiones=MAX_REPETICIONES):
+    """
+    Medir una función sin argumentos con calentamiento, lotes y repeticiones adaptativas.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función a medir (sin argumentos)
+    calentamiento : int
+        Llamadas previas no medidas (cachés, asignaciones iniciales)
+    tiempo_objetivo : float
+        Presupuesto aproximado de medición en segundos
+    min_repeticiones : int
+        Mínimo de muestras aunque se supere el presupuesto
+    max_repeticiones : int
+        Máximo de muestras
+
+    Retorna:
+    --------
+    tuple : (resultado, estadisticas)
+        resultado : valor retornado por la última llamada
+        estadisticas : dict de estadisticas_tiempo() más 'lote' (llamadas por muestra)
+    """
+    resultado = None
+    t0 = time.perf_counter_ns()
+    for _ in range(max(calentamiento, 1)):
+        resultado = funcion()
+    costo_ns = max((time.perf_counter_ns() - t0) / max(calentamiento, 1), 1)
+
+    # Lote adaptativo para funciones muy rápidas
+    lote = max(1, int(np.ceil(MUESTRA_MINIMA_NS / costo_ns)))
+
+    objetivo_ns = tiempo_objetivo * 1e9
+    muestras = []
+    inicio = time.perf_counter_ns()
+    while len(muestras) < max_repeticiones:
+        t0 = time.perf_counter_ns()
+        for _ in range(lote):
+            resultado = funcion()
+        muestras.append((time.perf_counter_ns() - t0) / lote)
+        if (len(muestras) >= min_repeticiones and
+                time.perf_counter_ns() - inicio >= objetivo_ns):
+            break
+
+    estadisticas = estadisticas_tiempo(muestras)
+    estadisticas['lote'] = lote
+    return resultado, estadisticas
+
+
+def medir_memoria(funcion):
+    """
+    Medir la memoria asignada por una llamada con tracemalloc.
+
+    Se mide en una llamada aparte de las de tiempo: con tracemalloc activo cada
+    asignación es más lenta. Si tracemalloc ya estaba activo se reinicia su pico.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función a medir (sin argumentos)
+
+    Retorna:
+    --------
+    tuple : (resultado, memoria)
+        resultado : valor retornado por la llamada
+        memoria : dict con pico_bytes (máximo asignado durante la llamada por encima
+            del nivel inicial) y neto_bytes (lo que sigue asignado al terminar)
+    """
+    iniciado = not tracemalloc.is_tracing()
+    if iniciado:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    antes, _ = tracemalloc.get_traced_memory()
+    try:
+        resultado = funcion()
+    finally:
+        despues, pico = tracemalloc.get_traced_memory()
+        if iniciado:
+            tracemalloc.stop()
+    return resultado, {'pico_bytes': max(pico - antes, 0), 'neto_bytes': despues - antes}
+
+
+def graficar_tiempos(ax, reporte, color, etiqueta='Tiempo (mediana)'):
+    """
+    Dibujar en `ax` la mediana del tiempo por n con banda min - p95 (escala log-log).
+
+    Parámetros:
+    -----------
+    ax : matplotlib.axes.Axes
+        Eje destino
+    reporte : dict o AlmacenResultados
+        Debe tener claves n, tiempos, tiempos_min, tiempos_p95 (ms)
+    color : str
+        Color de la serie
+    etiqueta : str
+        Etiqueta de la leyenda
+    """
+    n = np.asarray(reporte['n'])
+    mediana = np.asarray(reporte['tiempos'])
+    ax.fill_between(n, reporte['tiempos_min'], reporte['tiempos_p95'],
+                    color=color, alpha=0.2, label='Rango min - p95')
+    ax.loglog(n, mediana, 'o-', linewidth=2, markersize=8, color=color, label=etiqueta)
+    ax.set_xlabel('Número de intervalos (n)', fontsize=11, fontweight='bold')
+    ax.set_ylabel('Tiempo por llamada (ms)', fontsize=11, fontweight='bold')
+    ax.set_title('Costo de Cómputo (Log-Log)', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.25, linestyle=':', which='both')
+    ax.legend(fontsize=10)
@@ -0,0 +1,277 @@
+"""
+metricas.py
+===========
+Emisión de métricas estructuradas por cada llamada de integración.
+
+Cada llamada instrumentada (trapecio, simpson, rectangulos, integral_exacta y los
+analizadores de convergencia de IntegracionNumerica) produce un registro con:
+
+    metodo, mode, n, evaluaciones, tiempo_s, error_absoluto, error_relativo (%),
+    cache_hit, valor, marca_tiempo
+
+Destinos:
+- JSON lines: un registro por línea, añadido al final del archivo
+- Prometheus (formato de texto, colector 'textfile' de node_exporter): contadores y
+  últimos errores agregados por (metodo, mode); el archivo se reescribe de forma atómica
+
+El recolector acumula en memoria y escribe por lotes: al llenarse el búfer, cuando
+pasan `intervalo_s` segundos desde la última escritura (así un proceso de larga
+duración como servidor_integracion.py actualiza el archivo .prom mientras corre), al
+llamar a vaciar() y al salir del intérprete. Desactivado, cada llamada instrumentada
+solo comprueba que no hay recolector. Es seguro entre hilos: los registros llegan del
+modo paralelo, del integrador asíncrono y de los hilos del servidor.
+
+Dentro de `with suprimido():` el hilo actual no emite (recolector_activo() es None);
+lo usan los barridos y los cálculos internos cuyo registro ya emite quien los llama.
+
+Activación:
+    METRICAS_DESTINO=metricas.jsonl python trapecio.py 100
+    METRICAS_DESTINO=/var/lib/node_exporter/integracion.prom python launcher.py
+
+    import metricas
+    metricas.activar('metricas.jsonl')
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+
+FORMATOS = ('jsonl', 'prometheus')
+
+# Registros acumulados antes de escribir a disco
+TAM_BUFFER = 1000
+
+# Segundos máximos entre escrituras mientras llegan registros
+INTERVALO_S = 10.0
+
+# Prefijo de los nombres de métrica en formato Prometheus
+PREFIJO_PROMETHEUS = 'integracion'
+
+_recolector = None
+
+# Estado por hilo: True dentro de suprimido()
+_supresion = threading.local()
+
+
+class RecolectorMetricas:
+    """
+    Recolector con búfer que escribe registros en JSON lines o formato Prometheus.
+    """
+
+    def __init__(self, destino, formato=None, tam_buffer=TAM_BUFFER, intervalo_s=INTERVALO_S):
+        """
+        Parámetros:
+        -----------
+        destino : str
+            Archivo de salida
+        formato : str, opcional
+            'jsonl' o 'prometheus'. Si es None se deduce de la extensión (.prom -> prometheus)
+        tam_buffer : int
+            Registros acumulados antes de escribir (solo jsonl)
+        intervalo_s : float
+            Segundos máximos entre escrituras mientras llegan registros (el primer
+            registro se escribe de inmediato)
+        """
+        if formato is None:
+            formato = 'prometheus' if destino.endswith('.prom') else 'jsonl'
+        if formato not in FORMATOS:
+            raise ValueError("formato debe ser 'jsonl' o 'prometheus'")
+        if tam_buffer < 1:
+            raise ValueError("tam_buffer debe ser al menos 1")
+        if intervalo_s < 0:
+            raise ValueError("intervalo_s no puede ser negativo")
+
+        self.destino = destino
+        self.formato = formato
+        self.tam_buffer = tam_buffer
+        self.intervalo_s = intervalo_s
+        self._ultima_escritura = float('-inf')
+        self._buffer = []
+        # (metodo, mode) -> acumuladores para Prometheus
+        self._agregados = defaultdict(lambda: {
+            'llamadas': 0, 'tiempo_s': 0.0, 'evaluaciones': 0, 'cache_hits': 0,
+            'error_absoluto': float('nan'), 'error_relativo': float('nan'), 'n': 0
+        })
+        self._pendiente = False
+        # _cerrojo protege búfer y agregados; _cerrojo_escritura serializa las escrituras
+        # para que un volcado anterior no sobrescriba a uno posterior
+        self._cerrojo = threading.Lock()
+        self._cerrojo_escritura = threading.Lock()
+
+    def registrar(self, metodo, n, evaluaciones, tiempo_s, error_absoluto=None,
+                  error_relativo=None, mode=None, cache_hit=False, valor=None):
+        """
+        Añadir un registro al búfer.
+        """
+        n = int(n)
+        evaluaciones = int(evaluaciones)
+        tiempo_s = float(tiempo_s)
+        error_absoluto = None if error_absoluto is None else float(error_absoluto)
+        error_relativo = None if error_relativo is None else float(error_relativo)
+        valor = None if valor is None else float(valor)
+        if self.formato == 'jsonl':
+            registro = {
+                'marca_tiempo': time.time(),
+                'metodo': metodo,
+                'mode': mode,
+                'n': n,
+                'evaluaciones': evaluaciones,
+                'tiempo_s': tiempo_s,
+                'error_absoluto': error_absoluto,
+                'error_relativo': error_relativo,
+                'cache_hit': cache_hit,
+                'valor': valor
+            }
+            with self._cerrojo:
+                self._buffer.append(registro)
+                lleno = len(self._buffer) >= self.tam_buffer
+            if lleno or self._vencido():
+                self.vaciar()
+            return
+
+        with self._cerrojo:
+            agregado = self._agregados[(metodo, mode or '')]
+            agregado['llamadas'] += 1
+            agregado['tiempo_s'] += tiempo_s
+            agregado['evaluaciones'] += evaluaciones
+            agregado['cache_hits'] += bool(cache_hit)
+            agregado['n'] = n
+            if error_absoluto is not None:
+                agregado['error_absoluto'] = error_absoluto
+            if error_relativo is not None:
+                agregado['error_relativo'] = error_relativo
+            self._pendiente = True
+        if self._vencido():
+            self.vaciar()
+
+    def _vencido(self):
+        """True si pasaron intervalo_s segundos desde la última escritura."""
+        return time.monotonic() - self._ultima_escritura >= self.intervalo_s
+
+    def vaciar(self):
+        """
+        Escribir lo acumulado en el destino.
+
+        El búfer (o una instantánea de los agregados) se toma bajo el cerrojo y se
+        escribe fuera de él: los registros que lleguen durante la escritura quedan
+        para el siguiente volcado.
+        """
+        with self._cerrojo_escritura:
+            self._ultima_escritura = time.monotonic()
+            if self.formato == 'jsonl':
+                with self._cerrojo:
+                    registros, self._buffer = self._buffer, []
+                if not registros:
+                    return
+                with open(self.destino, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in registros)
+                return
+
+            with self._cerrojo:
+                if not self._pendiente:
+                    return
+                texto = formatear_prometheus(self._agregados)
+                self._pendiente = False
+            # Escritura atómica: el scraper nunca ve un archivo a medio escribir
+            directorio = os.path.dirname(os.path.abspath(self.destino))
+            fd, temporal = tempfile.mkstemp(dir=directorio, prefix='.metricas_', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(texto)
+            os.replace(temporal, self.destino)
+
+
+def _etiquetas(metodo, mode):
+    etiquetas = f'metodo="{metodo}"'
+    if mode:
+        etiquetas += f',mode="{mode}"'
+    return '{' + etiquetas + '}'
+
+
+def formatear_prometheus(agregados):
+    """
+    Formato de texto de Prometheus para los agregados por (metodo, mode).
+
+    Retorna:
+    --------
+    str
+        Texto con bloques HELP/TYPE y una muestra por serie
+    """
+    definiciones = [
+        ('llamadas_total', 'counter', 'Llamadas de integración', 'llamadas'),
+        ('duracion_segundos_total', 'counter', 'Tiempo de pared acumulado', 'tiempo_s'),
+        ('evaluaciones_total', 'counter', 'Evaluaciones de la función acumuladas', 'evaluaciones'),
+        ('cache_hits_total', 'counter', 'Llamadas servidas desde caché', 'cache_hits'),
+        ('ultimo_n', 'gauge', 'n de la última llamada', 'n'),
+        ('error_absoluto', 'gauge', 'Error absoluto de la última llamada', 'error_absoluto'),
+        ('error_relativo_porcentaje', 'gauge', 'Error relativo (%) de la última llamada',
+         'error_relativo'),
+    ]
+    lineas = []
+    for sufijo, tipo, ayuda, clave in definiciones:
+        nombre = f'{PREFIJO_PROMETHEUS}_{sufijo}'
+        lineas.append(f'# HELP {nombre} {ayuda}')
+        lineas.append(f'# TYPE {nombre} {tipo}')
+        for (metodo, mode), agregado in sorted(agregados.items()):
+            valor = agregado[clave]
+            if valor != valor:
+                continue  # NaN: sin dato todavía
+            lineas.append(f'{nombre}{_etiquetas(metodo, mode)} {valor!r}')
+    return '\n'.join(lineas) + '\n'
+
+
+def activar(destino, formato=None, tam_buffer=TAM_BUFFER, intervalo_s=INTERVALO_S):
+    """
+    Activar la emisión de métricas global.
+
+    Retorna:
+    --------
+    RecolectorMetricas
+    """
+    global _recolector
+    desactivar()
+    _recolector = RecolectorMetricas(destino, formato, tam_buffer, intervalo_s)
+    return _recolector
+
+
+def desactivar():
+    """Vaciar y desactivar el recolector global."""
+    global _recolector
+    if _recolector is not None:
+        _recolector.vaciar()
+    _recolector = None
+
+
+def recolector_activo():
+    """Recolector global, o None si las métricas están desactivadas o suprimidas."""
+    if _recolector is None or getattr(_supresion, 'activa', False):
+        return None
+    return _recolector
+
+
+@contextlib.contextmanager
+def suprimido():
+    """No emitir registros desde el hilo actual dentro del bloque."""
+    previa = getattr(_supresion, 'activa', False)
+    _supresion.activa = True
+    try:
+        yield
+    finally:
+        _supresion.activa = previa
+
+
+def vaciar():
+    """Escribir lo acumulado por el recolector global."""
+    if _recolector is not None:
+        _recolector.vaciar()
+
+
+atexit.register(vaciar)
+
+if os.environ.get('METRICAS_DESTINO'):
+    activar(os.environ['METRICAS_DESTINO'], os.environ.get('METRICAS_FORMATO'))
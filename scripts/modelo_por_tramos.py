@@ -0,0 +1,210 @@
+"""
+modelo_por_tramos.py
+====================
+Modelos de energía polinomiales por tramos (p. ej. splines cúbicos por puntos medidos).
+
+En el tramo i, [x_i, x_{i+1}], el modelo es un polinomio en la variable local
+t = N - x_i:
+
+    E(N) = c_i0 t^k + c_i1 t^(k-1) + ... + c_ik
+
+Los nodos (m+1) y los coeficientes (m x (k+1)) se guardan en arreglos contiguos. El
+tramo de cada punto se ubica con np.searchsorted (O(log m)) y la evaluación es Horner
+vectorizado. La integral exacta usa una tabla de antiderivada acumulada en los nodos:
+
+    P(N) = P(x_i) + ∫[x_i, N] E = P(x_i) + Q_i(t),   ∫[a, b] E = P(b) - P(a)
+
+Fuera de [x_0, x_m] se extrapola con el primer o último tramo.
+
+Un ModeloPorTramos se pasa a IntegracionNumerica(modelo=...) y todos los métodos
+(trapecio, simpson, rectangulos, integral_exacta, reportes) lo usan.
+
+Uso:
+    python modelo_por_tramos.py [número_de_tramos]
+"""
+
+import sys
+import time
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+from integrales_numericas import IntegracionNumerica
+from rectangulos import MODELOS_AI
+
+
+class ModeloPorTramos:
+    """
+    Polinomio por tramos con evaluación vectorizada e integración exacta.
+    """
+
+    def __init__(self, nodos, coeficientes):
+        """
+        Parámetros:
+        -----------
+        nodos : array
+            m+1 nodos estrictamente crecientes
+        coeficientes : array
+            Matriz m x (k+1): coeficientes de cada tramo en la variable local
+            t = N - nodos[i], en orden descendente de grado (como np.polyval)
+        """
+        nodos = np.ascontiguousarray(nodos, dtype=np.float64)
+        coeficientes = np.ascontiguousarray(np.atleast_2d(coeficientes), dtype=np.float64)
+        if nodos.ndim != 1 or nodos.size < 2 or np.any(np.diff(nodos) <= 0):
+            raise ValueError("nodos debe ser estrictamente creciente con al menos 2 puntos")
+        if coeficientes.shape[0] != nodos.size - 1:
+            raise ValueError("coeficientes debe tener una fila por tramo (len(nodos) - 1)")
+
+        self.nodos = nodos
+        self.coeficientes = coeficientes
+        grado = coeficientes.shape[1] - 1
+
+        # Antiderivada local Q_i(t) = ∫[0, t] p_i (grado k+1, término constante 0)
+        divisores = np.arange(grado + 1, 0, -1, dtype=np.float64)
+        self.coeficientes_integral = np.ascontiguousarray(
+            np.hstack([coeficientes / divisores, np.zeros((coeficientes.shape[0], 1))]))
+        anchos = np.diff(nodos)
+        integrales_tramo = self._horner(self.coeficientes_integral, anchos)
+        self.acumulada_nodos = np.concatenate([[0.0], np.cumsum(integrales_tramo)])
+
+    @classmethod
+    def desde_spline(cls, x, y, condicion='natural'):
+        """
+        Spline cúbico interpolante por los puntos (x, y).
+
+        Parámetros:
+        -----------
+        x, y : array
+            Puntos medidos (x estrictamente creciente)
+        condicion : str
+            Condición de frontera de scipy.interpolate.CubicSpline ('natural',
+            'not-a-knot', 'clamped')
+        """
+        spline = CubicSpline(x, y, bc_type=condicion)
+        return cls(spline.x, spline.c.T)
+
+    @classmethod
+    def desde_polinomio(cls, coeficientes=None, a=1.1, b=8.0):
+        """
+        Un solo tramo [a, b] con un polinomio global (default: E(N) del proyecto).
+        """
+        if coeficientes is None:
+            coeficientes = IntegracionNumerica.COEFICIENTES_ENERGIA
+        # p(N) = p(t + a): composición con el polinomio t + a
+        local = np.poly1d(coeficientes)(np.poly1d([1.0, a])).coeffs
+        local = np.concatenate([np.zeros(len(coeficientes) - local.size), local])
+        return cls([a, b], local[np.newaxis, :])
+
+    @property
+    def num_tramos(self):
+        return self.nodos.size - 1
+
+    @property
+    def grado(self):
+        return self.coeficientes.shape[1] - 1
+
+    def __repr__(self):
+        return (f"ModeloPorTramos(tramos={self.num_tramos}, grado={self.grado}, "
+                f"intervalo=[{self.nodos[0]:g}, {self.nodos[-1]:g}])")
+
+    @staticmethod
+    def _horner(filas, t):
+        resultado = filas[..., 0].copy()
+        for j in range(1, filas.shape[-1]):
+            resultado *= t
+            resultado += filas[..., j]
+        return resultado
+
+    def tramo(self, x):
+        """Índice del tramo de cada punto (búsqueda binaria, extremos extrapolados)."""
+        indices = np.searchsorted(self.nodos, x, side='right') - 1
+        return np.clip(indices, 0, self.num_tramos - 1)
+
+    def __call__(self, x):
+        """
+        Evaluar E(N) (escalar o array).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        i = self.tramo(x)
+        resultado = self._horner(self.coeficientes[i], x - self.nodos[i])
+        return resultado if resultado.ndim else float(resultado)
+
+    def antiderivada(self, x):
+        """
+        P(N) = ∫[x_0, N] E(N') dN' (escalar o array).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        i = self.tramo(x)
+        resultado = self.acumulada_nodos[i] + self._horner(self.coeficientes_integral[i],
+                                                           x - self.nodos[i])
+        return resultado if resultado.ndim else float(resultado)
+
+    def integral(self, a, b):
+        """
+        ∫[a, b] E exacta, para escalares o arrays (broadcasting).
+        """
+        return self.antiderivada(b) - self.antiderivada(a)
+
+
+def ejecutar_modelo_por_tramos(num_tramos=100_000):
+    """
+    Spline por las mediciones de MODELOS_AI integrado con todos los métodos, y costo de
+    evaluación e integración para splines con muchos tramos.
+    """
+    x = [m['parametros'] for m in MODELOS_AI]
+    y = [m['energia_exp'] for m in MODELOS_AI]
+    modelo = ModeloPorTramos.desde_spline(x, y)
+    integ = IntegracionNumerica(x[0], x[-1], modelo=modelo)
+    exacta = integ.integral_exacta()
+
+    print("=" * 70)
+    print("MODELO POR TRAMOS - SPLINE CÚBICO NATURAL POR MEDICIONES")
+    print("=" * 70)
+    print(f"\nTramos: {modelo.num_tramos}  |  Intervalo: [{x[0]}, {x[-1]}]")
+    print(f"Integral exacta del spline: {exacta:.8f} Wh·B")
+    print(f"Integral del polinomio E(N): {IntegracionNumerica(x[0], x[-1]).integral_exacta():.8f} Wh·B")
+
+    print(f"\n{'Método':<22} | {'n':>6} | {'Aproximación':>14} | {'Error Abs.':>11}")
+    print("-" * 62)
+    for n in (10, 100, 1000):
+        for etiqueta, valor in [('Rectángulos (mid)', integ.rectangulos(n, 'mid')),
+                                ('Trapecio', integ.trapecio(n)),
+                                ('Simpson', integ.simpson(n))]:
+            print(f"{etiqueta:<22} | {n:>6} | {valor:>14.8f} | {abs(valor - exacta):>11.2e}")
+
+    # Costo con muchos tramos: búsqueda binaria O(log m) por punto
+    print("\n" + "-" * 70)
+    print(f"{'Tramos':>10} | {'Eval. 1e6 pts (ms)':>18} | {'1e6 integrales (ms)':>19}")
+    print("-" * 70)
+    rng = np.random.default_rng(0)
+    puntos = rng.uniform(x[0], x[-1], 10**6)
+    extremos = np.sort(rng.uniform(x[0], x[-1], (2, 10**6)), axis=0)
+    for m in sorted({10, 1000, num_tramos}):
+        nodos = np.linspace(x[0], x[-1], m + 1)
+        grande = ModeloPorTramos.desde_spline(nodos, IntegracionNumerica.funcion_energia(nodos))
+        t0 = time.perf_counter()
+        grande(puntos)
+        t_eval = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        grande.integral(extremos[0], extremos[1])
+        t_int = time.perf_counter() - t0
+        print(f"{m:>10} | {t_eval * 1000:>18.1f} | {t_int * 1000:>19.1f}")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Punto de ejecución principal."""
+    num_tramos = 100_000
+
+    if len(sys.argv) > 1:
+        try:
+            num_tramos = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    ejecutar_modelo_por_tramos(num_tramos)
+
+
+if __name__ == '__main__':
+    main()
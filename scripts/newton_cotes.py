@@ -0,0 +1,199 @@
+"""
+newton_cotes.py
+===============
+Motor de reglas de Newton-Cotes compuestas sobre una única muestra compartida.
+
+Rectángulos (left/right), trapecio, Simpson, Simpson 3/8 y Boole usan los n+1 nodos
+x_i = a + i h; rectángulos (mid) usa los n puntos medios. Todos caben en la
+semi-malla de 2n+1 puntos u_k = a + k h/2 (nodos en k par, puntos medios en k impar):
+se evalúa f una vez en la semi-malla y cada regla es un producto escalar con un
+vector de pesos precalculado.
+
+Las reglas cerradas de m subintervalos por panel (Simpson m=2, 3/8 m=3, Boole m=4) se
+aplican sobre los nodos (paso h) si m divide a n, y si no, sobre la semi-malla completa
+(paso h/2) si m divide a 2n; si ninguna es posible, la regla no está disponible.
+MotorNewtonCotes.subintervalos indica la malla que usó cada regla (n o 2n): con n impar
+Simpson usa 2n subintervalos, no los n+1 de IntegracionNumerica.simpson(n).
+
+Uso:
+    python newton_cotes.py [n]
+"""
+
+import sys
+
+import numpy as np
+
+from integrales_numericas import IntegracionNumerica
+
+# Reglas cerradas: (subintervalos por panel, coeficientes en unidades del paso)
+PANELES = {
+    'trapecio': (1, np.array([1, 1]) / 2),
+    'simpson': (2, np.array([1, 4, 1]) / 3),
+    'simpson_3_8': (3, np.array([1, 3, 3, 1]) * 3 / 8),
+    'boole': (4, np.array([7, 32, 12, 32, 7]) * 2 / 45),
+}
+
+# Orden de las reglas en tablas y resultados
+REGLAS = ['rectangulos_left', 'rectangulos_mid', 'rectangulos_right',
+          'trapecio', 'simpson', 'simpson_3_8', 'boole']
+
+ETIQUETAS = {
+    'rectangulos_left': 'Rectángulos (left)',
+    'rectangulos_mid': 'Rectángulos (mid)',
+    'rectangulos_right': 'Rectángulos (right)',
+    'trapecio': 'Trapecio O(h^2)',
+    'simpson': 'Simpson O(h^4)',
+    'simpson_3_8': 'Simpson 3/8 O(h^4)',
+    'boole': 'Boole O(h^6)',
+}
+
+
+def pesos_compuestos(coeficientes, num_intervalos, paso):
+    """
+    Pesos de una regla cerrada compuesta en una malla uniforme.
+
+    Parámetros:
+    -----------
+    coeficientes : array
+        Coeficientes de un panel (m+1 valores) en unidades del paso
+    num_intervalos : int
+        Subintervalos de la malla (múltiplo de m)
+    paso : float
+        Separación entre puntos
+
+    Retorna:
+    --------
+    array
+        num_intervalos + 1 pesos; los extremos compartidos entre paneles se suman
+    """
+    m = len(coeficientes) - 1
+    if num_intervalos % m != 0:
+        raise ValueError(f"num_intervalos debe ser múltiplo de {m}")
+    paneles = num_intervalos // m
+    pesos = np.zeros(num_intervalos + 1)
+    for j, c in enumerate(coeficientes):
+        pesos[j:j + paneles * m:m] += c
+    return pesos * paso
+
+
+class MotorNewtonCotes:
+    """
+    Todas las reglas compuestas de un n a partir de una evaluación en la semi-malla.
+    """
+
+    def __init__(self, n, a=1.1, b=8.0):
+        """
+        Parámetros:
+        -----------
+        n : int
+            Número de subintervalos
+        a, b : float
+            Límites de integración
+        """
+        if n < 1:
+            raise ValueError("n debe ser al menos 1")
+        self.n = n
+        self.a = a
+        self.b = b
+        h = (b - a) / n
+        self.h = h
+        self.semi_malla = np.linspace(a, b, 2 * n + 1)
+
+        self.pesos = {}
+        self.paso = {}
+        # Subintervalos de la malla de cada regla: n (paso h) o 2n (paso h/2)
+        self.subintervalos = dict.fromkeys(REGLAS[:3], n)
+        nodos = np.zeros(2 * n + 1)
+        nodos[0:-1:2] = h
+        self.pesos['rectangulos_left'], self.paso['rectangulos_left'] = nodos, h
+        nodos = np.zeros(2 * n + 1)
+        nodos[2::2] = h
+        self.pesos['rectangulos_right'], self.paso['rectangulos_right'] = nodos, h
+        medios = np.zeros(2 * n + 1)
+        medios[1::2] = h
+        self.pesos['rectangulos_mid'], self.paso['rectangulos_mid'] = medios, h
+
+        for regla, (m, coeficientes) in PANELES.items():
+            w = np.zeros(2 * n + 1)
+            if n % m == 0:
+                w[::2] = pesos_compuestos(coeficientes, n, h)
+                self.paso[regla] = h
+                self.subintervalos[regla] = n
+            elif (2 * n) % m == 0:
+                w = pesos_compuestos(coeficientes, 2 * n, h / 2)
+                self.paso[regla] = h / 2
+                self.subintervalos[regla] = 2 * n
+            else:
+                continue
+            self.pesos[regla] = w
+
+        self.reglas = [r for r in REGLAS if r in self.pesos]
+        self._matriz = np.array([self.pesos[r] for r in self.reglas])
+
+    @property
+    def evaluaciones(self):
+        """Evaluaciones de f por llamada a integrar()."""
+        return self.semi_malla.size
+
+    def integrar(self, f=None):
+        """
+        Evaluar f una vez en la semi-malla y aplicar todas las reglas disponibles.
+
+        Parámetros:
+        -----------
+        f : callable, opcional
+            Integrando vectorizado (default: IntegracionNumerica.funcion_energia)
+
+        Retorna:
+        --------
+        dict
+            regla -> aproximación de la integral
+        """
+        if f is None:
+            f = IntegracionNumerica.funcion_energia
+        valores = self._matriz @ f(self.semi_malla)
+        return dict(zip(self.reglas, map(float, valores)))
+
+
+def ejecutar_newton_cotes(n=100):
+    """
+    Tabla de todas las reglas para un n con una sola evaluación de E(N).
+    """
+    integ = IntegracionNumerica()
+    exacta = integ.integral_exacta()
+    motor = MotorNewtonCotes(n, integ.a, integ.b)
+    resultados = motor.integrar(integ.funcion_energia)
+
+    print("=" * 80)
+    print(f"REGLAS DE NEWTON-COTES - n = {n}, {motor.evaluaciones} evaluaciones de E(N)")
+    print("=" * 80)
+    print(f"\n{'Regla':<22} | {'Paso':>6} | {'Aproximación':>16} | {'Error Abs.':>11} | "
+          f"{'Error Rel. %':>12}")
+    print("-" * 80)
+    for regla in REGLAS:
+        if regla not in resultados:
+            print(f"{ETIQUETAS[regla]:<22} | {'-':>6} | {'no disponible para este n':>44}")
+            continue
+        error = abs(resultados[regla] - exacta)
+        paso = 'h' if motor.paso[regla] == motor.h else 'h/2'
+        print(f"{ETIQUETAS[regla]:<22} | {paso:>6} | {resultados[regla]:>16.10f} | "
+              f"{error:>11.2e} | {error / exacta * 100:>12.8f}")
+    print("\n" + "=" * 80)
+
+
+def main():
+    """Punto de ejecución principal."""
+    n = 100
+
+    if len(sys.argv) > 1:
+        try:
+            n = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    ejecutar_newton_cotes(n)
+
+
+if __name__ == '__main__':
+    main()
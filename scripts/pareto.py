@@ -0,0 +1,344 @@
+"""
+pareto.py
+=========
+Frontera de Pareto de configuraciones de modelos: energía vs capacidad vs throughput.
+
+Objetivos por defecto:
+- Energía E(N) o energia_exp (minimizar)
+- Capacidad, medida en parámetros N (maximizar)
+- Throughput tokens_s (maximizar)
+
+Incluye un skyline 2-D O(n log n) y un filtro de dominancia k-D vectorizado,
+pensados para 10^5 - 10^6 configuraciones candidatas.
+
+Uso:
+    python pareto.py [número_de_candidatos]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from integrales_numericas import IntegracionNumerica
+from rectangulos import MODELOS_AI
+
+# Paleta de colores estandarizada - CONSISTENCIA VISUAL
+COLOR_CURVA = '#C62828'        # SIEMPRE ROJO para E(N)
+COLOR_MODELOS = '#424242'      # Gris oscuro para modelos
+COLOR_FRONTERA = '#6A1B9A'     # Púrpura para la frontera de Pareto
+COLOR_CANDIDATOS = '#90A4AE'   # Gris azulado para candidatos dominados
+
+CAMPOS_FRONTERA = ['parametros', 'energia', 'tokens_s']
+
+
+def _a_minimizacion(objetivos, maximizar):
+    """Convertir objetivos a forma 'minimizar todo' cambiando el signo donde se maximiza."""
+    objetivos = np.asarray(objetivos, dtype=np.float64)
+    if objetivos.ndim != 2:
+        raise ValueError("objetivos debe ser una matriz (n x k)")
+    signos = np.where(np.asarray(maximizar, dtype=bool), -1.0, 1.0)
+    if signos.size != objetivos.shape[1]:
+        raise ValueError("maximizar debe tener un valor por columna de objetivos")
+    return objetivos * signos
+
+
+def frontera_pareto_2d(costo, beneficio):
+    """
+    Skyline 2-D en O(n log n): minimizar costo y maximizar beneficio.
+
+    Se ordena por costo ascendente (empates: beneficio descendente) y un punto está
+    en la frontera si su beneficio supera estrictamente el máximo acumulado previo.
+
+    Parámetros:
+    -----------
+    costo : array
+        Objetivo a minimizar (n,)
+    beneficio : array
+        Objetivo a maximizar (n,)
+
+    Retorna:
+    --------
+    array
+        Índices de los puntos no dominados, ordenados por costo ascendente
+    """
+    costo = np.asarray(costo, dtype=np.float64)
+    beneficio = np.asarray(beneficio, dtype=np.float64)
+    if costo.shape != beneficio.shape or costo.ndim != 1:
+        raise ValueError("costo y beneficio deben ser vectores de igual longitud")
+    if costo.size == 0:
+        return np.empty(0, dtype=np.intp)
+
+    orden = np.lexsort((-beneficio, costo))
+    c = costo[orden]
+    b = beneficio[orden]
+    max_previo = np.empty_like(b)
+    max_previo[0] = -np.inf
+    np.maximum.accumulate(b[:-1], out=max_previo[1:])
+
+    # Puntos idénticos no se dominan entre sí: heredan el estado del primero del grupo
+    nuevo_grupo = np.r_[True, (c[1:] != c[:-1]) | (b[1:] != b[:-1])]
+    grupo = np.cumsum(nuevo_grupo) - 1
+    en_frontera = (b > max_previo)[nuevo_grupo][grupo]
+    return orden[en_frontera]
+
+
+def frontera_pareto(objetivos, maximizar=None):
+    """
+    Filtro de dominancia k-D (no dominados) vectorizado.
+
+    Los candidatos se ordenan por la suma de objetivos normalizados, de modo que los
+    primeros suelen dominar a muchos otros; cada punto no dominado elimina de una
+    vez todos los que domina y el conjunto vivo se compacta. El bucle recorre solo
+    la frontera, no los n candidatos.
+    Para k=2 se delega en el skyline O(n log n).
+
+    Parámetros:
+    -----------
+    objetivos : array
+        Matriz (n x k) de objetivos
+    maximizar : list de bool, opcional
+        Para cada columna, True si se maximiza (default: minimizar todas)
+
+    Retorna:
+    --------
+    array
+        Índices (ordenados) de los puntos no dominados
+    """
+    objetivos = np.asarray(objetivos, dtype=np.float64)
+    if maximizar is None:
+        maximizar = [False] * objetivos.shape[1]
+    F = _a_minimizacion(objetivos, maximizar)
+    n, k = F.shape
+
+    if k == 2:
+        return np.sort(frontera_pareto_2d(F[:, 0], -F[:, 1]))
+
+    # Orden por suma normalizada: un punto nunca es dominado por otro posterior
+    rango = np.ptp(F, axis=0)
+    rango[rango == 0] = 1.0
+    orden = np.argsort(((F - F.min(axis=0)) / rango).sum(axis=1), kind='stable')
+    F = F[orden]
+
+    # Columnas contiguas: comparar columna a columna es mucho más rápido que
+    # reducir con np.all(axis=1) sobre filas de longitud k
+    columnas = [np.ascontiguousarray(F[:, j]) for j in range(k)]
+    frontera = []
+    while len(orden):
+        # El primer candidato vivo nunca es dominado por los restantes
+        frontera.append(orden[0])
+        p = [col[0] for col in columnas]
+        menor_igual = p[0] <= columnas[0]
+        menor = p[0] < columnas[0]
+        for pj, col in zip(p[1:], columnas[1:]):
+            menor_igual &= pj <= col
+            menor |= pj < col
+        mantener = ~(menor_igual & menor)
+        mantener[0] = False
+        # Compactar: cada iteración trabaja solo sobre los candidatos aún vivos
+        columnas = [col[mantener] for col in columnas]
+        orden = orden[mantener]
+
+    return np.sort(np.asarray(frontera, dtype=np.intp))
+
+
+def candidatos_modelos(modelos=MODELOS_AI, fuente='curva'):
+    """
+    Construir la matriz de objetivos a partir del registro de modelos.
+
+    Parámetros:
+    -----------
+    modelos : list
+        Registro de modelos con claves 'parametros', 'energia_exp', 'tokens_s'
+    fuente : str
+        'curva' para E(N) o 'experimental' para energia_exp
+
+    Retorna:
+    --------
+    dict
+        Columnas parametros, energia, tokens_s (arrays) y nombres (list)
+    """
+    parametros = np.array([m['parametros'] for m in modelos], dtype=np.float64)
+    if fuente == 'curva':
+        energia = IntegracionNumerica.funcion_energia(parametros)
+    elif fuente == 'experimental':
+        energia = np.array([m['energia_exp'] for m in modelos], dtype=np.float64)
+    else:
+        raise ValueError("fuente debe ser 'curva' o 'experimental'")
+
+    return {
+        'parametros': parametros,
+        'energia': energia,
+        'tokens_s': np.array([m['tokens_s'] for m in modelos], dtype=np.float64),
+        'nombres': [m['nombre'] for m in modelos]
+    }
+
+
+def generar_candidatos(num_candidatos, modelos=MODELOS_AI, a=1.1, b=8.0, dispersion=0.1,
+                       semilla=None):
+    """
+    Generar configuraciones candidatas sintéticas para barridos a gran escala.
+
+    N se muestrea uniforme en [a, b]; la energía sigue E(N) y el throughput sigue la
+    ley de potencia tokens_s ≈ α·N^β ajustada al registro, ambos con ruido
+    multiplicativo log-normal de desviación `dispersion`.
+
+    Retorna:
+    --------
+    dict
+        Columnas parametros, energia, tokens_s (arrays)
+    """
+    rng = np.random.default_rng(semilla)
+    registro = candidatos_modelos(modelos)
+    beta, log_alfa = np.polyfit(np.log(registro['parametros']), np.log(registro['tokens_s']), 1)
+
+    N = rng.uniform(a, b, num_candidatos)
+    ruido = rng.lognormal(0.0, dispersion, (2, num_candidatos))
+    return {
+        'parametros': N,
+        'energia': IntegracionNumerica.funcion_energia(N) * ruido[0],
+        'tokens_s': np.exp(log_alfa) * N**beta * ruido[1]
+    }
+
+
+def calcular_frontera(candidatos):
+    """
+    Frontera 3-D: minimizar energía, maximizar parámetros y tokens_s.
+
+    Retorna:
+    --------
+    dict
+        Subconjunto no dominado de `candidatos`, ordenado por parámetros
+    """
+    objetivos = np.column_stack([candidatos[c] for c in CAMPOS_FRONTERA])
+    idx = frontera_pareto(objetivos, maximizar=[True, False, True])
+    idx = idx[np.argsort(candidatos['parametros'][idx], kind='stable')]
+
+    frontera = {c: np.asarray(candidatos[c])[idx] for c in CAMPOS_FRONTERA}
+    if 'nombres' in candidatos:
+        frontera['nombres'] = [candidatos['nombres'][i] for i in idx]
+    return frontera
+
+
+def exportar_frontera(frontera, ruta='../figuras/resultados/frontera_pareto.csv'):
+    """
+    Exportar la frontera a CSV (parametros, energia, tokens_s) para los scripts de gráficos.
+    """
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    tabla = np.column_stack([frontera[c] for c in CAMPOS_FRONTERA])
+    np.savetxt(ruta, tabla, delimiter=',', header=','.join(CAMPOS_FRONTERA),
+               comments='', fmt='%.10g')
+    return ruta
+
+
+def cargar_frontera(ruta='../figuras/resultados/frontera_pareto.csv'):
+    """
+    Cargar una frontera exportada por exportar_frontera().
+    """
+    tabla = np.loadtxt(ruta, delimiter=',', skiprows=1, ndmin=2)
+    return {c: tabla[:, j] for j, c in enumerate(CAMPOS_FRONTERA)}
+
+
+def superponer_frontera(ax, frontera, etiqueta='Frontera de Pareto'):
+    """
+    Dibujar la frontera sobre un eje que ya contiene la curva E(N).
+    """
+    ax.plot(frontera['parametros'], frontera['energia'], 'D--',
+            color=COLOR_FRONTERA, markersize=7, linewidth=1.5,
+            markeredgecolor='white', zorder=9, label=etiqueta)
+
+
+def graficar_frontera(candidatos, frontera, integ=None):
+    """
+    Generar gráfica de la frontera de Pareto sobre la curva E(N).
+    """
+    if integ is None:
+        integ = IntegracionNumerica()
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    # Submuestra de candidatos para no saturar la figura
+    num_mostrar = min(len(candidatos['parametros']), 20000)
+    ax.scatter(candidatos['parametros'][:num_mostrar], candidatos['energia'][:num_mostrar],
+               s=2, color=COLOR_CANDIDATOS, alpha=0.3, zorder=1, label='Candidatos')
+
+    N_curva = np.linspace(integ.a, integ.b, 500)
+    ax.plot(N_curva, integ.funcion_energia(N_curva), linewidth=3, color=COLOR_CURVA,
+            zorder=5, label='E(N) - Función energía')
+
+    superponer_frontera(ax, frontera)
+
+    for modelo in MODELOS_AI:
+        N_modelo = modelo['parametros']
+        ax.plot(N_modelo, integ.funcion_energia(N_modelo), 'o', markersize=10,
+                color=COLOR_MODELOS, markeredgecolor='white', markeredgewidth=2, zorder=10)
+
+    ax.set_title(f'Frontera de Pareto - Energía vs Capacidad vs Throughput\n' +
+                 f'{len(frontera["parametros"])} configuraciones no dominadas',
+                 fontsize=14, fontweight='bold', pad=15)
+    ax.set_xlabel('Número de Parámetros (Billones)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Consumo Energético (Wh)', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle=':', zorder=0)
+    ax.legend(fontsize=10, loc='upper left', framealpha=0.95)
+
+    plt.tight_layout()
+
+    os.makedirs('../figuras/png', exist_ok=True)
+    os.makedirs('../figuras/pdf', exist_ok=True)
+
+    fig.savefig('../figuras/png/pareto_frontera.png', dpi=300, bbox_inches='tight')
+    fig.savefig('../figuras/pdf/pareto_frontera.pdf', bbox_inches='tight')
+    plt.close()
+
+
+def ejecutar_pareto(num_candidatos=100000):
+    """
+    Calcular frontera del registro de modelos y de un barrido sintético de candidatos.
+    """
+    print("=" * 70)
+    print("FRONTERA DE PARETO - ENERGÍA vs CAPACIDAD vs THROUGHPUT")
+    print("=" * 70)
+
+    for fuente in ['curva', 'experimental']:
+        registro = candidatos_modelos(fuente=fuente)
+        frontera = calcular_frontera(registro)
+        print(f"\nRegistro de modelos (energía: {fuente}):")
+        for nombre in frontera['nombres']:
+            print(f"  • {nombre}")
+
+    candidatos = generar_candidatos(num_candidatos, semilla=0)
+    inicio = time.perf_counter()
+    frontera = calcular_frontera(candidatos)
+    tiempo = time.perf_counter() - inicio
+
+    print(f"\nCandidatos sintéticos: {num_candidatos:,}")
+    print(f"No dominados: {len(frontera['parametros']):,}")
+    print(f"Tiempo de cálculo: {tiempo*1000:.1f} ms")
+
+    ruta = exportar_frontera(frontera)
+    graficar_frontera(candidatos, frontera)
+
+    print(f"\nArchivo guardado: {ruta}")
+    print("Archivo guardado: ../figuras/png/pareto_frontera.png")
+    print("Archivo guardado: ../figuras/pdf/pareto_frontera.pdf")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Punto de ejecución principal."""
+    num_candidatos = 100000
+
+    if len(sys.argv) > 1:
+        try:
+            num_candidatos = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    ejecutar_pareto(num_candidatos)
+
+
+if __name__ == '__main__':
+    main()
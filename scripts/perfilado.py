@@ -0,0 +1,280 @@
+"""
+perfilado.py
+============
+Perfilado opcional por etapas del cómputo y del pipeline de figuras.
+
+Etapas estándar: compute, draw, layout, savefig-png, savefig-pdf. Cada etapa registra
+tiempo de pared (perf_counter_ns) y de CPU (process_time_ns), anidada bajo la sección
+activa (p. ej. 'comparativa_modelos.main'). Al cerrar la sección más externa se imprime
+un resumen y se escriben pilas colapsadas (formato de flamegraph.pl / speedscope).
+
+Matplotlib dibuja de forma perezosa: 'draw' mide la creación de artistas y el
+rasterizado real queda dentro de savefig-png / savefig-pdf.
+
+Uso en el código (contexto o decorador):
+    from perfilado import etapa, seccion
+
+    @seccion('trapecio.ejecutar_trapecio')
+    def ejecutar_trapecio(...):
+        with etapa('compute'):
+            ...
+
+Activación (desactivado por defecto, costo casi nulo):
+    PERFILADO=1 python comparativa_modelos.py
+    PERFILADO=1 PERFILADO_CPROFILE=1 python rectangulos_visualizacion.py
+    python launcher.py --perfilar
+
+Variables de entorno:
+    PERFILADO=1            Activar el perfilado por etapas
+    PERFILADO_CPROFILE=1   Además, perfilar con cProfile y exportar pilas colapsadas
+    PERFILADO_SALIDA=dir   Directorio de salida (default: perfilado/)
+"""
+
+import contextlib
+import cProfile
+import os
+import pstats
+import time
+from collections import defaultdict
+
+
+ETAPAS = ('compute', 'draw', 'layout', 'savefig-png', 'savefig-pdf')
+
+_ACTIVO = os.environ.get('PERFILADO', '') not in ('', '0')
+_CPROFILE = os.environ.get('PERFILADO_CPROFILE', '') not in ('', '0')
+_SALIDA = os.environ.get('PERFILADO_SALIDA', 'perfilado')
+
+# Pila de nombres activa y acumuladores por ruta completa (tupla de nombres)
+_pila = []
+_registros = defaultdict(lambda: [0, 0, 0])   # ruta -> [llamadas, pared_ns, cpu_ns]
+_perfilador = None
+
+
+def activar(cprofile=False, salida=None):
+    """
+    Activar el perfilado desde código (equivale a PERFILADO=1).
+
+    Parámetros:
+    -----------
+    cprofile : bool
+        Activar también cProfile
+    salida : str, opcional
+        Directorio de salida de los reportes
+    """
+    global _ACTIVO, _CPROFILE, _SALIDA
+    _ACTIVO = True
+    _CPROFILE = _CPROFILE or cprofile
+    if salida is not None:
+        _SALIDA = salida
+
+
+def activo():
+    """True si el perfilado está activado."""
+    return _ACTIVO
+
+
+class _Medicion(contextlib.ContextDecorator):
+    """
+    Contexto/decorador que mide tiempo de pared y de CPU bajo la ruta activa.
+
+    La activación se consulta al entrar (no al decorar), así que los decoradores
+    aplicados al importar respetan una llamada posterior a activar(). Desactivado,
+    el costo es una comprobación booleana por entrada.
+    """
+
+    def __init__(self, nombre, seccion=False):
+        self.nombre = nombre
+        self.seccion = seccion
+        self._inicios = []
+
+    def __enter__(self):
+        global _perfilador
+        if not _ACTIVO:
+            self._inicios.append(None)
+            return self
+        externa = self.seccion and not _pila
+        if externa and _CPROFILE:
+            _perfilador = cProfile.Profile()
+            _perfilador.enable()
+        _pila.append(self.nombre)
+        self._inicios.append((tuple(_pila), externa,
+                              time.perf_counter_ns(), time.process_time_ns()))
+        return self
+
+    def __exit__(self, *exc):
+        inicio = self._inicios.pop()
+        if inicio is None:
+            return False
+        ruta, externa, pared0, cpu0 = inicio
+        registro = _registros[ruta]
+        registro[0] += 1
+        registro[1] += time.perf_counter_ns() - pared0
+        registro[2] += time.process_time_ns() - cpu0
+        _pila.pop()
+        if externa:
+            if _perfilador is not None:
+                _perfilador.disable()
+            reportar(self.nombre)
+        return False
+
+
+def etapa(nombre):
+    """
+    Medir una etapa (compute, draw, layout, savefig-png, savefig-pdf).
+
+    Se usa como contexto (with etapa('layout'): ...) o como decorador (@etapa('draw')).
+    """
+    return _Medicion(nombre)
+
+
+def seccion(nombre):
+    """
+    Medir una sección de nivel superior (opción del lanzador, main de un script, ejecutar_*).
+
+    Agrupa las etapas internas; al cerrar la sección más externa se imprime el resumen
+    y se exportan las pilas colapsadas. Se usa como contexto o como decorador.
+    """
+    return _Medicion(nombre, seccion=True)
+
+
+def _tiempos_propios():
+    """Tiempo propio (excluyendo hijos directos) por ruta: ruta -> (llamadas, pared_ns, cpu_ns)."""
+    hijos = defaultdict(lambda: [0, 0])
+    for ruta, (_, pared, cpu) in _registros.items():
+        if len(ruta) > 1:
+            hijos[ruta[:-1]][0] += pared
+            hijos[ruta[:-1]][1] += cpu
+    return {ruta: (llamadas, max(pared - hijos[ruta][0], 0), max(cpu - hijos[ruta][1], 0))
+            for ruta, (llamadas, pared, cpu) in _registros.items()}
+
+
+def resumen_etapas():
+    """
+    Tiempo propio total por nombre de etapa, sumando todas las rutas donde aparece.
+
+    Los tiempos son exclusivos (sin etapas anidadas), así que se suman sin doble conteo;
+    el tiempo propio de las secciones se agrupa como 'otros'.
+
+    Retorna:
+    --------
+    dict
+        etapa -> {'llamadas', 'pared_ms', 'cpu_ms'}
+    """
+    totales = defaultdict(lambda: {'llamadas': 0, 'pared_ms': 0.0, 'cpu_ms': 0.0})
+    for ruta, (llamadas, pared, cpu) in _tiempos_propios().items():
+        clave = ruta[-1] if ruta[-1] in ETAPAS else 'otros'
+        t = totales[clave]
+        t['llamadas'] += llamadas
+        t['pared_ms'] += pared / 1e6
+        t['cpu_ms'] += cpu / 1e6
+    return dict(totales)
+
+
+def pilas_colapsadas_etapas():
+    """
+    Pilas colapsadas de las secciones/etapas: 'a;b;c valor' con tiempo propio en µs.
+    """
+    lineas = []
+    for ruta, (_, pared, _) in sorted(_tiempos_propios().items()):
+        propio_us = pared // 1000
+        if propio_us > 0:
+            lineas.append(f"{';'.join(ruta)} {propio_us}")
+    return lineas
+
+
+def _nombre_funcion(func):
+    archivo, linea, nombre = func
+    if archivo == '~':
+        return nombre  # funciones integradas: '<built-in method ...>'
+    return f"{nombre} ({os.path.basename(archivo)}:{linea})"
+
+
+def pilas_colapsadas_cprofile(perfilador, profundidad_max=64, fraccion_minima=1e-4):
+    """
+    Convertir datos de cProfile a pilas colapsadas (tiempo propio en µs).
+
+    cProfile solo guarda aristas llamador -> llamado, no pilas completas: las pilas se
+    reconstruyen recorriendo el grafo desde las raíces y repartiendo el tiempo de cada
+    función en proporción al tiempo acumulado de cada arista (misma aproximación que
+    flameprof/gprof2dot). Las ramas con menos de `fraccion_minima` del tiempo total se
+    podan; sin poda el número de caminos crece exponencialmente con el grafo.
+
+    Parámetros:
+    -----------
+    perfilador : cProfile.Profile o str
+        Perfilador o archivo .prof
+    profundidad_max : int
+        Profundidad máxima de pila
+    fraccion_minima : float
+        Fracción del tiempo total por debajo de la cual se poda una rama
+    """
+    stats = pstats.Stats(perfilador).stats
+    llamados = defaultdict(dict)
+    for func, (_, _, _, ct, llamadores) in stats.items():
+        for llamador, arista in llamadores.items():
+            llamados[llamador][func] = arista[3]
+
+    raices = [f for f, datos in stats.items() if not datos[4]]
+    minimo = fraccion_minima * sum(stats[f][3] for f in raices)
+    acumulado = defaultdict(float)
+
+    def recorrer(func, pila, fraccion):
+        _, _, tt, ct, _ = stats[func]
+        pila = pila + [_nombre_funcion(func)]
+        acumulado[';'.join(pila)] += tt * fraccion
+        if len(pila) >= profundidad_max:
+            acumulado[';'.join(pila)] += (ct - tt) * fraccion
+            return
+        for hijo, ct_arista in llamados.get(func, {}).items():
+            ct_hijo = stats[hijo][3]
+            if ct_hijo <= 0 or _nombre_funcion(hijo) in pila:
+                continue  # la recursión ya está contada en el tiempo acumulado
+            if ct_arista * fraccion < minimo:
+                # Rama podada: su tiempo se atribuye al llamador
+                acumulado[';'.join(pila)] += ct_arista * fraccion
+                continue
+            recorrer(hijo, pila, fraccion * ct_arista / ct_hijo)
+
+    for raiz in raices:
+        recorrer(raiz, [], 1.0)
+
+    return [f"{pila} {int(t * 1e6)}" for pila, t in sorted(acumulado.items()) if t * 1e6 >= 1]
+
+
+def reportar(nombre):
+    """
+    Imprimir el resumen por etapa y escribir las pilas colapsadas en el directorio de salida.
+    """
+    print("\n" + "=" * 70)
+    print(f"PERFILADO POR ETAPAS - {nombre}")
+    print("=" * 70)
+    print(f"\n{'Etapa':<14} | {'Llamadas':>8} | {'Pared (ms)':>12} | {'CPU (ms)':>12}")
+    print("-" * 56)
+    for etapa_nombre, t in resumen_etapas().items():
+        print(f"{etapa_nombre:<14} | {t['llamadas']:>8} | {t['pared_ms']:>12.1f} | {t['cpu_ms']:>12.1f}")
+
+    total = sum(r[1] for ruta, r in _registros.items() if len(ruta) == 1) / 1e6
+    print(f"\nTotal ({nombre}): {total:.1f} ms")
+
+    os.makedirs(_SALIDA, exist_ok=True)
+    base = os.path.join(_SALIDA, nombre.replace('/', '_'))
+    with open(base + '.etapas.folded', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(pilas_colapsadas_etapas()) + '\n')
+    print(f"Archivo guardado: {base}.etapas.folded")
+
+    if _perfilador is not None:
+        _perfilador.dump_stats(base + '.prof')
+        with open(base + '.cprofile.folded', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(pilas_colapsadas_cprofile(_perfilador)) + '\n')
+        print(f"Archivo guardado: {base}.prof")
+        print(f"Archivo guardado: {base}.cprofile.folded")
+    print("=" * 70)
+
+    reiniciar()
+
+
+def reiniciar():
+    """Descartar los registros acumulados."""
+    global _perfilador
+    _registros.clear()
+    _perfilador = None
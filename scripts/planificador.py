@@ -0,0 +1,227 @@
+"""
+planificador.py
+===============
+Planificador a priori: método y n más baratos que garantizan una tolerancia de error.
+
+A partir de las cotas de derivadas del modelo de energía en [a, b] (exactas para
+polinomios: extremos del intervalo y raíces reales de la derivada siguiente) y de las
+fórmulas clásicas de error de las reglas compuestas:
+
+    Rectángulos left/right : |E| <= (b-a)^2 / (2 n)    * max|f'|
+    Rectángulos mid        : |E| <= (b-a)^3 / (24 n^2) * max|f''|
+    Trapecio               : |E| <= (b-a)^3 / (12 n^2) * max|f''|
+    Simpson 1/3 (n par)    : |E| <= (b-a)^5 / (180 n^4) * max|f''''|
+
+se calcula el n mínimo de cada método y su costo en evaluaciones de f, sin
+barridos de convergencia.
+
+Uso:
+    python planificador.py [tolerancia]
+"""
+
+import sys
+
+import numpy as np
+
+from integrales_numericas import IntegracionNumerica
+
+
+def cota_derivada(coeficientes, orden, a, b):
+    """
+    max |p^(orden)(x)| en [a, b] para un polinomio, de forma exacta.
+
+    El máximo de |q| con q = p^(orden) se alcanza en un extremo o en una raíz real
+    de q' dentro de (a, b).
+
+    Parámetros:
+    -----------
+    coeficientes : array
+        Coeficientes del polinomio en orden descendente (np.polyval)
+    orden : int
+        Orden de la derivada
+    a, b : float
+        Intervalo
+
+    Retorna:
+    --------
+    float
+        Cota máxima de la derivada en valor absoluto
+    """
+    q = np.polyder(np.asarray(coeficientes, dtype=np.float64), orden) if orden else coeficientes
+    q = np.atleast_1d(q)
+    candidatos = [a, b]
+    if q.size > 1:
+        dq = np.polyder(q)
+        if dq.size > 1:
+            raices = np.roots(dq)
+            raices = raices[np.abs(raices.imag) < 1e-12].real
+            candidatos.extend(raices[(raices > a) & (raices < b)])
+    return float(np.max(np.abs(np.polyval(q, np.asarray(candidatos)))))
+
+
+class PlanificadorIntegracion:
+    """
+    Elige el método compuesto y el n más baratos que cumplen una tolerancia absoluta.
+    """
+
+    # (nombre, modo, orden derivada, constante C, potencia p): error <= C (b-a)^(p+1) M / n^p
+    METODOS = [
+        ('rectangulos', 'left', 1, 1 / 2, 1),
+        ('rectangulos', 'right', 1, 1 / 2, 1),
+        ('rectangulos', 'mid', 2, 1 / 24, 2),
+        ('trapecio', None, 2, 1 / 12, 2),
+        ('simpson', None, 4, 1 / 180, 4),
+    ]
+
+    def __init__(self, a=1.1, b=8.0, coeficientes=None):
+        """
+        Precalcular cotas de derivadas del modelo.
+
+        Parámetros:
+        -----------
+        a, b : float
+            Límites de integración
+        coeficientes : array, opcional
+            Coeficientes de E(N) (default: COEFICIENTES_ENERGIA)
+        """
+        if coeficientes is None:
+            coeficientes = IntegracionNumerica.COEFICIENTES_ENERGIA
+        self.a = a
+        self.b = b
+        self.coeficientes = np.asarray(coeficientes, dtype=np.float64)
+        self.cotas = {k: cota_derivada(self.coeficientes, k, a, b) for k in (1, 2, 4)}
+
+    def n_minimo(self, metodo, modo, tolerancia):
+        """
+        Menor n cuyo error a priori es <= tolerancia.
+        """
+        for nombre, m, orden, C, p in self.METODOS:
+            if nombre == metodo and m == modo:
+                break
+        else:
+            raise ValueError("Metodo debe ser 'trapecio', 'simpson' o 'rectangulos' "
+                             "(con mode 'left', 'right' o 'mid')")
+
+        M = self.cotas[orden]
+        L = self.b - self.a
+        if M == 0:
+            # Regla exacta para este integrando
+            n = 1
+        else:
+            n = int(np.ceil((C * L**(p + 1) * M / tolerancia) ** (1 / p)))
+            # Evitar que el redondeo de la raíz deje el error justo por encima
+            while C * L**(p + 1) * M / n**p > tolerancia:
+                n += 1
+        n = max(n, 1)
+        if metodo == 'simpson':
+            n = max(n + n % 2, 2)
+        return n
+
+    @staticmethod
+    def costo(metodo, n):
+        """
+        Evaluaciones de f de cada método compuesto con n subintervalos.
+        """
+        return n if metodo == 'rectangulos' else n + 1
+
+    def cota_error(self, metodo, modo, n):
+        """
+        Cota a priori del error absoluto para un método y n dados.
+        """
+        for nombre, m, orden, C, p in self.METODOS:
+            if nombre == metodo and m == modo:
+                return C * (self.b - self.a)**(p + 1) * self.cotas[orden] / n**p
+        raise ValueError("Metodo o modo no reconocido")
+
+    def planificar(self, tolerancia):
+        """
+        Plan para todos los métodos, ordenado de menor a mayor costo.
+
+        Parámetros:
+        -----------
+        tolerancia : float
+            Error absoluto máximo admitido (Wh·B)
+
+        Retorna:
+        --------
+        list
+            Diccionarios con claves metodo, mode, n, evaluaciones, cota_error
+        """
+        if tolerancia <= 0:
+            raise ValueError("La tolerancia debe ser positiva")
+
+        plan = []
+        for metodo, modo, _, _, p in self.METODOS:
+            n = self.n_minimo(metodo, modo, tolerancia)
+            plan.append({
+                'metodo': metodo,
+                'mode': modo,
+                'n': n,
+                'evaluaciones': self.costo(metodo, n),
+                'cota_error': self.cota_error(metodo, modo, n),
+                'orden': p
+            })
+        # Empates de costo: preferir el de mayor orden
+        plan.sort(key=lambda r: (r['evaluaciones'], -r['orden']))
+        return plan
+
+    def mejor(self, tolerancia):
+        """
+        Opción más barata que cumple la tolerancia.
+        """
+        return self.planificar(tolerancia)[0]
+
+
+def ejecutar_planificador(tolerancia=1e-6):
+    """
+    Mostrar el plan a priori y verificar el error real con la integral exacta.
+    """
+    integ = IntegracionNumerica()
+    planificador = PlanificadorIntegracion(integ.a, integ.b)
+    exact = integ.integral_exacta()
+
+    print("=" * 70)
+    print("PLANIFICADOR A PRIORI DE INTEGRACIÓN NUMÉRICA")
+    print("=" * 70)
+    print(f"\nTolerancia absoluta: {tolerancia:.2e} Wh·B")
+    print(f"Cotas en [{integ.a}, {integ.b}]: max|E'| = {planificador.cotas[1]:.4f}, "
+          f"max|E''| = {planificador.cotas[2]:.4f}, max|E''''| = {planificador.cotas[4]:.4f}")
+
+    print(f"\n{'Método':<20} | {'n':>10} | {'Evaluaciones':>12} | {'Cota error':>11} | {'Error real':>11}")
+    print("-" * 78)
+    plan = planificador.planificar(tolerancia)
+    for r in plan:
+        etiqueta = r['metodo'] + (f" ({r['mode']})" if r['mode'] else '')
+        if r['evaluaciones'] <= 10**7:
+            if r['metodo'] == 'rectangulos':
+                aprox = integ.rectangulos(r['n'], r['mode'])
+            else:
+                aprox = getattr(integ, r['metodo'])(r['n'])
+            error_real = f"{abs(aprox - exact):>11.2e}"
+        else:
+            error_real = f"{'(omitido)':>11}"
+        print(f"{etiqueta:<20} | {r['n']:>10} | {r['evaluaciones']:>12} | "
+              f"{r['cota_error']:>11.2e} | {error_real}")
+
+    elegido = plan[0]
+    print(f"\nRecomendado: {elegido['metodo']}"
+          f"{' (' + elegido['mode'] + ')' if elegido['mode'] else ''} con n = {elegido['n']}")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Punto de ejecución principal."""
+    tolerancia = 1e-6
+
+    if len(sys.argv) > 1:
+        try:
+            tolerancia = float(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número (tolerancia)")
+            sys.exit(1)
+
+    ejecutar_planificador(tolerancia)
+
+
+if __name__ == '__main__':
+    main()
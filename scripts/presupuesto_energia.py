@@ -0,0 +1,224 @@
+"""
+presupuesto_energia.py
+======================
+Consultas inversas de presupuesto energético: tamaño máximo de modelo para una energía acumulada.
+
+Dado un presupuesto B, se busca el mayor N_max tal que
+
+    G(N_max) = ∫[a, N_max] E(N) dN <= B
+
+G es la antiderivada desplazada (G(a) = 0). Se precalculan los segmentos donde G es
+monótona (separados por las raíces reales de E) con una tabla de nodos por segmento;
+cada consulta se ubica con búsqueda binaria vectorizada y se refina con Newton
+acotado (con respaldo de bisección). No hay bucles de Python por consulta.
+
+Uso:
+    python presupuesto_energia.py [número_de_consultas]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from integrales_numericas import IntegracionNumerica
+
+
+class InversorPresupuesto:
+    """
+    Resolver vectorizado de N_max(B) para un modelo de energía polinomial.
+    """
+
+    def __init__(self, a=1.1, n_superior=100.0, coeficientes=None, nodos_por_segmento=256):
+        """
+        Precalcular segmentos monótonos y tabla de nodos de G.
+
+        Parámetros:
+        -----------
+        a : float
+            Límite inferior de integración (default: 1.1 - TinyLLaMA)
+        n_superior : float
+            Mayor tamaño de modelo considerado; presupuestos mayores se saturan aquí
+        coeficientes : array, opcional
+            Coeficientes de E(N) en orden descendente (default: COEFICIENTES_ENERGIA)
+        nodos_por_segmento : int
+            Nodos de la tabla por segmento monótono (mejora el punto inicial de Newton)
+        """
+        if coeficientes is None:
+            coeficientes = IntegracionNumerica.COEFICIENTES_ENERGIA
+        if n_superior <= a:
+            raise ValueError("n_superior debe ser mayor que a")
+
+        self.a = a
+        self.n_superior = n_superior
+        self.coeficientes = np.asarray(coeficientes, dtype=np.float64)
+        self.coef_antiderivada = np.polyint(self.coeficientes)
+        self._F_a = np.polyval(self.coef_antiderivada, a)
+
+        # Extremos de los segmentos: a, raíces reales de E en (a, n_superior), n_superior
+        raices = np.roots(self.coeficientes) if self.coeficientes.size > 1 else np.empty(0)
+        raices = np.sort(raices[np.abs(raices.imag) < 1e-12].real)
+        raices = raices[(raices > a) & (raices < n_superior)]
+        self.extremos = np.concatenate([[a], raices, [n_superior]])
+
+        # Tabla de nodos por segmento: (num_segmentos x nodos_por_segmento)
+        t = np.linspace(0.0, 1.0, nodos_por_segmento)
+        izq, der = self.extremos[:-1], self.extremos[1:]
+        self.nodos = izq[:, None] + (der - izq)[:, None] * t
+        self.nodos[:, -1] = der
+        self.G_nodos = self.energia_acumulada(self.nodos)
+
+        # G es monótona en cada segmento: su mínimo está en un extremo
+        self.creciente = self.G_nodos[:, -1] >= self.G_nodos[:, 0]
+        minimos = np.minimum(self.G_nodos[:, 0], self.G_nodos[:, -1])
+        # Mínimo de sufijo: no decreciente, permite buscar el segmento más a la derecha
+        self._min_sufijo = np.minimum.accumulate(minimos[::-1])[::-1]
+
+    def energia_acumulada(self, N):
+        """
+        G(N) = ∫[a, N] E(x) dx usando la antiderivada exacta.
+        """
+        return np.polyval(self.coef_antiderivada, N) - self._F_a
+
+    def energia(self, N):
+        """
+        E(N) con los coeficientes del inversor.
+        """
+        return np.polyval(self.coeficientes, N)
+
+    def n_max(self, presupuestos, tol=1e-12, max_iter=50):
+        """
+        Mayor N en [a, n_superior] con G(N) <= presupuesto, para un arreglo de presupuestos.
+
+        Parámetros:
+        -----------
+        presupuestos : float o array
+            Energía acumulada disponible (Wh·B)
+        tol : float
+            Tolerancia relativa sobre G(N) - B
+        max_iter : int
+            Máximo de iteraciones de Newton
+
+        Retorna:
+        --------
+        array
+            N_max para cada presupuesto; NaN si el presupuesto no alcanza ni para N = a
+            (p. ej. negativo); n_superior si el presupuesto cubre todo el dominio
+        """
+        B = np.asarray(presupuestos, dtype=np.float64)
+        forma = B.shape
+        B = B.ravel()
+        resultado = np.full(B.size, np.nan)
+
+        # Segmento más a la derecha cuyo mínimo de G es <= B
+        seg = np.searchsorted(self._min_sufijo, B, side='right') - 1
+        validos = seg >= 0
+        seg_v = seg[validos]
+        B_v = B[validos]
+
+        # Si G(fin del segmento) <= B, la respuesta es el extremo derecho del segmento
+        resultado_v = self.extremos[seg_v + 1].copy()
+        resolver = self.G_nodos[seg_v, -1] > B_v
+
+        if np.any(resolver):
+            idx = np.nonzero(resolver)[0]
+            lo = np.empty(idx.size)
+            hi = np.empty(idx.size)
+            # Bucle sobre segmentos (pocos), no sobre consultas
+            for s in np.unique(seg_v[idx]):
+                en_s = seg_v[idx] == s
+                # Solo segmentos crecientes llegan aquí: G_nodos[s] es creciente
+                k = np.searchsorted(self.G_nodos[s], B_v[idx][en_s], side='right')
+                k = np.clip(k, 1, self.nodos.shape[1] - 1)
+                lo[en_s] = self.nodos[s, k - 1]
+                hi[en_s] = self.nodos[s, k]
+            resultado_v[idx] = self._newton_acotado(B_v[idx], lo, hi, tol, max_iter)
+
+        resultado[validos] = resultado_v
+        return resultado.reshape(forma)
+
+    def _newton_acotado(self, B, lo, hi, tol, max_iter):
+        """
+        Newton vectorizado sobre G(x) - B = 0 dentro de [lo, hi], con respaldo de bisección.
+        """
+        G_lo = self.energia_acumulada(lo)
+        G_hi = self.energia_acumulada(hi)
+        # Punto inicial por interpolación lineal dentro del nodo
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.where(G_hi > G_lo, lo + (B - G_lo) * (hi - lo) / (G_hi - G_lo), 0.5 * (lo + hi))
+
+        activos = np.arange(B.size)
+        for _ in range(max_iter):
+            xa = x[activos]
+            g = self.energia_acumulada(xa) - B[activos]
+            convergido = np.abs(g) <= tol * np.maximum(1.0, np.abs(B[activos]))
+            if np.all(convergido):
+                break
+
+            # Actualizar intervalo de confinamiento
+            positivo = g > 0
+            hi[activos[positivo]] = xa[positivo]
+            lo[activos[~positivo]] = xa[~positivo]
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x_nuevo = xa - g / self.energia(xa)
+            la, ha = lo[activos], hi[activos]
+            fuera = ~((x_nuevo > la) & (x_nuevo < ha))
+            x_nuevo[fuera] = 0.5 * (la[fuera] + ha[fuera])
+
+            x[activos] = np.where(convergido, xa, x_nuevo)
+            activos = activos[~convergido]
+            if activos.size == 0:
+                break
+
+        return x
+
+
+def ejecutar_presupuesto(num_consultas=1_000_000):
+    """
+    Mostrar N_max para presupuestos de ejemplo y medir el rendimiento en lote.
+    """
+    inversor = InversorPresupuesto()
+    integ = IntegracionNumerica()
+
+    print("=" * 70)
+    print("CONSULTAS INVERSAS DE PRESUPUESTO ENERGÉTICO")
+    print("=" * 70)
+    print(f"\nBuscar mayor N_max con ∫[{inversor.a}, N_max] E(N) dN <= B")
+    print(f"Segmentos monótonos de G: {len(inversor.extremos) - 1}")
+
+    presupuestos = np.array([10.0, 50.0, 100.0, integ.integral_exacta(), 500.0])
+    n_max = inversor.n_max(presupuestos)
+
+    print(f"\n{'Presupuesto (Wh·B)':>20} | {'N_max (B)':>12} | {'G(N_max)':>14}")
+    print("-" * 55)
+    for B, N in zip(presupuestos, n_max):
+        print(f"{B:>20.6f} | {N:>12.6f} | {inversor.energia_acumulada(N):>14.8f}")
+
+    rng = np.random.default_rng(0)
+    lote = rng.uniform(0, 1000, num_consultas)
+    inicio = time.perf_counter()
+    inversor.n_max(lote)
+    tiempo = time.perf_counter() - inicio
+
+    print(f"\nConsultas en lote: {num_consultas:,}")
+    print(f"Tiempo total: {tiempo*1000:.1f} ms ({tiempo/num_consultas*1e9:.1f} ns/consulta)")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Punto de ejecución principal."""
+    num_consultas = 1_000_000
+
+    if len(sys.argv) > 1:
+        try:
+            num_consultas = int(sys.argv[1])
+        except ValueError:
+            print("Error: El argumento debe ser un número entero")
+            sys.exit(1)
+
+    ejecutar_presupuesto(num_consultas)
+
+
+if __name__ == '__main__':
+    main()
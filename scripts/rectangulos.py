@@ -12,8 +12,10 @@ import sys
 import os
 import numpy as np
 import matplotlib.pyplot as plt
-from integrales_numericas import IntegracionNumerica
-import time
+from integrales_numericas import IntegracionNumerica, TIEMPO_MEDICION_S
+from almacen_resultados import AlmacenResultados, CAMPOS_MEMORIA, CAMPOS_TIEMPOS
+from medicion import medir_memoria, medir_tiempo, graficar_tiempos
+from perfilado import etapa, seccion
 
 # Paleta de colores estandarizada - CONSISTENCIA VISUAL
 COLOR_PRINCIPAL = '#C62828'    # SIEMPRE ROJO para curva E(N)
@@ -33,6 +35,13 @@ MODELOS_AI = [
     {'nombre': 'LLaMA-3 8B', 'parametros': 8.0, 'energia_exp': 18.3, 'tokens_s': 17.1}
 ]
 
+# Columnas del reporte de convergencia con tiempos de ejecución y memoria
+CAMPOS_RECTANGULOS = [
+    ('n', np.int64),
+    ('integrales', np.float64),
+    ('errores_absoluto', np.float64),
+] + CAMPOS_TIEMPOS + CAMPOS_MEMORIA
+
 
 def rectangles_method(f, a, b, n, mode='mid'):
     """
@@ -84,6 +93,7 @@ def rectangles_method(f, a, b, n, mode='mid'):
     return aprox_area, x_rects, heights
 
 
+@seccion('rectangulos.ejecutar_rectangulos')
 def ejecutar_rectangulos(n=None, mode='mid'):
     """
     Ejecutar análisis de método de rectángulos.
@@ -127,19 +137,15 @@ def ejecutar_rectangulos(n=None, mode='mid'):
         if mode_input in ['left', 'right', 'mid']:
             mode = mode_input
     
-    # Medir tiempo de ejecución
-    start_time = time.time()
-    
-    # Cálculo
-    aprox_area, x_rects, heights = rectangles_method(
-        integ.funcion_energia, integ.a, integ.b, n, mode
-    )
-    
-    exec_time = time.time() - start_time
-    
-    integral_exact = integ.integral_exacta()
-    error_abs = abs(aprox_area - integral_exact)
-    error_rel = (error_abs / integral_exact) * 100
+    # Cálculo con medición estadística de tiempo (calentamiento + repeticiones)
+    with etapa('compute'):
+        (aprox_area, x_rects, heights), tiempo = medir_tiempo(
+            lambda: rectangles_method(integ.funcion_energia, integ.a, integ.b, n, mode)
+        )
+        
+        integral_exact = integ.integral_exacta()
+        error_abs = abs(aprox_area - integral_exact)
+        error_rel = (error_abs / integral_exact) * 100
     
     # Resultados
     print("\n" + "=" * 70)
@@ -152,7 +158,8 @@ def ejecutar_rectangulos(n=None, mode='mid'):
     print(f"Integral exacta:     {integral_exact:.8f} Wh·B")
     print(f"\nError absoluto: {error_abs:.2e} Wh·B")
     print(f"Error relativo: {error_rel:.6f}%")
-    print(f"Tiempo de ejecución: {exec_time*1000:.3f} ms")
+    print(f"Tiempo de ejecución: {tiempo['mediana_ms']:.4f} ms (mediana; "
+          f"min {tiempo['min_ms']:.4f}, p95 {tiempo['p95_ms']:.4f}, {tiempo['repeticiones']} reps)")
     
     # Análisis de convergencia
     print("\n" + "-" * 70)
@@ -163,17 +170,20 @@ def ejecutar_rectangulos(n=None, mode='mid'):
     if n not in n_values:
         n_values = sorted(list(set(n_values + [n])))
     
-    reporte = analizar_convergencia_rectangulos(integ, n_values, mode)
+    with etapa('compute'):
+        reporte = analizar_convergencia_rectangulos(integ, n_values, mode)
     
-    print(f"\n{'n':>6} | {'Integral':>14} | {'Error Abs.':>12} | {'Error Rel. %':>10} | {'Tiempo (ms)':>12}")
-    print("-" * 75)
+    print(f"\n{'n':>6} | {'Integral':>14} | {'Error Abs.':>12} | {'Error Rel. %':>10} | "
+          f"{'Mediana (ms)':>12} | {'Min (ms)':>10} | {'p95 (ms)':>10} | {'Pico (KiB)':>10}")
+    print("-" * 113)
     for i, n_val in enumerate(reporte['n']):
         integral = reporte['integrales'][i]
         error_abs = reporte['errores_absoluto'][i]
         error_rel = (error_abs / integral_exact) * 100
-        exec_t = reporte['tiempos'][i]
         
-        print(f"{n_val:>6} | {integral:>14.8f} | {error_abs:>12.2e} | {error_rel:>10.6f} | {exec_t:>12.3f}")
+        print(f"{n_val:>6} | {integral:>14.8f} | {error_abs:>12.2e} | {error_rel:>10.6f} | "
+              f"{reporte['tiempos'][i]:>12.4f} | {reporte['tiempos_min'][i]:>10.4f} | "
+              f"{reporte['tiempos_p95'][i]:>10.4f} | {reporte['memoria_pico'][i] / 1024:>10.1f}")
     
     # Generar gráfico
     print("\n" + "-" * 70)
@@ -202,40 +212,41 @@ def analizar_convergencia_rectangulos(integ, valores_n, mode='mid'):
     
     Retorna:
     --------
-    dict
-        Resultados con claves: n, integrales, errores_absoluto, tiempos
+    AlmacenResultados
+        Vista tipo dict con claves: n, integrales, errores_absoluto,
+        tiempos (mediana), tiempos_min, tiempos_p95 (ms por llamada),
+        memoria_pico, memoria_neta (bytes por llamada, tracemalloc)
     """
-    resultados = {
-        'n': [],
-        'integrales': [],
-        'errores_absoluto': [],
-        'tiempos': []
-    }
+    resultados = AlmacenResultados(CAMPOS_RECTANGULOS, capacidad=len(valores_n))
     
     exact = integ.integral_exacta()
     
     for n in valores_n:
-        start_time = time.time()
-        aprox_area, _, _ = rectangles_method(
-            integ.funcion_energia, integ.a, integ.b, n, mode
+        (aprox_area, _, _), tiempo = medir_tiempo(
+            lambda: rectangles_method(integ.funcion_energia, integ.a, integ.b, n, mode),
+            tiempo_objetivo=TIEMPO_MEDICION_S
+        )
+        _, uso = medir_memoria(
+            lambda: rectangles_method(integ.funcion_energia, integ.a, integ.b, n, mode)
         )
-        exec_time = (time.time() - start_time) * 1000  # en ms
-        
-        error_abs = abs(aprox_area - exact)
         
-        resultados['n'].append(n)
-        resultados['integrales'].append(aprox_area)
-        resultados['errores_absoluto'].append(error_abs)
-        resultados['tiempos'].append(exec_time)
+        resultados.agregar(n=n, integrales=aprox_area,
+                           errores_absoluto=abs(aprox_area - exact),
+                           tiempos=tiempo['mediana_ms'],
+                           tiempos_min=tiempo['min_ms'],
+                           tiempos_p95=tiempo['p95_ms'],
+                           memoria_pico=uso['pico_bytes'],
+                           memoria_neta=uso['neto_bytes'])
     
     return resultados
 
 
+@etapa('draw')
 def generar_grafico_rectangulos(reporte, integ, mode):
     """
     Generar gráfico de convergencia para método de rectángulos.
     """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(20, 6))
     fig.suptitle(f'Análisis de Convergencia - Método de Rectángulos ({mode.upper()})', 
                  fontsize=14, fontweight='bold')
     
@@ -275,14 +286,20 @@ def generar_grafico_rectangulos(reporte, integ, mode):
     ax2.grid(True, alpha=0.25, linestyle=':', which='both')
     ax2.legend(fontsize=10)
     
-    plt.tight_layout()
+    # Gráfica 3: Costo de cómputo (mediana con rango min - p95)
+    graficar_tiempos(ax3, reporte, color)
+    
+    with etapa('layout'):
+        plt.tight_layout()
     
     # Guardar figuras
     os.makedirs('../figuras/png', exist_ok=True)
     os.makedirs('../figuras/pdf', exist_ok=True)
     
-    fig.savefig(f'../figuras/png/rectangulos_{mode}_convergencia.png', dpi=300, bbox_inches='tight')
-    fig.savefig(f'../figuras/pdf/rectangulos_{mode}_convergencia.pdf', bbox_inches='tight')
+    with etapa('savefig-png'):
+        fig.savefig(f'../figuras/png/rectangulos_{mode}_convergencia.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig(f'../figuras/pdf/rectangulos_{mode}_convergencia.pdf', bbox_inches='tight')
     plt.close()
 
 
@@ -11,6 +11,7 @@ Uso:
 import numpy as np
 import matplotlib.pyplot as plt
 from integrales_numericas import IntegracionNumerica
+from perfilado import etapa, seccion
 import os
 
 # Paleta de colores estandarizada - CONSISTENCIA VISUAL
@@ -59,6 +60,7 @@ def rectangles_method(f, a, b, n, mode='mid'):
     return aprox_area, x_rects, heights, h
 
 
+@etapa('draw')
 def graficar_rectangulos_con_modelos(n_values=[10, 100, 1000], mode='mid'):
     """
     Generar gráficas de rectángulos para diferentes valores de n con puntos de modelos.
@@ -92,9 +94,10 @@ def graficar_rectangulos_con_modelos(n_values=[10, 100, 1000], mode='mid'):
         ax = axes[idx]
         
         # Calcular rectángulos
-        aprox_area, x_rects, heights, width = rectangles_method(
-            integ.funcion_energia, integ.a, integ.b, n, mode
-        )
+        with etapa('compute'):
+            aprox_area, x_rects, heights, width = rectangles_method(
+                integ.funcion_energia, integ.a, integ.b, n, mode
+            )
         
         # Dibujar rectángulos (semi-transparentes, zorder bajo)
         ax.bar(x_rects, heights, width=width, align='edge',
@@ -136,15 +139,18 @@ def graficar_rectangulos_con_modelos(n_values=[10, 100, 1000], mode='mid'):
         if idx == 0:
             ax.legend(fontsize=9, loc='upper left', framealpha=0.9)
     
-    plt.tight_layout()
+    with etapa('layout'):
+        plt.tight_layout()
     
     # Guardar figuras
     os.makedirs('../figuras/png', exist_ok=True)
     os.makedirs('../figuras/pdf', exist_ok=True)
     
     filename = f'rectangulos_{mode}_modelos'
-    fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
-    fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
+    with etapa('savefig-png'):
+        fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
     plt.close()
     
     print(f"Gráfica guardada: {filename}.png / {filename}.pdf")
@@ -152,6 +158,7 @@ def graficar_rectangulos_con_modelos(n_values=[10, 100, 1000], mode='mid'):
     return aprox_area
 
 
+@etapa('draw')
 def graficar_comparativa_n_individual(n_list=[10, 100, 1000], mode='mid'):
     """
     Generar gráficas individuales para cada valor de n (más detalladas).
@@ -167,9 +174,10 @@ def graficar_comparativa_n_individual(n_list=[10, 100, 1000], mode='mid'):
         fig, ax = plt.subplots(figsize=(10, 7))
         
         # Calcular rectángulos
-        aprox_area, x_rects, heights, width = rectangles_method(
-            integ.funcion_energia, integ.a, integ.b, n, mode
-        )
+        with etapa('compute'):
+            aprox_area, x_rects, heights, width = rectangles_method(
+                integ.funcion_energia, integ.a, integ.b, n, mode
+            )
         
         # Calcular error
         exact = integ.integral_exacta()
@@ -208,15 +216,18 @@ def graficar_comparativa_n_individual(n_list=[10, 100, 1000], mode='mid'):
         ax.set_ylim(10, max(E_curva) * 1.12)
         ax.legend(fontsize=10, loc='upper left', framealpha=0.95, ncol=2)
         
-        plt.tight_layout()
+        with etapa('layout'):
+            plt.tight_layout()
         
         # Guardar
         os.makedirs('../figuras/png', exist_ok=True)
         os.makedirs('../figuras/pdf', exist_ok=True)
         
         filename = f'rectangulos_{mode}_n{n}_detalle'
-        fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
-        fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
+        with etapa('savefig-png'):
+            fig.savefig(f'../figuras/png/{filename}.png', dpi=300, bbox_inches='tight')
+        with etapa('savefig-pdf'):
+            fig.savefig(f'../figuras/pdf/{filename}.pdf', bbox_inches='tight')
         plt.close()
         
         print(f"Gráfica detallada guardada: {filename}.png / {filename}.pdf")
@@ -253,6 +264,7 @@ def generar_tabla_comparativa(n_values=[10, 100, 1000], modes=['left', 'mid', 'r
     print("=" * 90)
 
 
+@seccion('rectangulos_visualizacion.main')
 def main():
     """Ejecutar todas las visualizaciones."""
     print("=" * 70)
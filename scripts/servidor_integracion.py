@@ -0,0 +1,518 @@
+"""
+servidor_integracion.py
+=======================
+Servicio HTTP/JSON local de integración del modelo de energía (solo biblioteca estándar).
+
+Endpoints (GET, parámetros en la query string; listas separadas por comas):
+    /exacta         ?a=1.1&b=8.0[&coeficientes=c4,c3,c2,c1,c0]
+    /integrar       ?metodo=simpson&n=1000[&mode=mid][&a=..&b=..][&coeficientes=..]
+    /convergencia   ?metodo=rectangulos&valores_n=10,100,1000[&mode=mid]
+    /rango          ?a=1.1,2.0&b=3.0,8.0      (varios subrangos exactos en una consulta)
+    /estadisticas   latencias (p50/p90/p99) por endpoint, caché y micro-lotes
+POST /lote con una lista JSON de solicitudes {"metodo", "n", "mode", "a", "b"}.
+
+Las solicitudes concurrentes se agrupan en micro-lotes durante una ventana corta y se
+evalúan en una pasada vectorizada: todas las mallas se concatenan, E(N) se evalúa una
+vez y las sumas por solicitud salen de np.add.reduceat. Los resultados se guardan en
+una caché LRU; un acierto no entra en el lote.
+
+Los valores coinciden con IntegracionNumerica salvo por el orden de suma (~1e-15
+relativo). Las solicitudes con n > N_MAX_LOTE se calculan en un ejecutor aparte para
+no retener el micro-lote; un error en una solicitud no afecta a las demás del lote.
+
+Límites: n <= N_MAX_SOLICITUD por solicitud y PRESUPUESTO_PUNTOS puntos por consulta
+(suma de n); fuera de ellos se responde 400. Los valores no finitos (p. ej. el error
+relativo con integral exacta nula) se devuelven como null.
+
+Uso:
+    python servidor_integracion.py [--host 127.0.0.1] [--puerto 8080] [--ventana-ms 2]
+                                   [--max-lote 256] [--cache 4096]
+    curl 'http://127.0.0.1:8080/integrar?metodo=simpson&n=1000'
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+import metricas
+from indice_integral import IndiceIntegral
+from integracion_asincrona import MODOS, calcular_clave, clave_solicitud
+from integracion_segmentada import integrar_segmentos
+from integrales_numericas import IntegracionNumerica
+
+# Ventana de agrupación de solicitudes concurrentes (segundos)
+VENTANA_S = 0.002
+
+# Solicitudes máximas por micro-lote
+MAX_LOTE = 256
+
+# Entradas de la caché de resultados
+CAPACIDAD_CACHE = 4096
+
+# Puntos por solicitud por encima de los cuales se calcula fuera de la pasada conjunta
+# (concatenar mallas grandes solo añadiría memoria)
+N_MAX_LOTE = 10**6
+
+# Hilos del ejecutor de solicitudes con n > N_MAX_LOTE
+HILOS_GRANDES = 2
+
+# n máximo por solicitud y puntos totales (suma de n) por consulta HTTP
+N_MAX_SOLICITUD = 10**7
+PRESUPUESTO_PUNTOS = 2 * 10**7
+
+# Latencias guardadas por endpoint para los percentiles
+MUESTRAS_LATENCIA = 10000
+
+PERCENTILES = (50, 90, 99)
+
+
+def _calcular_clave(clave):
+    """calcular_clave() sin registros propios: ServicioIntegracion.resolver() ya emite."""
+    with metricas.suprimido():
+        return calcular_clave(clave)
+
+
+def evaluar_lote(claves):
+    """
+    Evaluar un lote de solicitudes (claves de clave_solicitud) en una pasada por polinomio.
+
+    Las integrales exactas se resuelven con IndiceIntegral; las numéricas, con
+    integrar_segmentos() (una malla concatenada y np.add.reduceat).
+
+    Retorna:
+    --------
+    list
+        Valores en el orden de las claves
+    """
+    resultados = [None] * len(claves)
+    grupos = defaultdict(list)
+    for i, clave in enumerate(claves):
+        grupos[clave[5]].append(i)
+
+    for coeficientes, indices in grupos.items():
+        c = np.asarray(coeficientes, dtype=np.float64)
+        exactas = [i for i in indices if claves[i][0] == 'exacta']
+        if exactas:
+            a = np.array([claves[i][3] for i in exactas])
+            b = np.array([claves[i][4] for i in exactas])
+            for i, valor in zip(exactas, IndiceIntegral.desde_polinomio(c).integrar(a, b)):
+                resultados[i] = float(valor)
+
+        numericas = []
+        for i in indices:
+            metodo, n = claves[i][:2]
+            if metodo == 'exacta':
+                continue
+            if n > N_MAX_LOTE:
+                resultados[i] = _calcular_clave(claves[i])
+            else:
+                numericas.append(i)
+        if not numericas:
+            continue
+        # Misma evaluación que IntegracionNumerica para E(N); np.polyval para otros polinomios
+        f = None if np.array_equal(c, IntegracionNumerica.COEFICIENTES_ENERGIA) \
+            else (lambda x: np.polyval(c, x))
+        metodos, ns, modos, a, b = zip(*(claves[i][:5] for i in numericas))
+        valores = integrar_segmentos(a, b, ns, metodos, [m or 'mid' for m in modos], f)
+        for i, valor in zip(numericas, valores):
+            resultados[i] = float(valor)
+    return resultados
+
+
+class CacheResultados:
+    """
+    Caché LRU de resultados, segura entre hilos.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_CACHE):
+        if capacidad < 0:
+            raise ValueError("capacidad no puede ser negativa")
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        """Valor en caché o None."""
+        with self._cerrojo:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave]
+            self.fallos += 1
+            return None
+
+    def guardar(self, clave, valor):
+        if self.capacidad == 0:
+            return
+        with self._cerrojo:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def __len__(self):
+        return len(self._datos)
+
+
+class MicroLotes:
+    """
+    Agrupa solicitudes de varios hilos en lotes y los evalúa con evaluar_lote().
+
+    Un hilo de fondo toma la primera solicitud pendiente, espera hasta `ventana_s` (o
+    hasta `max_lote` solicitudes) y evalúa el lote; las claves repetidas dentro del
+    lote se calculan una vez. Las solicitudes con n > N_MAX_LOTE se pasan a un
+    ejecutor de `hilos_grandes` hilos, así no detienen los lotes siguientes.
+    """
+
+    def __init__(self, ventana_s=VENTANA_S, max_lote=MAX_LOTE, hilos_grandes=HILOS_GRANDES):
+        if ventana_s < 0:
+            raise ValueError("ventana_s no puede ser negativa")
+        if max_lote < 1:
+            raise ValueError("max_lote debe ser al menos 1")
+        if hilos_grandes < 1:
+            raise ValueError("hilos_grandes debe ser al menos 1")
+        self.ventana_s = ventana_s
+        self.max_lote = max_lote
+        self._grandes = ThreadPoolExecutor(max_workers=hilos_grandes,
+                                           thread_name_prefix='micro-lotes-grandes')
+        self._cola = queue.Queue()
+        self.lotes = 0
+        self.solicitudes = 0
+        self._hilo = threading.Thread(target=self._bucle, name='micro-lotes', daemon=True)
+        self._hilo.start()
+
+    def enviar(self, clave):
+        """
+        Encolar una solicitud.
+
+        Retorna:
+        --------
+        concurrent.futures.Future
+            Se completa con el valor (o la excepción) al evaluarse su lote
+        """
+        futuro = Future()
+        self._cola.put((clave, futuro))
+        return futuro
+
+    def _bucle(self):
+        while True:
+            pendientes = [self._cola.get()]
+            limite = time.perf_counter() + self.ventana_s
+            while len(pendientes) < self.max_lote:
+                restante = limite - time.perf_counter()
+                try:
+                    pendientes.append(self._cola.get(timeout=max(restante, 0))
+                                      if restante > 0 else self._cola.get_nowait())
+                except queue.Empty:
+                    break
+
+            futuros = defaultdict(list)
+            for clave, futuro in pendientes:
+                futuros[clave].append(futuro)
+            grandes = [clave for clave in futuros
+                       if clave[0] != 'exacta' and clave[1] > N_MAX_LOTE]
+            for clave in grandes:
+                self._grandes.submit(self._resolver, futuros.pop(clave), _calcular_clave, clave)
+
+            unicas = list(futuros)
+            try:
+                valores = evaluar_lote(unicas) if unicas else []
+            except Exception:
+                # Aislar el error: evaluar cada clave por separado
+                for clave in unicas:
+                    self._resolver(futuros[clave], lambda c: evaluar_lote([c])[0], clave)
+            else:
+                for clave, valor in zip(unicas, valores):
+                    for futuro in futuros[clave]:
+                        futuro.set_result(valor)
+            self.lotes += 1
+            self.solicitudes += len(pendientes)
+
+    @staticmethod
+    def _resolver(futuros, funcion, clave):
+        """Completar los futuros de una clave con funcion(clave) o con su excepción."""
+        try:
+            valor = funcion(clave)
+        except Exception as error:
+            for futuro in futuros:
+                futuro.set_exception(error)
+        else:
+            for futuro in futuros:
+                futuro.set_result(valor)
+
+
+class ServicioIntegracion:
+    """
+    Lógica del servicio: caché, micro-lotes y estadísticas de latencia.
+    """
+
+    def __init__(self, ventana_s=VENTANA_S, max_lote=MAX_LOTE, capacidad_cache=CAPACIDAD_CACHE):
+        self.cache = CacheResultados(capacidad_cache)
+        self.lotes = MicroLotes(ventana_s, max_lote)
+        self._latencias = defaultdict(lambda: deque(maxlen=MUESTRAS_LATENCIA))
+        self._cerrojo = threading.Lock()
+
+    def resolver(self, claves):
+        """
+        Valores de una lista de claves: desde caché o mediante el micro-lote.
+
+        Rechaza (ValueError) la consulta completa si alguna solicitud supera
+        N_MAX_SOLICITUD o si la suma de n supera PRESUPUESTO_PUNTOS.
+        """
+        numericas = [clave[1] for clave in claves if clave[0] != 'exacta']
+        if numericas and max(numericas) > N_MAX_SOLICITUD:
+            raise ValueError(f"n no puede superar {N_MAX_SOLICITUD}")
+        if sum(numericas) > PRESUPUESTO_PUNTOS:
+            raise ValueError(f"La consulta supera el presupuesto de {PRESUPUESTO_PUNTOS} "
+                             f"puntos (suma de n)")
+
+        t0 = time.perf_counter()
+        valores = [self.cache.obtener(clave) for clave in claves]
+        futuros = {i: self.lotes.enviar(clave)
+                   for i, (clave, valor) in enumerate(zip(claves, valores)) if valor is None}
+        for i, futuro in futuros.items():
+            valores[i] = futuro.result()
+            self.cache.guardar(claves[i], valores[i])
+
+        recolector = metricas.recolector_activo()
+        if recolector is not None:
+            tiempo_s = time.perf_counter() - t0
+            for i, (clave, valor) in enumerate(zip(claves, valores)):
+                metodo, n, mode = clave[:3]
+                acierto = i not in futuros
+                recolector.registrar(metodo, n or 0, 0 if acierto else n or 0,
+                                     tiempo_s / len(claves), mode=mode, cache_hit=acierto,
+                                     valor=valor)
+        return valores
+
+    def registrar_latencia(self, ruta, segundos):
+        with self._cerrojo:
+            self._latencias[ruta].append(segundos)
+
+    def estadisticas(self):
+        """
+        Percentiles de latencia (ms) por endpoint, caché y micro-lotes.
+        """
+        with self._cerrojo:
+            latencias = {ruta: np.array(valores) for ruta, valores in self._latencias.items()}
+        endpoints = {}
+        for ruta, valores in sorted(latencias.items()):
+            resumen = {'solicitudes': int(valores.size),
+                       'max_ms': float(valores.max() * 1e3)}
+            for p, v in zip(PERCENTILES, np.percentile(valores, PERCENTILES)):
+                resumen[f'p{p}_ms'] = float(v * 1e3)
+            endpoints[ruta] = resumen
+        consultas_cache = self.cache.aciertos + self.cache.fallos
+        return {
+            'endpoints': endpoints,
+            'cache': {'entradas': len(self.cache), 'aciertos': self.cache.aciertos,
+                      'fallos': self.cache.fallos,
+                      'tasa_aciertos': self.cache.aciertos / consultas_cache
+                      if consultas_cache else 0.0},
+            'micro_lotes': {'lotes': self.lotes.lotes, 'solicitudes': self.lotes.solicitudes,
+                            'tamano_medio': self.lotes.solicitudes / self.lotes.lotes
+                            if self.lotes.lotes else 0.0},
+        }
+
+    # --- Endpoints -------------------------------------------------------------------
+
+    def exacta(self, a=1.1, b=8.0, coeficientes=None):
+        clave = clave_solicitud('exacta', a=a, b=b, coeficientes=coeficientes)
+        return {'a': clave[3], 'b': clave[4], 'valor': self.resolver([clave])[0]}
+
+    def integrar(self, metodo, n, mode=None, a=1.1, b=8.0, coeficientes=None):
+        claves = [clave_solicitud(metodo, n, mode, a, b, coeficientes),
+                  clave_solicitud('exacta', a=a, b=b, coeficientes=coeficientes)]
+        valor, exacta = self.resolver(claves)
+        error = abs(valor - exacta)
+        return {'metodo': metodo, 'n': claves[0][1], 'mode': claves[0][2], 'valor': valor,
+                'exacta': exacta, 'error_absoluto': error,
+                'error_relativo': error / abs(exacta) * 100 if exacta else float('inf')}
+
+    def convergencia(self, metodo, valores_n, mode=None, a=1.1, b=8.0, coeficientes=None):
+        claves = [clave_solicitud(metodo, n, mode, a, b, coeficientes) for n in valores_n]
+        claves.append(clave_solicitud('exacta', a=a, b=b, coeficientes=coeficientes))
+        *valores, exacta = self.resolver(claves)
+        return {'metodo': metodo, 'mode': claves[0][2], 'exacta': exacta,
+                'filas': [{'n': clave[1], 'valor': valor, 'error_absoluto': abs(valor - exacta),
+                           'error_relativo': abs(valor - exacta) / abs(exacta) * 100
+                           if exacta else float('inf')}
+                          for clave, valor in zip(claves, valores)]}
+
+    def rango(self, a, b, coeficientes=None):
+        if len(a) != len(b):
+            raise ValueError("a y b deben tener la misma longitud")
+        claves = [clave_solicitud('exacta', a=ai, b=bi, coeficientes=coeficientes)
+                  for ai, bi in zip(a, b)]
+        return {'a': list(a), 'b': list(b), 'valores': self.resolver(claves)}
+
+    def lote(self, solicitudes):
+        if not isinstance(solicitudes, list):
+            raise ValueError("El cuerpo debe ser una lista JSON de solicitudes")
+        claves = []
+        for s in solicitudes:
+            if not isinstance(s, dict):
+                raise ValueError("Cada solicitud debe ser un objeto JSON")
+            claves.append(clave_solicitud(s.get('metodo'), s.get('n'), s.get('mode'),
+                                          s.get('a', 1.1), s.get('b', 8.0), s.get('coeficientes')))
+        return {'valores': self.resolver(claves)}
+
+
+def _json_finito(valor):
+    """Reemplazar flotantes no finitos por None (JSON no admite Infinity ni NaN)."""
+    if isinstance(valor, float):
+        return valor if np.isfinite(valor) else None
+    if isinstance(valor, dict):
+        return {k: _json_finito(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_json_finito(v) for v in valor]
+    return valor
+
+
+def _flotantes(texto):
+    return [float(v) for v in texto.split(',') if v]
+
+
+def _argumentos(query):
+    """Query string -> argumentos de los endpoints (listas separadas por comas)."""
+    parametros = {k: v[-1] for k, v in parse_qs(query).items()}
+    argumentos = {}
+    for nombre, texto in parametros.items():
+        try:
+            if nombre in ('a', 'b') and ',' not in texto:
+                argumentos[nombre] = float(texto)
+            elif nombre in ('a', 'b', 'coeficientes'):
+                argumentos[nombre] = _flotantes(texto)
+            elif nombre == 'n':
+                argumentos[nombre] = int(texto)
+            elif nombre == 'valores_n':
+                argumentos[nombre] = [int(v) for v in texto.split(',') if v]
+            elif nombre in ('metodo', 'mode'):
+                argumentos[nombre] = texto
+            else:
+                raise ValueError(f"Parámetro desconocido: {nombre}")
+        except ValueError as error:
+            if 'desconocido' in str(error):
+                raise
+            raise ValueError(f"Valor inválido para {nombre}: {texto}") from None
+    return argumentos
+
+
+def crear_manejador(servicio, silencioso=True):
+    """
+    Clase BaseHTTPRequestHandler enlazada a un ServicioIntegracion.
+    """
+    rutas = {
+        '/exacta': servicio.exacta,
+        '/integrar': servicio.integrar,
+        '/convergencia': servicio.convergencia,
+        '/rango': lambda a, b, coeficientes=None: servicio.rango(
+            a if isinstance(a, list) else [a], b if isinstance(b, list) else [b], coeficientes),
+        '/estadisticas': servicio.estadisticas,
+    }
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _responder(self, estado, cuerpo):
+            datos = json.dumps(_json_finito(cuerpo), ensure_ascii=False,
+                               allow_nan=False).encode('utf-8')
+            self.send_response(estado)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def _atender(self, ruta, ejecutar):
+            t0 = time.perf_counter()
+            try:
+                cuerpo = ejecutar()
+                estado = 200
+            except (ValueError, TypeError) as error:
+                cuerpo, estado = {'error': str(error)}, 400
+            except Exception as error:
+                cuerpo, estado = {'error': f'Error interno: {type(error).__name__}: {error}'}, 500
+            self._responder(estado, cuerpo)
+            servicio.registrar_latencia(ruta, time.perf_counter() - t0)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path not in rutas:
+                self._responder(404, {'error': f'Ruta desconocida: {url.path}',
+                                      'rutas': sorted(rutas) + ['/lote (POST)']})
+                return
+            self._atender(url.path, lambda: rutas[url.path](**_argumentos(url.query)))
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/lote':
+                self._responder(404, {'error': f'Ruta desconocida: {self.path}'})
+                return
+            longitud = int(self.headers.get('Content-Length', 0))
+
+            def ejecutar():
+                try:
+                    solicitudes = json.loads(self.rfile.read(longitud) or b'null')
+                except json.JSONDecodeError as error:
+                    raise ValueError(f"JSON inválido: {error}") from None
+                return servicio.lote(solicitudes)
+            self._atender('/lote', ejecutar)
+
+        def log_message(self, formato, *args):
+            if not silencioso:
+                super().log_message(formato, *args)
+
+    return Manejador
+
+
+def crear_servidor(host='127.0.0.1', puerto=8080, ventana_s=VENTANA_S, max_lote=MAX_LOTE,
+                   capacidad_cache=CAPACIDAD_CACHE, silencioso=True):
+    """
+    ThreadingHTTPServer listo para serve_forever(); el servicio queda en .servicio.
+    """
+    servicio = ServicioIntegracion(ventana_s, max_lote, capacidad_cache)
+    servidor = ThreadingHTTPServer((host, puerto), crear_manejador(servicio, silencioso))
+    servidor.daemon_threads = True
+    servidor.servicio = servicio
+    return servidor
+
+
+def main():
+    """Punto de ejecución principal."""
+    parser = argparse.ArgumentParser(description='Servicio HTTP/JSON de integración')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8080)
+    parser.add_argument('--ventana-ms', type=float, default=VENTANA_S * 1e3,
+                        help='Ventana de agrupación de micro-lotes (ms)')
+    parser.add_argument('--max-lote', type=int, default=MAX_LOTE)
+    parser.add_argument('--cache', type=int, default=CAPACIDAD_CACHE,
+                        help='Entradas de la caché de resultados (0 = sin caché)')
+    parser.add_argument('--verbose', action='store_true', help='Registrar cada solicitud')
+    args = parser.parse_args()
+
+    servidor = crear_servidor(args.host, args.puerto, args.ventana_ms / 1e3, args.max_lote,
+                              args.cache, silencioso=not args.verbose)
+    print("=" * 70)
+    print(f"SERVICIO DE INTEGRACIÓN - http://{args.host}:{servidor.server_address[1]}")
+    print("=" * 70)
+    print("Endpoints: /exacta /integrar /convergencia /rango /estadisticas, POST /lote")
+    print(f"Modos de rectángulos: {', '.join(MODOS)}  |  Ctrl+C para detener")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServicio detenido")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+"""
+tablas_latex.py
+===============
+Fragmentos .tex (tablas y macros \\newcommand) generados desde los resultados guardados.
+
+Las secciones del documento citan valores que calculan los scripts (integral exacta,
+aproximaciones por rectángulos, errores relativos, E(N) de cada modelo). En lugar de
+copiarlos a mano, este script los lee de los archivos de exportacion_columnar.py y
+escribe en ../secciones/generadas/:
+
+- valores.tex:               macros \\newcommand con los números citados en el texto
+- tabla_modelos.tex:         E_exp frente a E(N) por modelo (tab:modelos_comparacion)
+- tabla_rectangulos.tex:     tres modos x tres densidades (tab:comparacion_rectangulos)
+- tabla_validacion.tex:      rectángulos frente a la antiderivada (tab:validacion_rectangulos)
+
+Cada archivo se reescribe solo si su contenido cambia, de modo que latexmk no recompila
+el documento sin necesidad. Si faltan los resultados guardados, o son más antiguos que
+exportacion_columnar.py o algún módulo local que importa, se calculan y exportan de nuevo
+(python exportacion_columnar.py); si no, solo se leen. construccion.py aplica la misma
+regla a todo el informe.
+
+Uso:
+    python tablas_latex.py [--recalcular]
+"""
+
+import os
+import re
+import sys
+
+import numpy as np
+
+from construccion import modulos_locales
+from exportacion_columnar import (DIRECTORIO_RESULTADOS, cargar_columnar, exportar_reportes,
+                                  nombre_reporte)
+
+DIRECTORIO_GENERADAS = '../secciones/generadas'
+
+# Densidades citadas en las tablas del documento
+DENSIDADES = (10, 100, 1000)
+
+MODOS = ('left', 'mid', 'right')
+
+ENCABEZADO = '% Generado por scripts/tablas_latex.py a partir de {fuentes}. No editar.\n'
+
+# Sufijos de macro por densidad (los nombres de macro solo admiten letras)
+SUFIJOS_N = {10: 'Diez', 100: 'Cien', 1000: 'Mil'}
+
+# Errores relativos (%) para los que se cita el n requerido, y sufijos de macro
+SUFIJOS_UMBRAL = {0.1: 'Decima', 0.01: 'Centesima', 0.001: 'Milesima'}
+
+
+def escribir_si_cambia(ruta, contenido):
+    """
+    Escribir `contenido` en `ruta` solo si difiere del actual.
+
+    Retorna:
+    --------
+    bool
+        True si el archivo se escribió
+    """
+    if os.path.exists(ruta):
+        with open(ruta, encoding='utf-8') as f:
+            if f.read() == contenido:
+                return False
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+    os.replace(temporal, ruta)
+    return True
+
+
+def _cifras(valor, cifras=3):
+    """Número con `cifras` cifras significativas, sin notación científica."""
+    if valor == 0:
+        return '0'
+    decimales = cifras - 1 - int(np.floor(np.log10(abs(valor))))
+    return f"{valor:.{max(decimales, 0)}f}"
+
+
+def _cientifica(valor, cifras=3):
+    """Número en notación $a \\times 10^{b}$ para el modo matemático."""
+    mantisa, exponente = f"{valor:.{cifras - 1}e}".split('e')
+    return f"{mantisa} \\times 10^{{{int(exponente)}}}"
+
+
+def nombre_macro(texto):
+    """Nombre de macro válido (solo letras) a partir de un nombre de modelo."""
+    return re.sub(r'[^A-Za-z]', '', texto)
+
+
+def desactualizados(fuentes, script='exportacion_columnar.py'):
+    """
+    True si falta algún archivo de `fuentes` o alguno es más antiguo que `script` o
+    que los módulos locales que importa (p. ej. integrales_numericas.py).
+    """
+    if not all(os.path.exists(r) for r in fuentes):
+        return True
+    modulos = modulos_locales(script)
+    return min(os.path.getmtime(r) for r in fuentes) < max(map(os.path.getmtime, modulos))
+
+
+def cargar_resultados(directorio=DIRECTORIO_RESULTADOS, recalcular=False):
+    """
+    Leer los reportes de rectángulos y la tabla de modelos guardados.
+
+    Si falta algún archivo, si están desactualizados frente a los módulos que los
+    producen (ver desactualizados()) o si recalcular=True, se calculan y exportan primero.
+
+    Retorna:
+    --------
+    dict
+        'rectangulos': modo -> (columnas, metadatos); 'modelos': (columnas, metadatos);
+        'fuentes': archivos leídos
+    """
+    rutas = {mode: os.path.join(directorio, nombre_reporte('rectangulos', mode) + '.npz')
+             for mode in MODOS}
+    ruta_modelos = os.path.join(directorio, 'modelos_ai.npz')
+    fuentes = list(rutas.values()) + [ruta_modelos]
+    if recalcular or desactualizados(fuentes):
+        exportar_reportes(directorio=directorio, formatos=['npz'])
+
+    return {
+        'rectangulos': {mode: cargar_columnar(ruta) for mode, ruta in rutas.items()},
+        'modelos': cargar_columnar(ruta_modelos),
+        'fuentes': [os.path.basename(r) for r in fuentes],
+    }
+
+
+def _fila_n(columnas, n):
+    """Índice del registro con el n dado en un reporte."""
+    indices = np.flatnonzero(columnas['n'] == n)
+    if indices.size == 0:
+        raise ValueError(f"El reporte guardado no contiene n={n}; use --recalcular")
+    return int(indices[0])
+
+
+def _valores_rectangulos(resultados):
+    """(modo, n) -> (aproximación, error absoluto, error relativo %)."""
+    valores = {}
+    for mode, (columnas, metadatos) in resultados['rectangulos'].items():
+        exacta = metadatos['integral_exacta']
+        for n in DENSIDADES:
+            i = _fila_n(columnas, n)
+            error = float(columnas['errores_absoluto'][i])
+            valores[mode, n] = (float(columnas['integrales'][i]), error, error / exacta * 100)
+    return valores
+
+
+def _n_requerido(columnas, exacta, umbral):
+    """
+    n mínimo para un error relativo (%) <= umbral, interpolando log(error) frente a
+    log(n) entre los n guardados que lo rodean (extrapolando con los dos últimos si
+    el barrido no llega al umbral).
+    """
+    n = columnas['n'].astype(np.float64)
+    relativo = columnas['errores_absoluto'] / exacta * 100
+    alcanzados = np.flatnonzero(relativo <= umbral)
+    if alcanzados.size and alcanzados[0] == 0:
+        return int(n[0])
+    k = alcanzados[0] if alcanzados.size else n.size - 1
+    pendiente = (np.log(relativo[k]) - np.log(relativo[k - 1])) / (np.log(n[k]) - np.log(n[k - 1]))
+    return int(np.ceil(n[k - 1] * (umbral / relativo[k - 1]) ** (1 / pendiente)))
+
+
+def generar_valores(resultados):
+    """Contenido de valores.tex (macros \\newcommand)."""
+    _, metadatos = resultados['rectangulos']['mid']
+    exacta = metadatos['integral_exacta']
+    a, b = metadatos['intervalo']
+    rect = _valores_rectangulos(resultados)
+
+    macros = [
+        ('IntegralExacta', f"{exacta:.4f}"),
+        ('IntegralExactaLarga', f"{exacta:.8f}"),
+        ('IntegralExactaCorta', f"{exacta:.2f}"),
+        ('LimiteInferior', f"{a:.1f}"),
+        ('LimiteSuperior', f"{b:.1f}"),
+        ('AnchoIntervalo', f"{b - a:.1f}"),
+        ('ConsumoPromedio', f"{exacta / (b - a):.2f}"),
+    ]
+    for mode in MODOS:
+        for n in DENSIDADES:
+            aprox, error, relativo = rect[mode, n]
+            sufijo = mode.capitalize() + SUFIJOS_N[n]
+            macros.append((f"IntegralRect{sufijo}", f"{aprox:.4f}"))
+            macros.append((f"ErrorRelRect{sufijo}", _cifras(relativo)))
+    for n in DENSIDADES:
+        razon = min(rect['left', n][1], rect['right', n][1]) / rect['mid', n][1]
+        macros.append((f"RazonPrecisionMid{SUFIJOS_N[n]}", f"{razon:.0f}"))
+        macros.append((f"AnchoRect{SUFIJOS_N[n]}", _cifras((b - a) / n, 2)))
+    for anterior, n in zip(DENSIDADES, DENSIDADES[1:]):
+        macros.append((f"ReduccionErrorMid{SUFIJOS_N[n]}",
+                       f"{rect['mid', anterior][1] / rect['mid', n][1]:.0f}"))
+    for umbral, sufijo in SUFIJOS_UMBRAL.items():
+        requeridos = {mode: _n_requerido(resultados['rectangulos'][mode][0], exacta, umbral)
+                      for mode in MODOS}
+        extremos = max(requeridos['left'], requeridos['right'])
+        macros.append((f"NRequeridoMid{sufijo}", str(requeridos['mid'])))
+        macros.append((f"NRequeridoExtremos{sufijo}", str(extremos)))
+        macros.append((f"RazonCosto{sufijo}", f"{extremos / requeridos['mid']:.0f}"))
+
+    columnas, _ = resultados['modelos']
+    for i, nombre in enumerate(columnas['nombre']):
+        macros.append((f"EnergiaCurva{nombre_macro(str(nombre))}",
+                       f"{columnas['energia_modelo'][i]:.2f}"))
+    diferencias = ((columnas['energia_exp'] - columnas['energia_modelo'])
+                   / columnas['energia_modelo'] * 100)
+    macros.append(('DiferenciaModeloMax', f"{diferencias.max():.0f}"))
+    macros.append(('DiferenciaModeloMin', f"{diferencias.min():.0f}"))
+
+    nombres = [nombre for nombre, _ in macros]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError("Nombres de macro duplicados")
+    lineas = [f"\\newcommand{{\\{nombre}}}{{{valor}}}" for nombre, valor in macros]
+    return ENCABEZADO.format(fuentes=', '.join(resultados['fuentes'])) + '\n'.join(lineas) + '\n'
+
+
+def generar_tabla_modelos(resultados):
+    """Contenido de tabla_modelos.tex: E_exp frente a E(N) de la curva."""
+    columnas, _ = resultados['modelos']
+    filas = []
+    for i, nombre in enumerate(columnas['nombre']):
+        exp, curva = columnas['energia_exp'][i], columnas['energia_modelo'][i]
+        diferencia = (exp - curva) / curva * 100
+        diferencia_str = f"{diferencia:+.0f}" if abs(diferencia) >= 10 else f"{diferencia:+.1f}"
+        filas.append(f"{nombre} & {columnas['parametros'][i]:.1f} & {exp:.1f} & {curva:.2f} & "
+                     f"${diferencia_str}\\%$ \\\\")
+    return (ENCABEZADO.format(fuentes='modelos_ai.npz')
+            + "\\begin{tabular}{@{\\extracolsep{\\fill}} l c c c c}\n"
+            "\\toprule\n"
+            "\\textbf{Modelo} & \\textbf{$N$ (B)} & \\textbf{$E_{\\text{exp}}$ (Wh)} & "
+            "\\textbf{$E(N)$ Curva (Wh)} & \\textbf{Diferencia (\\%)} \\\\\n"
+            "\\midrule\n"
+            + '\n'.join(filas) + '\n'
+            "\\bottomrule\n"
+            "\\end{tabular}\n")
+
+
+def generar_tabla_rectangulos(resultados):
+    """Contenido de tabla_rectangulos.tex: modos x densidades."""
+    rect = _valores_rectangulos(resultados)
+    bloques = []
+    for mode in MODOS:
+        filas = [f"\\multirow{{{len(DENSIDADES)}}}{{*}}{{{mode.capitalize()}}}"]
+        for n in DENSIDADES:
+            aprox, error, relativo = rect[mode, n]
+            filas.append(f"  & {n} & {aprox:.4f} & {_cifras(error)} & {_cifras(relativo)} \\\\")
+        bloques.append('\n'.join(filas))
+    fuentes = ', '.join(resultados['fuentes'][:len(MODOS)])
+    return (ENCABEZADO.format(fuentes=fuentes)
+            + "\\begin{tabular}{@{\\extracolsep{\\fill}} l c c c c}\n"
+            "\\toprule\n"
+            "\\textbf{Modo} & \\textbf{$n$} & \\textbf{Área Aprox. (Wh·B)} & "
+            "\\textbf{Error Abs. (Wh·B)} & \\textbf{Error Rel. (\\%)} \\\\\n"
+            "\\midrule\n"
+            + '\n\\midrule\n'.join(bloques) + '\n'
+            "\\bottomrule\n"
+            "\\end{tabular}\n")
+
+
+def generar_tabla_validacion(resultados):
+    """Contenido de tabla_validacion.tex: rectángulos frente a la antiderivada."""
+    rect = _valores_rectangulos(resultados)
+    exacta = resultados['rectangulos']['mid'][1]['integral_exacta']
+    n_max = max(DENSIDADES)
+
+    def fila(etiqueta, aprox, error, relativo):
+        return (f"{etiqueta} & ${aprox:.8f}$ & ${_cientifica(error)}$ & "
+                f"${relativo:.6f}$ \\\\")
+
+    filas_mid = [fila(f"Rectángulos Mid $n={n}$", *rect['mid', n])
+                 for n in sorted(DENSIDADES, reverse=True)]
+    filas_extremos = [fila(f"Rectángulos {mode.capitalize()} $n={n_max}$", *rect[mode, n_max])
+                      for mode in ('left', 'right')]
+    fuentes = ', '.join(resultados['fuentes'][:len(MODOS)])
+    return (ENCABEZADO.format(fuentes=fuentes)
+            + "\\begin{tabular}{@{\\extracolsep{\\fill}} l c c c}\n"
+            "\\toprule\n"
+            "\\textbf{Método} & \\textbf{Valor (Wh·B)} & \\textbf{Error Abs. (Wh·B)} & "
+            "\\textbf{Error Rel. (\\%)} \\\\\n"
+            "\\midrule\n"
+            f"Antiderivada (Exacta) & ${exacta:.8f}$ & $0.00000000$ & $0.000000$ \\\\\n"
+            "\\midrule\n"
+            + '\n'.join(filas_mid) + '\n'
+            "\\midrule\n"
+            + '\n'.join(filas_extremos) + '\n'
+            "\\bottomrule\n"
+            "\\end{tabular}\n")
+
+
+GENERADORES = {
+    'valores.tex': generar_valores,
+    'tabla_modelos.tex': generar_tabla_modelos,
+    'tabla_rectangulos.tex': generar_tabla_rectangulos,
+    'tabla_validacion.tex': generar_tabla_validacion,
+}
+
+
+def generar_fragmentos(directorio=DIRECTORIO_GENERADAS, resultados=None, recalcular=False):
+    """
+    Escribir todos los fragmentos que hayan cambiado.
+
+    Retorna:
+    --------
+    dict
+        ruta -> True si se reescribió, False si ya estaba al día
+    """
+    if resultados is None:
+        resultados = cargar_resultados(recalcular=recalcular)
+    return {os.path.join(directorio, archivo):
+            escribir_si_cambia(os.path.join(directorio, archivo), generar(resultados))
+            for archivo, generar in GENERADORES.items()}
+
+
+def main():
+    """Punto de ejecución principal."""
+    recalcular = '--recalcular' in sys.argv[1:]
+
+    print("=" * 70)
+    print("FRAGMENTOS LaTeX DESDE RESULTADOS GUARDADOS")
+    print("=" * 70 + "\n")
+    for ruta, escrito in generar_fragmentos(recalcular=recalcular).items():
+        print(f"{'Actualizado' if escrito else 'Sin cambios'}: {ruta}")
+    print("\n" + "=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,8 @@ import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from integrales_numericas import IntegracionNumerica
+from perfilado import etapa, seccion
+from medicion import graficar_tiempos
 
 # Paleta de colores profesional
 COLOR_PRINCIPAL = '#1F4788'    # Azul oscuro profesional
@@ -19,6 +21,7 @@ COLOR_SECUNDARIO = '#8B3A62'   # Púrpura profesional
 COLOR_ACENTO = '#5C946E'       # Verde profesional
 
 
+@seccion('trapecio.ejecutar_trapecio')
 def ejecutar_trapecio(n=None):
     """
     Ejecutar análisis de regla del trapecio.
@@ -53,10 +56,11 @@ def ejecutar_trapecio(n=None):
                 print("Error: Entrada no válida. Ingrese un número entero.")
     
     # Cálculo
-    integral_trap = integ.trapecio(n)
-    integral_exact = integ.integral_exacta()
-    error_abs = abs(integral_trap - integral_exact)
-    error_rel = (error_abs / integral_exact) * 100
+    with etapa('compute'):
+        integral_trap = integ.trapecio(n)
+        integral_exact = integ.integral_exacta()
+        error_abs = abs(integral_trap - integral_exact)
+        error_rel = (error_abs / integral_exact) * 100
     
     # Resultados
     print("\n" + "=" * 70)
@@ -78,17 +82,21 @@ def ejecutar_trapecio(n=None):
     if n not in n_values:
         n_values = sorted(list(set(n_values + [n])))
     
-    reporte = integ.analizar_convergencia_trapecio(n_values)
+    with etapa('compute'):
+        reporte = integ.analizar_convergencia_trapecio(n_values, medir=True, memoria=True)
     
-    print(f"\n{'n':>6} | {'Integral':>14} | {'Error Abs.':>12} | {'Error Rel. %':>10}")
-    print("-" * 70)
+    print(f"\n{'n':>6} | {'Integral':>14} | {'Error Abs.':>12} | {'Error Rel. %':>10} | "
+          f"{'Mediana (ms)':>12} | {'Min (ms)':>10} | {'p95 (ms)':>10} | {'Pico (KiB)':>10}")
+    print("-" * 113)
     for i, n_val in enumerate(reporte['n']):
         integral = reporte['integrales'][i]
         error_abs = reporte['errores_absoluto'][i]
         error_rel = reporte['errores_relativo'][i]
         
-        error_rel_str = f"{error_rel:.4f}" if error_rel is not None else "---"
-        print(f"{n_val:>6} | {integral:>14.8f} | {error_abs:>12.2e} | {error_rel_str:>10}")
+        error_rel_str = f"{error_rel:.4f}" if not np.isnan(error_rel) else "---"
+        print(f"{n_val:>6} | {integral:>14.8f} | {error_abs:>12.2e} | {error_rel_str:>10} | "
+              f"{reporte['tiempos'][i]:>12.4f} | {reporte['tiempos_min'][i]:>10.4f} | "
+              f"{reporte['tiempos_p95'][i]:>10.4f} | {reporte['memoria_pico'][i] / 1024:>10.1f}")
     
     # Generar gráfico
     print("\n" + "-" * 70)
@@ -102,11 +110,12 @@ def ejecutar_trapecio(n=None):
     print("\n" + "=" * 70)
 
 
+@etapa('draw')
 def generar_grafico_trapecio(reporte, integ):
     """
     Generar gráfico de convergencia para regla del trapecio.
     """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(20, 6))
     fig.suptitle('Análisis de Convergencia - Regla del Trapecio', fontsize=14, fontweight='bold')
     
     exact = integ.integral_exacta()
@@ -141,15 +150,24 @@ def generar_grafico_trapecio(reporte, integ):
     ax2.grid(True, alpha=0.25, linestyle=':', which='both')
     ax2.legend(fontsize=10)
     
-    plt.tight_layout()
+    # Gráfica 3: Costo de cómputo (mediana con rango min - p95)
+    if 'tiempos' in reporte:
+        graficar_tiempos(ax3, reporte, COLOR_SECUNDARIO)
+    else:
+        ax3.set_visible(False)
+    
+    with etapa('layout'):
+        plt.tight_layout()
     
     # Guardar figuras
     import os
     os.makedirs('../figuras/png', exist_ok=True)
     os.makedirs('../figuras/pdf', exist_ok=True)
     
-    fig.savefig('../figuras/png/trapecio_convergencia.png', dpi=300, bbox_inches='tight')
-    fig.savefig('../figuras/pdf/trapecio_convergencia.pdf', bbox_inches='tight')
+    with etapa('savefig-png'):
+        fig.savefig('../figuras/png/trapecio_convergencia.png', dpi=300, bbox_inches='tight')
+    with etapa('savefig-pdf'):
+        fig.savefig('../figuras/pdf/trapecio_convergencia.pdf', bbox_inches='tight')
     plt.close()
 
 